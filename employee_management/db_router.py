@@ -0,0 +1,52 @@
+import contextvars
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+read_alias = contextvars.ContextVar('read_alias', default=None)
+
+# Sessions, auth and admin stay on the primary so a fresh login is never read back stale
+REPLICA_APPS = {'employees'}
+
+
+def get_replica_alias():
+    alias = settings.READ_REPLICA_ALIAS
+    return alias if alias and alias in connections else None
+
+
+class ReadReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in REPLICA_APPS:
+            return read_alias.get()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica mirrors default, so objects from either may be related
+        return True
+
+
+def use_read_replica(view):
+    """Serve the view's reads from the replica; only for views that never write."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            token = read_alias.set(get_replica_alias())
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                read_alias.reset(token)
+    else:
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            token = read_alias.set(get_replica_alias())
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                read_alias.reset(token)
+    return wrapper
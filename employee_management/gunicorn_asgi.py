@@ -0,0 +1,13 @@
+# Gunicorn profile for serving the async views through uvicorn workers:
+#   gunicorn -c employee_management/gunicorn_asgi.py employee_management.asgi:application
+import multiprocessing
+import os
+
+worker_class = 'uvicorn_worker.UvicornWorker'
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() + 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = 30
+keepalive = 5
+
+# Read by settings.py in each worker
+raw_env = ['SERVER_PROFILE=asgi']
@@ -0,0 +1,216 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import JsonResponse
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger('employee_management.performance')
+
+current_metrics = contextvars.ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.queries = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.query_count += 1
+            self.queries[sql] += 1
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total_time):
+        python_time = max(total_time - self.sql_time - self.template_time, 0.0)
+        return ', '.join([
+            f'db;dur={self.sql_time * 1000:.1f};desc="{self.query_count} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+            f'app;dur={python_time * 1000:.1f}',
+            f'total;dur={total_time * 1000:.1f}',
+        ])
+
+    def repeated_queries(self, limit=5):
+        return [(sql, count) for sql, count in self.queries.most_common(limit) if count > 1]
+
+
+class TimingHistogram:
+    BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def record(self, route, total_ms, query_count):
+        with self.lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = {
+                    'count': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'queries': 0,
+                    'max_queries': 0,
+                    'buckets': [0] * (len(self.BUCKETS_MS) + 1),
+                }
+            stats['count'] += 1
+            stats['total_ms'] += total_ms
+            stats['max_ms'] = max(stats['max_ms'], total_ms)
+            stats['queries'] += query_count
+            stats['max_queries'] = max(stats['max_queries'], query_count)
+            bucket = next((i for i, bound in enumerate(self.BUCKETS_MS) if total_ms <= bound), len(self.BUCKETS_MS))
+            stats['buckets'][bucket] += 1
+
+    def snapshot(self):
+        labels = [f'<={bound}ms' for bound in self.BUCKETS_MS] + [f'>{self.BUCKETS_MS[-1]}ms']
+        with self.lock:
+            return {
+                route: {
+                    'count': stats['count'],
+                    'mean_ms': round(stats['total_ms'] / stats['count'], 1),
+                    'max_ms': round(stats['max_ms'], 1),
+                    'mean_queries': round(stats['queries'] / stats['count'], 1),
+                    'max_queries': stats['max_queries'],
+                    'histogram': dict(zip(labels, stats['buckets'])),
+                }
+                for route, stats in sorted(self.routes.items())
+            }
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+
+
+histogram = TimingHistogram()
+
+
+class InstrumentedTemplate(Template):
+
+    def render(self, context=None, request=None):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - started
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return InstrumentedTemplate(template.template, self)
+
+
+def record_query(execute, sql, params, many, context):
+    # Installed once per connection and reports to whichever request is current, so
+    # queries count wherever they run, including sync_to_async threads (which copy
+    # the request's context)
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def instrument_connections(connection=None, **kwargs):
+    targets = connections.all() if connection is None else [connection]
+    for target in targets:
+        # At the bottom of the stack, so execute_wrapper() blocks entered around it
+        # still pop their own wrapper
+        if record_query not in target.execute_wrappers:
+            target.execute_wrappers.insert(0, record_query)
+
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        # Connections opened later, in any thread, are instrumented as they connect
+        connection_created.connect(instrument_connections, dispatch_uid='performance_instrument_connections')
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            instrument_connections()
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            # Async views run their queries on the request's thread-sensitive sync thread,
+            # whose connections may predate the connection_created hook
+            await sync_to_async(instrument_connections)()
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        total_time = metrics.total_time
+        response['Server-Timing'] = metrics.server_timing(total_time)
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else '<unresolved>'
+        total_ms = total_time * 1000
+        histogram.record(route, total_ms, metrics.query_count)
+
+        if total_ms >= settings.PERFORMANCE_SLOW_REQUEST_MS:
+            repeated = metrics.repeated_queries()
+            logger.warning(
+                'Slow request %s %s (%s): %.1fms, %d queries in %.1fms, templates %.1fms%s',
+                request.method,
+                request.path,
+                route,
+                total_ms,
+                metrics.query_count,
+                metrics.sql_time * 1000,
+                metrics.template_time * 1000,
+                ''.join(f'\n  {count}x {sql}' for sql, count in repeated),
+            )
+        return response
+
+
+@staff_member_required
+def performance_stats(request):
+    if request.method == 'POST':
+        histogram.reset()
+    return JsonResponse({
+        'enabled': settings.PERFORMANCE_INSTRUMENTATION,
+        'slow_request_ms': settings.PERFORMANCE_SLOW_REQUEST_MS,
+        'routes': histogram.snapshot(),
+    })
@@ -41,6 +41,13 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Opt-in per-request query/timing instrumentation (Server-Timing headers, slow request log)
+PERFORMANCE_INSTRUMENTATION = os.environ.get('PERFORMANCE_INSTRUMENTATION', 'False') == 'True'
+PERFORMANCE_SLOW_REQUEST_MS = int(os.environ.get('PERFORMANCE_SLOW_REQUEST_MS', '500'))
+
+if PERFORMANCE_INSTRUMENTATION:
+    MIDDLEWARE.insert(0, 'employee_management.instrumentation.PerformanceMiddleware')
+
 ROOT_URLCONF = 'employee_management.urls'
 
 TEMPLATES = [
@@ -60,13 +67,18 @@ TEMPLATES = [
     },
 ]
 
+if PERFORMANCE_INSTRUMENTATION:
+    TEMPLATES[0]['BACKEND'] = 'employee_management.instrumentation.InstrumentedDjangoTemplates'
+
 WSGI_APPLICATION = 'employee_management.wsgi.application'
 
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '600'))
+
 if dj_database_url:
     DATABASES = {
         'default': dj_database_url.config(
             default=f'sqlite:///{BASE_DIR / "db.sqlite3"}',
-            conn_max_age=600,
+            conn_max_age=DB_CONN_MAX_AGE,
             conn_health_checks=True,
         )
     }
@@ -82,6 +94,47 @@ else:
         }
     }
 
+# Read-only views (dashboard, attendance list, employee list, exports) read from this
+# alias when it is configured; writes, sessions and auth always use default
+REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL', '')
+if REPLICA_DATABASE_URL and dj_database_url:
+    DATABASES['replica'] = dj_database_url.parse(
+        REPLICA_DATABASE_URL, conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True,
+    )
+READ_REPLICA_ALIAS = 'replica' if REPLICA_DATABASE_URL else None
+
+DATABASE_ROUTERS = ['employee_management.db_router.ReadReplicaRouter']
+
+# Async views run their queries in short-lived per-request threads, so under the
+# ASGI profile persistent connections would pile up instead of being reused
+SERVER_PROFILE = os.environ.get('SERVER_PROFILE', 'wsgi')
+if SERVER_PROFILE == 'asgi':
+    for database in DATABASES.values():
+        database['CONN_MAX_AGE'] = 0
+
+# Set when DATABASE_URL points at pgbouncer in transaction pooling mode, which cannot keep
+# the server-side cursors that .iterator() opens on PostgreSQL
+if os.environ.get('DB_PGBOUNCER', 'False') == 'True':
+    for database in DATABASES.values():
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Rendered attendance fragments live here; use a shared backend (database, file, memcached,
+# redis) when running several processes so invalidation reaches all of them
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'employee-management'),
+    }
+}
+
+# A process-local cache never hears about writes made by other processes (imports, job
+# workers, other server workers), so its fragments must expire quickly
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get(
+    'FRAGMENT_CACHE_TIMEOUT',
+    300 if CACHE_BACKEND.endswith('.LocMemCache') else 60 * 60 * 24,
+))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -121,6 +174,10 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Finished report jobs and their files under MEDIA_ROOT/reports/ are removed after this
+# many days, each time run_workers starts
+REPORT_JOB_KEEP_DAYS = int(os.environ.get('REPORT_JOB_KEEP_DAYS', '7'))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 if not DEBUG:
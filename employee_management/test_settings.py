@@ -0,0 +1,8 @@
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASES
+
+# A second SQLite database lets the tests tell which alias served a read
+DATABASES['replica'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'db_replica.sqlite3'}
+
+# The manifest storage needs collectstatic output, which test runs don't have
+STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
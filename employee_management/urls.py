@@ -2,8 +2,10 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
 from django.contrib.staticfiles.storage import staticfiles_storage
+from employee_management.instrumentation import performance_stats
 
 urlpatterns = [
+    path('admin/performance/', performance_stats, name='performance_stats'),
     path('admin/', admin.site.urls),
     path('favicon.ico', RedirectView.as_view(url=staticfiles_storage.url('logo-icon.svg'), permanent=True), name='favicon'),
     path('', include('employees.urls')),
@@ -1,9 +1,10 @@
 from django.contrib import admin
-from .models import Employee, Department, Holiday
+from .models import Employee, Department, Holiday, ReportJob
 
 admin.site.register(Employee)
 admin.site.register(Department)
 admin.site.register(Holiday)
+admin.site.register(ReportJob)
 
 admin.site.site_header = "Employee Management System"
 admin.site.site_title = "Admin Panel"
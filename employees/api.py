@@ -0,0 +1,287 @@
+import base64
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import authenticate
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.forms.models import model_to_dict
+from django.http import HttpResponse, JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+
+from .forms import AttendanceForm, DepartmentForm, EmployeeForm, HolidayForm
+from .models import Attendance, Department, Employee, Holiday
+from .services import AttendanceImportService, EmployeeSyncService, KeysetPagination
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+MAX_BATCH_SIZE = 10000
+
+# API field name -> ORM lookup; the ordering doubles as the keyset cursor
+RESOURCES = {
+    'employees': {
+        'model': Employee,
+        'form': EmployeeForm,
+        'ordering': ['first_name', 'last_name', 'id'],
+        'fields': {
+            'id': 'id',
+            'first_name': 'first_name',
+            'last_name': 'last_name',
+            'email': 'email',
+            'phone_number': 'phone_number',
+            'department': 'department_id',
+            'department_name': 'department__name',
+            'hire_date': 'hire_date',
+            'updated_at': 'updated_at',
+        },
+        'filters': {
+            'department': 'department_id',
+        },
+    },
+    'departments': {
+        'model': Department,
+        'form': DepartmentForm,
+        'ordering': ['name', 'id'],
+        'fields': {
+            'id': 'id',
+            'name': 'name',
+            'updated_at': 'updated_at',
+        },
+        'filters': {},
+    },
+    'attendance': {
+        'model': Attendance,
+        'form': AttendanceForm,
+        'ordering': ['date', 'id'],
+        'fields': {
+            'id': 'id',
+            'employee': 'employee_id',
+            'date': 'date',
+            'status': 'status',
+            'created_at': 'created_at',
+            'updated_at': 'updated_at',
+        },
+        'filters': {
+            'employee': 'employee_id',
+            'department': 'employee__department_id',
+            'status': 'status',
+            'start_date': 'date__gte',
+            'end_date': 'date__lte',
+        },
+    },
+    'holidays': {
+        'model': Holiday,
+        'form': HolidayForm,
+        'ordering': ['date', 'id'],
+        'fields': {
+            'id': 'id',
+            'name': 'name',
+            'date': 'date',
+            'is_recurring': 'is_recurring',
+            'updated_at': 'updated_at',
+        },
+        'filters': {
+            'start_date': 'date__gte',
+            'end_date': 'date__lte',
+        },
+    },
+}
+
+
+class ApiError(Exception):
+
+    def __init__(self, message, status=400, errors=None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.errors = errors
+
+
+def error_response(exc):
+    payload = {'error': exc.message}
+    if exc.errors is not None:
+        payload['errors'] = exc.errors
+    response = JsonResponse(payload, status=exc.status)
+    if exc.status == 401:
+        response['WWW-Authenticate'] = 'Basic realm="api"'
+    return response
+
+
+def get_api_user(request):
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if header.startswith('Basic '):
+        try:
+            username, _, password = base64.b64decode(header[6:]).decode().partition(':')
+        except (ValueError, UnicodeDecodeError):
+            raise ApiError('Invalid basic authentication header.', status=401)
+        user = authenticate(request, username=username, password=password)
+        if user is None:
+            raise ApiError('Invalid credentials.', status=401)
+        return user
+    if request.user.is_authenticated:
+        # Browser sessions still need a CSRF token, like the HTML forms
+        if CsrfViewMiddleware(lambda req: None).process_view(request, None, (), {}) is not None:
+            raise ApiError('CSRF verification failed.', status=403)
+        return request.user
+    raise ApiError('Authentication required.', status=401)
+
+
+def api_view(methods):
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, resource, *args, **kwargs):
+            try:
+                config = RESOURCES.get(resource)
+                if config is None:
+                    raise ApiError(f'Unknown resource "{resource}".', status=404)
+                if request.method not in methods:
+                    raise ApiError(f'Method {request.method} not allowed.', status=405)
+                if request.method not in ('GET', 'HEAD'):
+                    user = await sync_to_async(get_api_user)(request)
+                    if not user.is_staff:
+                        raise ApiError('Staff access required.', status=403)
+                return await view(request, config, *args, **kwargs)
+            except ApiError as exc:
+                return error_response(exc)
+        # csrf_exempt() would hide the coroutine behind a sync wrapper on Django 4.2
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
+
+
+def read_json(request):
+    try:
+        return json.loads(request.body or b'null')
+    except (ValueError, UnicodeDecodeError):
+        raise ApiError('Request body must be valid JSON.')
+
+
+def get_selected_fields(request, config):
+    fields = config['fields']
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(fields)
+    selected = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in selected if name not in fields]
+    if unknown:
+        raise ApiError(f'Unknown field(s): {", ".join(unknown)}.')
+    return selected
+
+
+def decode_cursor(cursor, config):
+    try:
+        return KeysetPagination.decode_cursor(cursor, config['model'], config['ordering'])
+    except ValueError:
+        raise ApiError('Invalid cursor.')
+
+
+def filter_queryset(request, config, queryset):
+    lookups = {**config['filters'], 'updated_since': 'updated_at__gte'}
+    filters = {lookups[name]: value for name, value in request.GET.items() if name in lookups and value != ''}
+    try:
+        return queryset.filter(**filters)
+    except (ValueError, ValidationError) as exc:
+        messages = exc.messages if isinstance(exc, ValidationError) else [str(exc)]
+        raise ApiError(f'Invalid filter: {" ".join(messages)}')
+
+
+async def get_object_data(config, pk):
+    fields = config['fields']
+    row = await config['model'].objects.filter(pk=pk).values(*fields.values()).afirst()
+    if row is None:
+        raise ApiError('Not found.', status=404)
+    return {name: row[lookup] for name, lookup in fields.items()}
+
+
+def save_form(config, data, instance=None):
+    if not isinstance(data, dict):
+        raise ApiError('Request body must be a JSON object.')
+    form_class = config['form']
+    if instance is not None:
+        # Partial updates: anything not sent keeps its current value
+        data = {**model_to_dict(instance, fields=form_class._meta.fields), **data}
+    form = form_class(data, instance=instance)
+    if not form.is_valid():
+        raise ApiError('Validation failed.', errors=form.errors.get_json_data())
+    return form.save()
+
+
+@api_view(['GET', 'POST'])
+async def collection(request, config):
+    if request.method == 'POST':
+        obj = await sync_to_async(save_form)(config, read_json(request))
+        return JsonResponse(await get_object_data(config, obj.pk), status=201)
+
+    selected = get_selected_fields(request, config)
+    try:
+        limit = min(max(int(request.GET.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        raise ApiError('limit must be a number.')
+
+    ordering = config['ordering']
+    queryset = filter_queryset(request, config, config['model'].objects.all())
+    cursor = request.GET.get('cursor')
+    if cursor:
+        queryset = queryset.filter(KeysetPagination.keyset_filter(ordering, decode_cursor(cursor, config)))
+
+    rows = queryset.order_by(*ordering)[:limit + 1]
+    columns = list(dict.fromkeys([config['fields'][name] for name in selected] + ordering))
+    raw_rows = [row async for row in rows.values_list(*columns)]
+    has_more = len(raw_rows) > limit
+    raw_rows = raw_rows[:limit]
+
+    positions = {column: index for index, column in enumerate(columns)}
+    next_cursor = None
+    if has_more:
+        next_cursor = KeysetPagination.encode_cursor([raw_rows[-1][positions[name]] for name in ordering])
+    return JsonResponse({
+        'results': [
+            {name: row[positions[config['fields'][name]]] for name in selected}
+            for row in raw_rows
+        ],
+        'next_cursor': next_cursor,
+    })
+
+
+@api_view(['GET', 'PATCH', 'DELETE'])
+async def detail(request, config, pk):
+    if request.method == 'GET':
+        return JsonResponse(await get_object_data(config, pk))
+
+    instance = await config['model'].objects.filter(pk=pk).afirst()
+    if instance is None:
+        raise ApiError('Not found.', status=404)
+    if request.method == 'DELETE':
+        await instance.adelete()
+        return HttpResponse(status=204)
+    await sync_to_async(save_form)(config, read_json(request), instance)
+    return JsonResponse(await get_object_data(config, pk))
+
+
+def run_batch(config, items, dry_run):
+    model = config['model']
+    if model is Employee:
+        # Upserts keyed on email, like the sync_employees command; departments go by
+        # name so records read from this API can be sent back unchanged
+        records = [{**item, 'department': item.get('department_name')} for item in items]
+        return EmployeeSyncService(dry_run=dry_run).run(records)
+    rows = [{key: '' if value is None else str(value) for key, value in item.items()} for item in items]
+    return AttendanceImportService(dry_run=dry_run, update_existing=True).run(rows, first_line=1)
+
+
+@api_view(['POST'])
+async def batch(request, config):
+    if config['model'] not in (Employee, Attendance):
+        raise ApiError('Batch writes are only available for employees and attendance.', status=404)
+    payload = read_json(request)
+    items = payload.get('items') if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ApiError('Request body must be an object with an "items" list of objects.')
+    if len(items) > MAX_BATCH_SIZE:
+        raise ApiError(f'At most {MAX_BATCH_SIZE} items can be sent per batch.')
+    dry_run = bool(payload.get('dry_run'))
+
+    result = await sync_to_async(run_batch)(config, items, dry_run)
+    result['dry_run'] = dry_run
+    return JsonResponse(result)
@@ -2,7 +2,7 @@ from django.apps import AppConfig
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete, pre_save
 import os
 
 
@@ -11,7 +11,25 @@ class EmployeesConfig(AppConfig):
     name = 'employees'
 
     def ready(self):
+        from .models import Attendance, Department, Employee, Holiday
+        from . import signals
+
         post_migrate.connect(create_superuser, sender=self)
+        post_save.connect(signals.invalidate_holiday_calendar, sender=Holiday)
+        post_delete.connect(signals.invalidate_holiday_calendar, sender=Holiday)
+        pre_save.connect(signals.remember_previous_attendance_date, sender=Attendance)
+        post_save.connect(signals.refresh_summary_for_attendance, sender=Attendance)
+        post_delete.connect(signals.refresh_summary_for_attendance, sender=Attendance)
+        pre_save.connect(signals.remember_previous_department, sender=Employee)
+        post_save.connect(signals.refresh_summary_for_employee, sender=Employee)
+        pre_delete.connect(signals.refresh_summary_for_department, sender=Department)
+        post_save.connect(signals.invalidate_holiday_fragments, sender=Holiday)
+        post_delete.connect(signals.invalidate_holiday_fragments, sender=Holiday)
+        post_save.connect(signals.invalidate_attendance_fragments, sender=Attendance)
+        post_delete.connect(signals.invalidate_attendance_fragments, sender=Attendance)
+        for model in (Employee, Department):
+            post_save.connect(signals.invalidate_employee_fragments, sender=model)
+            post_delete.connect(signals.invalidate_employee_fragments, sender=model)
 
 def create_superuser(sender, **kwargs):
     username = os.getenv("DJANGO_SUPERUSER_USERNAME")
@@ -0,0 +1,314 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+import django
+from django.db import connection
+from django.test import Client
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Employee
+from .services import AttendanceMatrixBuilder, AttendanceSnapshot, PartitionedReportService, WorkingDayCalendar
+from .synthetic import SyntheticDataGenerator
+
+DEFAULT_EMPLOYEE_COUNTS = [100, 1000, 10000]
+DEFAULT_DAY_RANGES = [7, 90, 730]
+DEFAULT_WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def get_git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def read_response(response) -> int:
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def measure(request: Callable, repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = request()
+        size = read_response(response)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    with CaptureQueriesContext(connection) as queries:
+        tracemalloc.start()
+        try:
+            read_response(request())
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'status': response.status_code,
+        'best_ms': round(min(timings), 2),
+        'median_ms': round(statistics.median(timings), 2),
+        'queries': len(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'response_bytes': size,
+    }
+
+
+def get_cases(day_ranges: Iterable[int]) -> List[dict]:
+    today = timezone.now().date()
+    cases = [
+        {'view': 'dashboard', 'days': None, 'method': 'get', 'data': {}},
+        {'view': 'mark_attendance', 'days': None, 'method': 'get', 'data': {'date': today.isoformat()}},
+    ]
+    for days in day_ranges:
+        date_range = {'start_date': (today - timedelta(days=days - 1)).isoformat(), 'end_date': today.isoformat()}
+        cases.append({'view': 'attendance_list', 'days': days, 'method': 'get', 'data': date_range})
+        cases.append({'view': 'export_attendance', 'days': days, 'method': 'get', 'data': date_range})
+    return cases
+
+
+def run_benchmarks(
+    employee_counts: Iterable[int] = DEFAULT_EMPLOYEE_COUNTS,
+    day_ranges: Iterable[int] = DEFAULT_DAY_RANGES,
+    repeat: int = 3,
+    departments: int = 10,
+    holidays: int = 10,
+    seed: int = 42,
+    log: Callable[[str], None] = print,
+) -> dict:
+    day_ranges = sorted(day_ranges)
+    client = Client()
+    results = []
+
+    for employee_count in employee_counts:
+        SyntheticDataGenerator.clear()
+        started = time.perf_counter()
+        counts = SyntheticDataGenerator(seed=seed).generate(departments, employee_count, day_ranges[-1], holidays)
+        log(f'Seeded {counts["employees"]} employees / {counts["attendance"]} attendance rows in {time.perf_counter() - started:.1f}s')
+
+        for case in get_cases(day_ranges):
+            url = reverse(case['view'])
+            result = measure(lambda: getattr(client, case['method'])(url, case['data']), repeat)
+            result.update({'view': case['view'], 'employees': employee_count, 'days': case['days']})
+            results.append(result)
+            log(format_result(result))
+
+        # Marking the full roster is a write, so it is measured once per scale
+        mark_date = timezone.now().date()
+        while not WorkingDayCalendar.is_working_day(mark_date):
+            mark_date -= timedelta(days=1)
+        statuses = {f'status_{pk}': 'present' for pk in Employee.objects.values_list('id', flat=True)}
+        statuses['selected_date'] = mark_date.isoformat()
+        result = measure(lambda: client.post(reverse('mark_attendance'), statuses), 1)
+        result.update({'view': 'mark_attendance_post', 'employees': employee_count, 'days': None})
+        results.append(result)
+        log(format_result(result))
+
+    return {
+        'meta': {
+            'timestamp': timezone.now().isoformat(),
+            'git_commit': get_git_commit(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def format_result(result: dict) -> str:
+    days = f'{result["days"]}d' if result['days'] else '-'
+    return (
+        f'{result["view"]:<22} {result["employees"]:>6} emp {days:>5}  '
+        f'{result["best_ms"]:>9.1f}ms  {result["queries"]:>4} queries  '
+        f'{result["peak_memory_kb"]:>9.1f}KB peak  {result["response_bytes"]:>9}B'
+    )
+
+
+def compare_results(previous: dict, current: dict) -> List[str]:
+    key = lambda result: (result['view'], result['employees'], result['days'])
+    baseline = {key(result): result for result in previous['results']}
+    lines = [f'Compared with {previous["meta"].get("git_commit") or previous["meta"]["timestamp"]}:']
+    for result in current['results']:
+        old = baseline.get(key(result))
+        if old is None or not old['best_ms']:
+            continue
+        change = (result['best_ms'] - old['best_ms']) / old['best_ms'] * 100
+        days = f'{result["days"]}d' if result['days'] else '-'
+        lines.append(
+            f'{result["view"]:<22} {result["employees"]:>6} emp {days:>5}  '
+            f'{old["best_ms"]:>9.1f}ms -> {result["best_ms"]:>9.1f}ms ({change:+.0f}%)  '
+            f'queries {old["queries"]} -> {result["queries"]}'
+        )
+    return lines
+
+
+@contextmanager
+def seeded_database(employees: int, start_date: date, end_date: date, log: Callable[[str], None] = print):
+    """A throwaway test database filled with synthetic attendance for the range."""
+    setup_test_environment()
+    with tempfile.TemporaryDirectory() as directory:
+        # On disk, so worker processes can open it too
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'benchmark.sqlite3')
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            generator = SyntheticDataGenerator(end_date=end_date)
+            counts = generator.generate(10, employees, (end_date - start_date).days + 1, 10)
+            log(f'Seeded {counts["employees"]} employees / {counts["attendance"]} attendance rows.')
+            yield
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+
+def run_report_benchmarks(
+    start_date: date,
+    end_date: date,
+    worker_counts: Iterable[int] = DEFAULT_WORKER_COUNTS,
+    repeat: int = 3,
+    log: Callable[[str], None] = print,
+) -> dict:
+    # Timings include starting the process pool, as a real request for the report would
+    worker_counts = sorted(set(worker_counts) | {1})
+    results = []
+    baseline_ms = baseline = None
+    for workers in worker_counts:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            report = PartitionedReportService.run(start_date, end_date, workers=workers)
+            timings.append((time.perf_counter() - started) * 1000)
+        used = report.pop('workers')
+        if baseline is None:
+            baseline_ms, baseline = min(timings), report
+        speedup = baseline_ms / min(timings)
+        result = {
+            'workers': used,
+            'best_ms': round(min(timings), 2),
+            'median_ms': round(statistics.median(timings), 2),
+            'speedup': round(speedup, 2),
+            'efficiency': round(speedup / used, 2),
+            'matches_single_process': report == baseline,
+        }
+        results.append(result)
+        log(format_report_result(result))
+
+    return {
+        'meta': {
+            'timestamp': timezone.now().isoformat(),
+            'git_commit': get_git_commit(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'cpus': os.cpu_count(),
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'partitions': baseline['totals']['partitions'],
+            'rows': baseline['totals']['total'],
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def format_report_result(result: dict) -> str:
+    return (
+        f'{result["workers"]:>3} worker(s)  {result["best_ms"]:>9.1f}ms  '
+        f'{result["speedup"]:>5.2f}x speedup  {result["efficiency"]:>5.0%} efficiency'
+        f'{"" if result["matches_single_process"] else "  RESULT MISMATCH"}'
+    )
+
+
+def tally_model_instances(start_date: date, end_date: date) -> dict:
+    # What attendance_list does: Attendance instances indexed by (employee, date), then
+    # counted in Python
+    index = AttendanceMatrixBuilder(start_date, end_date).load()
+    employees, days = {}, {}
+    for (employee_id, day), attendance in index.items():
+        for counts in (employees.setdefault(employee_id, {}), days.setdefault(day, {})):
+            counts[attendance.status] = counts.get(attendance.status, 0) + 1
+    return {'employees': employees, 'days': days}
+
+
+def tally_snapshot(start_date: date, end_date: date) -> AttendanceSnapshot:
+    snapshot = AttendanceSnapshot.load(start_date, end_date)
+    snapshot.presence_rates()
+    snapshot.daily_counts()
+    snapshot.absence_streaks()
+    return snapshot
+
+
+def run_snapshot_benchmarks(start_date: date, end_date: date, repeat: int = 3, log: Callable[[str], None] = print) -> dict:
+    results = []
+    rows = 0
+    for approach, tally in (('model_instances', tally_model_instances), ('numpy_snapshot', tally_snapshot)):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            tally(start_date, end_date)
+            timings.append((time.perf_counter() - started) * 1000)
+        # Memory is traced on a separate run; tracing slows everything down
+        tracemalloc.start()
+        try:
+            retained = tally(start_date, end_date)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result = {
+            'approach': approach,
+            'best_ms': round(min(timings), 2),
+            'median_ms': round(statistics.median(timings), 2),
+            'peak_memory_kb': round(peak / 1024, 1),
+            'retained_memory_kb': round(current / 1024, 1),
+        }
+        if isinstance(retained, AttendanceSnapshot):
+            result['array_kb'] = round(retained.nbytes / 1024, 1)
+            rows = len(retained.status)
+        del retained
+        results.append(result)
+        log(
+            f'{approach:<16} {result["best_ms"]:>9.1f}ms  {result["peak_memory_kb"]:>10.1f}KB peak  '
+            f'{result["retained_memory_kb"]:>10.1f}KB retained'
+        )
+
+    return {
+        'meta': {
+            'timestamp': timezone.now().isoformat(),
+            'git_commit': get_git_commit(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'rows': rows,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def load_results(path: str) -> dict:
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def save_results(path: str, results: dict) -> None:
+    with open(path, 'w') as results_file:
+        json.dump(results, results_file, indent=2)
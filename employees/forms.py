@@ -1,8 +1,11 @@
+import csv
+import io
+
 from django import forms
 from django.core.exceptions import ValidationError
 from .models import Employee, Attendance, Department, Holiday
+from .services import HolidayCalendar, WorkingDayCalendar
 from django.utils import timezone
-from django.db.models import Q
 
 class EmployeeForm(forms.ModelForm):
     class Meta:
@@ -82,16 +85,6 @@ class AttendanceForm(forms.ModelForm):
             }),
         }
     
-    def is_weekend(self, date_obj):
-        return date_obj.weekday() >= 5
-    
-    def is_holiday(self, date_obj):
-        if Holiday.objects.filter(date=date_obj).exists():
-            return True
-        if Holiday.objects.filter(is_recurring=True, date__month=date_obj.month, date__day=date_obj.day).exists():
-            return True
-        return False
-    
     def clean_date(self):
         date = self.cleaned_data.get('date')
         if date:
@@ -100,17 +93,13 @@ class AttendanceForm(forms.ModelForm):
                 raise ValidationError('Attendance date cannot be in the future.')
             
             # Check if date is a weekend
-            if self.is_weekend(date):
+            if WorkingDayCalendar.is_weekend(date):
                 day_name = date.strftime('%A')
                 raise ValidationError(f'Attendance cannot be marked on {day_name}s (weekends). Please select a working day.')
             
             # Check if date is a holiday
-            if self.is_holiday(date):
-                holiday = Holiday.objects.filter(
-                    Q(date=date) | 
-                    Q(is_recurring=True, date__month=date.month, date__day=date.day)
-                ).first()
-                holiday_name = holiday.name if holiday else 'a holiday'
+            holiday_name = HolidayCalendar.get_holiday_name(date)
+            if holiday_name is not None:
                 raise ValidationError(f'Attendance cannot be marked on {holiday_name}. Please select a working day.')
         
         return date
@@ -130,3 +119,47 @@ class AttendanceForm(forms.ModelForm):
                 })
         
         return cleaned_data
+
+
+class DepartmentForm(forms.ModelForm):
+    class Meta:
+        model = Department
+        fields = ['name']
+
+
+class HolidayForm(forms.ModelForm):
+    class Meta:
+        model = Holiday
+        fields = ['name', 'date', 'is_recurring']
+
+
+class AttendanceImportForm(forms.Form):
+    file = forms.FileField(
+        label='CSV file',
+        widget=forms.ClearableFileInput(attrs={
+            'class': 'form-input',
+            'accept': '.csv,text/csv',
+        }),
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        label='Dry run',
+        help_text='Validate the file without saving any attendance.',
+    )
+
+    def clean_file(self):
+        # Read the whole file once up front so an encoding or quoting problem is
+        # reported before any batch has been imported
+        upload = self.cleaned_data['file']
+        text = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            for _ in csv.reader(text):
+                pass
+        except UnicodeDecodeError:
+            raise ValidationError('The file is not UTF-8 text. Save it as "CSV UTF-8" and upload it again.')
+        except csv.Error as exc:
+            raise ValidationError(f'The file is not a valid CSV file: {exc}.')
+        finally:
+            text.detach()
+            upload.seek(0)
+        return upload
@@ -0,0 +1,53 @@
+import csv
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employees.management.utils import parse_date
+from employees.services import AttendanceGapReportService
+
+
+class Command(BaseCommand):
+    help = 'Report working days without an attendance record, per employee.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', type=parse_date, help='First date to check (YYYY-MM-DD). Defaults to 30 days ago.')
+        parser.add_argument('--end-date', type=parse_date, help='Last date to check (YYYY-MM-DD). Defaults to today.')
+        parser.add_argument('--department', type=int, help='Only check employees of this department id.')
+        parser.add_argument('--all', action='store_true', help='Include employees without gaps.')
+        parser.add_argument('--csv', action='store_true', help='Write one CSV row per employee instead of a summary.')
+
+    def handle(self, *args, **options):
+        end_date = options['end_date'] or timezone.now().date()
+        start_date = options['start_date'] or end_date - timedelta(days=29)
+        if start_date > end_date:
+            raise CommandError('Start date cannot be after end date.')
+
+        rows = AttendanceGapReportService.run(start_date, end_date, options['department'])
+        totals = {'employees': 0, 'expected': 0, 'missing': 0, 'with_gaps': 0}
+        writer = csv.writer(self.stdout, lineterminator='\n') if options['csv'] else None
+        if writer:
+            writer.writerow(AttendanceGapReportService.CSV_FIELDS)
+
+        for row in rows:
+            totals['employees'] += 1
+            totals['expected'] += row['expected']
+            totals['missing'] += row['missing']
+            if not row['missing'] and not options['all']:
+                continue
+            totals['with_gaps'] += bool(row['missing'])
+            if writer:
+                writer.writerow(AttendanceGapReportService.csv_row(row))
+            else:
+                gaps = AttendanceGapReportService.format_gaps(row['gaps'])
+                self.stdout.write(f'{row["name"]} <{row["email"]}>: {row["missing"]} of {row["expected"]} missing  {gaps}')
+
+        message = (
+            f'{totals["missing"]} of {totals["expected"]} expected record(s) missing across '
+            f'{totals["with_gaps"]} of {totals["employees"]} employee(s), {start_date} to {end_date}.'
+        )
+        if writer:
+            self.stderr.write(message)
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
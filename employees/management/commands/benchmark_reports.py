@@ -0,0 +1,45 @@
+import os
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employees.benchmarks import DEFAULT_WORKER_COUNTS, run_report_benchmarks, save_results, seeded_database
+from employees.management.utils import parse_date
+
+
+class Command(BaseCommand):
+    help = 'Time the month-partitioned attendance report with different numbers of worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', type=parse_date, help='First date to report on (YYYY-MM-DD). Defaults to a year ago.')
+        parser.add_argument('--end-date', type=parse_date, help='Last date to report on (YYYY-MM-DD). Defaults to today.')
+        parser.add_argument('--workers', type=int, nargs='+', default=DEFAULT_WORKER_COUNTS)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument(
+            '--seed', type=int, metavar='EMPLOYEES',
+            help='Report on a throwaway database seeded with this many synthetic employees instead of the configured one.',
+        )
+        parser.add_argument('--output', default='report_benchmark.json')
+
+    def handle(self, *args, **options):
+        end_date = options['end_date'] or timezone.now().date()
+        start_date = options['start_date'] or end_date - timedelta(days=364)
+        if start_date > end_date:
+            raise CommandError('Start date cannot be after end date.')
+        self.stdout.write(f'{os.cpu_count()} CPU(s) available.')
+
+        def run():
+            return run_report_benchmarks(start_date, end_date, options['workers'], options['repeat'], self.stdout.write)
+
+        if options['seed']:
+            with seeded_database(options['seed'], start_date, end_date, self.stdout.write):
+                results = run()
+        else:
+            results = run()
+
+        save_results(options['output'], results)
+        self.stdout.write(self.style.SUCCESS(
+            f'{results["meta"]["rows"]} attendance rows in {results["meta"]["partitions"]} partition(s); '
+            f'saved {len(results["results"])} results to {options["output"]}.'
+        ))
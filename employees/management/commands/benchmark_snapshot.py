@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employees.benchmarks import run_snapshot_benchmarks, save_results, seeded_database
+from employees.management.utils import parse_date
+
+
+class Command(BaseCommand):
+    help = 'Compare time and memory of attendance tallies over model instances and over the NumPy snapshot.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', type=parse_date, help='First date to load (YYYY-MM-DD). Defaults to a year ago.')
+        parser.add_argument('--end-date', type=parse_date, help='Last date to load (YYYY-MM-DD). Defaults to today.')
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument(
+            '--seed', type=int, metavar='EMPLOYEES',
+            help='Use a throwaway database seeded with this many synthetic employees instead of the configured one.',
+        )
+        parser.add_argument('--output', default='snapshot_benchmark.json')
+
+    def handle(self, *args, **options):
+        end_date = options['end_date'] or timezone.now().date()
+        start_date = options['start_date'] or end_date - timedelta(days=364)
+        if start_date > end_date:
+            raise CommandError('Start date cannot be after end date.')
+
+        def run():
+            return run_snapshot_benchmarks(start_date, end_date, options['repeat'], self.stdout.write)
+
+        if options['seed']:
+            with seeded_database(options['seed'], start_date, end_date, self.stdout.write):
+                results = run()
+        else:
+            results = run()
+
+        save_results(options['output'], results)
+        self.stdout.write(self.style.SUCCESS(f'{results["meta"]["rows"]} attendance rows; saved results to {options["output"]}.'))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from employees.benchmarks import (
+    DEFAULT_DAY_RANGES,
+    DEFAULT_EMPLOYEE_COUNTS,
+    compare_results,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+
+class Command(BaseCommand):
+    help = 'Time the hot views against synthetic data in a throwaway test database and store the results as JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, nargs='+', default=DEFAULT_EMPLOYEE_COUNTS)
+        parser.add_argument('--days', type=int, nargs='+', default=DEFAULT_DAY_RANGES)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--output', default='benchmark_results.json')
+        parser.add_argument('--compare', help='Earlier results file to compare against.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            # Test runs have no collectstatic manifest to resolve {% static %} against
+            with override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage'):
+                results = run_benchmarks(
+                    employee_counts=options['employees'],
+                    day_ranges=options['days'],
+                    repeat=options['repeat'],
+                    log=self.stdout.write,
+                )
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        save_results(options['output'], results)
+        self.stdout.write(self.style.SUCCESS(f'Saved {len(results["results"])} results to {options["output"]}.'))
+        if options['compare']:
+            for line in compare_results(load_results(options['compare']), results):
+                self.stdout.write(line)
@@ -0,0 +1,45 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.services import AttendanceImportService
+
+
+class Command(BaseCommand):
+    help = 'Import attendance from a CSV file with employee_id or email, date and status columns.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to import, or "-" to read from stdin.')
+        parser.add_argument('--batch-size', type=int, default=AttendanceImportService.BATCH_SIZE, help='Rows written per transaction.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the file without writing anything.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            csv_file = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8-sig')
+        except OSError as exc:
+            raise CommandError(f'Cannot open {path}: {exc}')
+
+        with csv_file:
+            reader = csv.DictReader(csv_file)
+            try:
+                if not AttendanceImportService.has_required_columns(reader.fieldnames):
+                    raise CommandError('CSV must have a header with date, status and employee_id or email columns.')
+                service = AttendanceImportService(batch_size=options['batch_size'], dry_run=options['dry_run'])
+                result = service.run(reader)
+            except UnicodeDecodeError:
+                raise CommandError(f'{path} is not UTF-8 text; rows before the problem may already have been imported.')
+            except csv.Error as exc:
+                raise CommandError(f'{path} is not a valid CSV file ({exc}); rows before the problem may already have been imported.')
+
+        for line, message in result['errors']:
+            self.stderr.write(f'Line {line}: {message}')
+        if result['error_count'] > len(result['errors']):
+            self.stderr.write(f'... {result["error_count"] - len(result["errors"])} more error(s) not shown.')
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {result["created"]} of {result["processed"]} row(s) with {result["error_count"]} error(s) '
+            f'in {result["elapsed"]:.2f}s ({result["rows_per_second"]:.0f} rows/s).'
+        ))
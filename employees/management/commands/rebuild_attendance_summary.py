@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.management.utils import parse_date
+from employees.services import AttendanceSummaryService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily attendance summary table from raw attendance records.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', type=parse_date, help='First date to rebuild (YYYY-MM-DD).')
+        parser.add_argument('--end-date', type=parse_date, help='Last date to rebuild (YYYY-MM-DD).')
+
+    def handle(self, *args, **options):
+        start_date = options['start_date']
+        end_date = options['end_date']
+        if start_date and end_date and start_date > end_date:
+            raise CommandError('Start date cannot be after end date.')
+
+        created = AttendanceSummaryService.rebuild(start_date, end_date)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {created} daily summary row(s).'))
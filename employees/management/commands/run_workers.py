@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employees.services import ReportJobService
+from employees.workers import init_worker, run_job
+
+
+class Command(BaseCommand):
+    help = 'Run queued report and export jobs in a pool of worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Number of worker processes (default: one per CPU). 0 runs jobs in this process.',
+        )
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds between queue checks when idle.')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is empty.')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers < 0:
+            raise CommandError('--workers cannot be negative.')
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+
+        requeued = ReportJobService.requeue_stale()
+        if requeued:
+            self.stderr.write(f'Requeued {requeued} job(s) left running by a stopped worker.')
+        purged = ReportJobService.purge(timezone.now() - timedelta(days=settings.REPORT_JOB_KEEP_DAYS))
+        if purged:
+            self.stdout.write(f'Removed {purged} finished job(s) older than {settings.REPORT_JOB_KEEP_DAYS} days.')
+
+        if workers == 0:
+            self.run_inline(options)
+        else:
+            self.run_pool(workers, options)
+
+    def report(self, job_id, status):
+        style = self.style.SUCCESS if status == 'done' else self.style.ERROR
+        self.stdout.write(style(f'Job {job_id} {status}.'))
+
+    def run_inline(self, options):
+        while True:
+            job_id = ReportJobService.claim(self.name)
+            if job_id is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+            self.report(job_id, ReportJobService.execute(job_id))
+
+    def run_pool(self, workers, options):
+        context = multiprocessing.get_context('spawn')
+        running = {}
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker) as pool:
+            self.stdout.write(f'Running jobs in {workers} worker process(es) as {self.name}.')
+            while True:
+                # Claim only as many jobs as there are free processes, so the rest stay
+                # queued for other run_workers instances
+                while len(running) < workers:
+                    job_id = ReportJobService.claim(self.name)
+                    if job_id is None:
+                        break
+                    running[pool.submit(run_job, job_id)] = job_id
+
+                if not running:
+                    if options['once']:
+                        return
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                done, _ = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        status = future.result()
+                    except BrokenProcessPool:
+                        # A crashed process takes the whole pool down with it
+                        for job_id in [job_id, *running.values()]:
+                            ReportJobService.fail(job_id, 'The worker process running this job exited unexpectedly.')
+                        raise CommandError('A worker process exited unexpectedly; restart run_workers.')
+                    except Exception as exc:
+                        ReportJobService.fail(job_id, str(exc))
+                        status = 'failed'
+                    self.report(job_id, status)
@@ -0,0 +1,48 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.synthetic import SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic departments, employees, holidays and attendance for load testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--departments', type=int, default=10)
+        parser.add_argument('--employees', type=int, default=1000)
+        parser.add_argument('--days', type=int, default=90, help='Days of attendance history ending at --end-date.')
+        parser.add_argument('--holidays', type=int, default=10)
+        parser.add_argument('--end-date', help='Last day of generated attendance (YYYY-MM-DD, default today).')
+        parser.add_argument('--presence-rate', type=float, default=0.9)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--clear', action='store_true', help='Delete ALL existing employees, attendance, departments and holidays first.')
+
+    def handle(self, *args, **options):
+        end_date = None
+        if options['end_date']:
+            try:
+                end_date = datetime.strptime(options['end_date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError(f'Invalid date "{options["end_date"]}", expected YYYY-MM-DD.')
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1.')
+
+        started = time.perf_counter()
+        if options['clear']:
+            SyntheticDataGenerator.clear()
+        generator = SyntheticDataGenerator(
+            seed=options['seed'],
+            end_date=end_date,
+            presence_rate=options['presence_rate'],
+            batch_size=options['batch_size'],
+        )
+        counts = generator.generate(options['departments'], options['employees'], options['days'], options['holidays'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {counts["departments"]} departments, {counts["employees"]} employees and '
+            f'{counts["attendance"]} attendance rows ({counts["holidays"]} holidays in total) '
+            f'in {time.perf_counter() - started:.1f}s.'
+        ))
@@ -0,0 +1,60 @@
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.services import EmployeeSyncService
+
+
+class Command(BaseCommand):
+    help = 'Create or update employees from a CSV or JSON file, matched on email.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON file to sync, or "-" to read from stdin.')
+        parser.add_argument('--format', choices=['csv', 'json'], help='Input format (defaults to the file extension).')
+        parser.add_argument('--dry-run', action='store_true', help='Show what would change without writing anything.')
+
+    def load_records(self, path, input_format):
+        try:
+            source = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8-sig')
+        except OSError as exc:
+            raise CommandError(f'Cannot open {path}: {exc}')
+        with source:
+            if input_format == 'json':
+                try:
+                    records = json.load(source)
+                except ValueError as exc:
+                    raise CommandError(f'Invalid JSON: {exc}')
+                if not isinstance(records, list):
+                    raise CommandError('JSON input must be a list of employee objects.')
+                return records
+            return list(csv.DictReader(source))
+
+    def handle(self, *args, **options):
+        path = options['path']
+        input_format = options['format'] or ('json' if path.lower().endswith('.json') else 'csv')
+        records = self.load_records(path, input_format)
+
+        dry_run = options['dry_run']
+        result = EmployeeSyncService(dry_run=dry_run).run(records)
+
+        if dry_run or options['verbosity'] > 1:
+            for email, action, diff in result['changes']:
+                if action == 'create':
+                    self.stdout.write(self.style.SUCCESS(f'+ {email}'))
+                    continue
+                self.stdout.write(self.style.WARNING(f'~ {email}'))
+                for field, (old, new) in diff.items():
+                    self.stdout.write(f'    {field}: {old} -> {new}')
+
+        for number, message in result['errors']:
+            self.stderr.write(f'Record {number}: {message}')
+
+        if dry_run:
+            summary = f'Dry run: would create {result["created"]} and update {result["updated"]} employee(s)'
+        else:
+            summary = f'Created {result["created"]} and updated {result["updated"]} employee(s)'
+        self.stdout.write(self.style.SUCCESS(
+            f'{summary}; {result["unchanged"]} unchanged, {len(result["errors"])} error(s).'
+        ))
@@ -0,0 +1,10 @@
+from argparse import ArgumentTypeError
+from datetime import datetime
+
+
+def parse_date(value):
+    # argparse type= for date options, so a bad value is reported as a usage error
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ArgumentTypeError(f'Invalid date "{value}", expected YYYY-MM-DD.')
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:38
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def backfill_summary(apps, schema_editor):
+    Attendance = apps.get_model('employees', 'Attendance')
+    DailyAttendanceSummary = apps.get_model('employees', 'DailyAttendanceSummary')
+    rows = (
+        Attendance.objects.values('date', 'employee__department')
+        .annotate(
+            total=Count('id'),
+            present=Count('id', filter=Q(status='present')),
+            absent=Count('id', filter=Q(status='absent')),
+        )
+        .order_by()
+    )
+    DailyAttendanceSummary.objects.bulk_create(
+        [
+            DailyAttendanceSummary(
+                date=row['date'],
+                department_id=row['employee__department'],
+                present=row['present'],
+                absent=row['absent'],
+                total=row['total'],
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0007_attendance_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAttendanceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='employees.department')),
+            ],
+            options={
+                'verbose_name_plural': 'Daily attendance summaries',
+                'ordering': ['date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyattendancesummary',
+            constraint=models.UniqueConstraint(fields=('date', 'department'), name='unique_summary_date_department'),
+        ),
+        migrations.RunPython(backfill_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_attendance_updated_at(apps, schema_editor):
+    Attendance = apps.get_model('employees', 'Attendance')
+    Attendance.objects.filter(created_at__isnull=False).update(updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0008_dailyattendancesummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='department',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='holiday',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_attendance_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,77 @@
+import warnings
+
+from django.db import DatabaseError, migrations, models, transaction
+
+# Directory search matches with icontains on PostgreSQL (UPPER(col) LIKE UPPER(...),
+# served by trigram indexes) and istartswith on SQLite (LIKE 'x%', served by NOCASE indexes)
+SEARCH_COLUMNS = [
+    ('employees_employee', 'first_name'),
+    ('employees_employee', 'last_name'),
+    ('employees_employee', 'email'),
+    ('employees_department', 'name'),
+]
+
+
+def index_name(table, column, suffix):
+    return f'{table.split("_", 1)[1]}_{column}_{suffix}'
+
+
+def enable_trigram_extension(schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone():
+            return True
+    # Managed databases often refuse CREATE EXTENSION to the app's role; the savepoint
+    # keeps the rest of the migration going without the trigram indexes
+    try:
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute('CREATE EXTENSION pg_trgm')
+    except DatabaseError as exc:
+        warnings.warn(
+            f'Skipping the trigram search indexes, pg_trgm could not be enabled ({exc}). '
+            'Employee search still works, without an index.',
+            RuntimeWarning,
+        )
+        return False
+    return True
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        if not enable_trigram_extension(schema_editor):
+            return
+        for table, column in SEARCH_COLUMNS:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {index_name(table, column, "trgm_idx")} '
+                f'ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+            )
+    elif vendor == 'sqlite':
+        for table, column in SEARCH_COLUMNS:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {index_name(table, column, "nocase_idx")} ON {table} ({column} COLLATE NOCASE)'
+            )
+
+
+def drop_search_indexes(apps, schema_editor):
+    suffix = {'postgresql': 'trgm_idx', 'sqlite': 'nocase_idx'}.get(schema_editor.connection.vendor)
+    if suffix is None:
+        return
+    for table, column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index_name(table, column, suffix)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0010_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['hire_date', 'id'], name='employee_hire_date_idx'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -1,21 +1,53 @@
+import uuid
+
+from django.conf import settings
 from django.db import models
 
+
+class LoadedValuesMixin:
+    # Keep the column values an instance was loaded with, so save signals can see what changed
+    # without reading the row again. Deferred fields are simply missing from the snapshot.
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        deferred = self.get_deferred_fields()
+        refreshed = [self._meta.get_field(name) for name in fields] if fields else self._meta.concrete_fields
+        self._loaded_values = {
+            **getattr(self, '_loaded_values', {}),
+            **{f.attname: getattr(self, f.attname) for f in refreshed if f.concrete and f.attname not in deferred},
+        }
+
+
 class Department(models.Model):
     name = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
 
-class Employee(models.Model):
+class Employee(LoadedValuesMixin, models.Model):
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
     email = models.EmailField(unique=True)
     phone_number = models.CharField(max_length=15)
     department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True)
     hire_date = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['first_name', 'last_name']
+        indexes = [
+            models.Index(fields=['department', 'first_name', 'last_name'], name='employee_dept_name_idx'),
+            models.Index(fields=['first_name', 'last_name', 'id'], name='employee_name_idx'),
+            models.Index(fields=['hire_date', 'id'], name='employee_hire_date_idx'),
+            # Freshness checks read MAX(updated_at) on every conditional GET
+            models.Index(fields=['updated_at'], name='employee_updated_at_idx'),
+        ]
         verbose_name_plural = 'Employees'
     
     def __str__(self):
@@ -28,16 +60,20 @@ class Holiday(models.Model):
     name = models.CharField(max_length=200)
     date = models.DateField(unique=True)
     is_recurring = models.BooleanField(default=False, help_text="If checked, this holiday repeats every year on the same date")
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['date']
+        indexes = [
+            models.Index(fields=['is_recurring'], name='holiday_recurring_idx'),
+        ]
         verbose_name_plural = 'Holidays'
     
     def __str__(self):
         return f"{self.name} - {self.date}"
 
 
-class Attendance(models.Model):
+class Attendance(LoadedValuesMixin, models.Model):
     STATUS_CHOICES = [
         ('present', 'Present'),
         ('absent', 'Absent'),
@@ -46,13 +82,85 @@ class Attendance(models.Model):
     date = models.DateField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES)
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-date', 'employee__first_name']
         constraints = [
             models.UniqueConstraint(fields=['employee', 'date'], name='unique_employee_date')
         ]
+        indexes = [
+            models.Index(fields=['date', 'status'], name='attendance_date_status_idx'),
+            models.Index(fields=['date', 'employee'], name='attendance_date_employee_idx'),
+            models.Index(fields=['date', 'id'], name='attendance_date_id_idx'),
+            models.Index(fields=['date', 'updated_at'], name='attendance_date_updated_idx'),
+        ]
         verbose_name_plural = 'Attendances'
     
     def __str__(self):
-        return f"{self.employee} - {self.date} - {self.status}"
\ No newline at end of file
+        return f"{self.employee} - {self.date} - {self.status}"
+
+class DailyAttendanceSummary(models.Model):
+    date = models.DateField()
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, null=True, blank=True)
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'department'], name='unique_summary_date_department')
+        ]
+        verbose_name_plural = 'Daily attendance summaries'
+
+    def __str__(self):
+        return f"{self.date} - {self.department or 'No Department'}: {self.present}/{self.total}"
+
+
+class ReportJob(models.Model):
+    ATTENDANCE_EXPORT = 'attendance_export'
+    ATTENDANCE_GAPS = 'attendance_gaps'
+    REBUILD_SUMMARY = 'rebuild_summary'
+    KIND_CHOICES = [
+        (ATTENDANCE_EXPORT, 'Attendance export'),
+        (ATTENDANCE_GAPS, 'Attendance gap report'),
+        (REBUILD_SUMMARY, 'Attendance summary rebuild'),
+    ]
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+    # Random ids, so a job's status and result can't be found by counting up
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    result = models.JSONField(null=True, blank=True)
+    result_file = models.FileField(upload_to='reports/%Y/%m/', blank=True)
+    error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='report_job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.DONE, self.FAILED)
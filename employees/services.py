@@ -1,6 +1,132 @@
-from datetime import date, timedelta
+import base64
+import calendar
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import traceback
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
 from dateutil.relativedelta import relativedelta
-from typing import Tuple, Optional
+from functools import partial
+from itertools import accumulate, repeat
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.files import File
+from django.core.paginator import Page, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import validate_email
+from django.db import IntegrityError, connection, connections, transaction
+from django.db.models import Count, F, Max, Min, Q, Sum, Window
+from django.db.models.functions import Lag, RowNumber, TruncMonth, TruncWeek
+from django.utils import timezone
+
+try:
+    import numpy as np
+except ImportError:
+    # Only AttendanceSnapshot needs it
+    np = None
+
+from .models import Attendance, DailyAttendanceSummary, Department, Employee, Holiday, ReportJob
+from .workers import compute_partition, init_worker
+
+
+
+async def alist(queryset) -> list:
+    return [row async for row in queryset]
+
+
+class KeysetPagination:
+
+    @staticmethod
+    def encode_cursor(values: Iterable[Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(list(values), cls=DjangoJSONEncoder).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str, model, ordering: List[str]) -> list:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, TypeError):
+            raise ValueError('Invalid cursor.')
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise ValueError('Invalid cursor.')
+        try:
+            return [model._meta.get_field(name.lstrip('-')).to_python(value) for name, value in zip(ordering, values)]
+        except (ValidationError, TypeError):
+            raise ValueError('Invalid cursor.')
+
+    @staticmethod
+    def keyset_filter(ordering: List[str], values: List[Any]) -> Q:
+        # (a, b, c) > (x, y, z) spelled out so every backend can use the ordering index
+        query = Q()
+        for position, name in enumerate(ordering):
+            field = name.lstrip('-')
+            condition = Q(**{f'{field}__{"lt" if name.startswith("-") else "gt"}': values[position]})
+            for previous_name, previous_value in zip(ordering[:position], values[:position]):
+                condition &= Q(**{previous_name.lstrip('-'): previous_value})
+            query |= condition
+        return query
+
+    @staticmethod
+    def get_page(queryset, ordering: List[str], cursor: Optional[str], limit: int) -> Tuple[list, Optional[str]]:
+        if cursor:
+            values = KeysetPagination.decode_cursor(cursor, queryset.model, ordering)
+            queryset = queryset.filter(KeysetPagination.keyset_filter(ordering, values))
+        items = list(queryset.order_by(*ordering)[:limit + 1])
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = KeysetPagination.encode_cursor(getattr(items[-1], name.lstrip('-')) for name in ordering)
+        return items, next_cursor
+
+
+class EmployeeDirectoryService:
+    PAGE_SIZE = 48
+    SORTS = {
+        'name': ['first_name', 'last_name', 'id'],
+        '-name': ['-first_name', '-last_name', '-id'],
+        'hire_date': ['hire_date', 'id'],
+        '-hire_date': ['-hire_date', '-id'],
+        'email': ['email'],
+    }
+    DEFAULT_SORT = 'name'
+
+    @staticmethod
+    def search_lookup() -> str:
+        # PostgreSQL has trigram indexes for substring matches; SQLite can only index prefixes
+        return 'icontains' if connection.vendor == 'postgresql' else 'istartswith'
+
+    @staticmethod
+    def search(queryset, query: str):
+        lookup = EmployeeDirectoryService.search_lookup()
+        for term in query.split():
+            # Departments resolve to ids first so every branch of the OR stays on an index
+            departments = Department.objects.filter(**{f'name__{lookup}': term}).values('id')
+            queryset = queryset.filter(
+                Q(**{f'first_name__{lookup}': term})
+                | Q(**{f'last_name__{lookup}': term})
+                | Q(**{f'email__{lookup}': term})
+                | Q(department_id__in=departments)
+            )
+        return queryset
+
+    @staticmethod
+    def get_page(query: str = '', sort: str = DEFAULT_SORT, cursor: Optional[str] = None, limit: int = PAGE_SIZE) -> Tuple[List[Employee], Optional[str]]:
+        ordering = EmployeeDirectoryService.SORTS.get(sort, EmployeeDirectoryService.SORTS[EmployeeDirectoryService.DEFAULT_SORT])
+        queryset = Employee.objects.select_related('department')
+        if query.strip():
+            queryset = EmployeeDirectoryService.search(queryset, query)
+        return KeysetPagination.get_page(queryset, ordering, cursor, limit)
 
 
 class DateRangeService:
@@ -10,8 +136,8 @@ class DateRangeService:
         return date.today()
     
     @staticmethod
-    def get_predefined_range(range_type: str) -> Tuple[date, date]:
-        today = date.today()
+    def get_predefined_range(range_type: str, today: Optional[date] = None) -> Tuple[date, date]:
+        today = today or date.today()
         
         if range_type == 'today':
             return today, today
@@ -90,3 +216,1679 @@ class DateRangeService:
             months.append((new_date.month, new_date.year))
         
         return months
+
+
+class AttendanceMatrixBuilder:
+
+    def __init__(self, start_date: date, end_date: date, employee_ids: Optional[Iterable[int]] = None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.employee_ids = list(employee_ids) if employee_ids is not None else None
+        self.index: Dict[Tuple[int, date], Attendance] = {}
+
+    def get_queryset(self):
+        queryset = Attendance.objects.filter(
+            date__gte=self.start_date,
+            date__lte=self.end_date,
+        )
+        if self.employee_ids is not None:
+            queryset = queryset.filter(employee_id__in=self.employee_ids)
+        return queryset.only('id', 'employee_id', 'date', 'status').order_by()
+
+    def load(self, attendances: Optional[Iterable[Attendance]] = None) -> Dict[Tuple[int, date], Attendance]:
+        if attendances is None:
+            attendances = self.get_queryset()
+        self.index = {(att.employee_id, att.date): att for att in attendances}
+        return self.index
+
+    def build_rows(self, employees: Iterable, dates: List[dict]) -> List[dict]:
+        index = self.index
+        attendance_matrix = []
+        for employee in employees:
+            employee_id = employee.id
+            attendance_matrix.append({
+                'employee': employee,
+                'daily_attendance': [
+                    {
+                        'date': d_info['date'],
+                        'attendance': index.get((employee_id, d_info['date'])),
+                        'is_non_working': d_info['is_non_working'],
+                        'is_locked': False,
+                    }
+                    for d_info in dates
+                ],
+            })
+        return attendance_matrix
+
+    def build_daily_stats(self, dates: List[dict], counts: Optional[Dict[date, Dict[str, int]]] = None) -> List[dict]:
+        if counts is None:
+            counts = {}
+            for (_, att_date), att in self.index.items():
+                day_counts = counts.setdefault(att_date, {'total': 0, 'present': 0, 'absent': 0})
+                day_counts['total'] += 1
+                if att.status in ('present', 'absent'):
+                    day_counts[att.status] += 1
+
+        daily_stats = []
+        for d_info in dates:
+            day_counts = counts.get(d_info['date'], {'total': 0, 'present': 0, 'absent': 0})
+            daily_stats.append({
+                'date': d_info['date'],
+                'weekday': d_info['weekday'],
+                'total': day_counts['total'],
+                'present': day_counts['present'],
+                'absent': day_counts['absent'],
+                'is_non_working': d_info['is_non_working'],
+            })
+        return daily_stats
+
+
+class AttendanceMatrixPaginator:
+    EMPLOYEES_PER_PAGE = 50
+    DAYS_PER_WINDOW = 31
+
+    @staticmethod
+    def get_employee_page(page_number) -> Page:
+        employees = Employee.objects.select_related('department').order_by('first_name', 'last_name', 'id')
+        return Paginator(employees, AttendanceMatrixPaginator.EMPLOYEES_PER_PAGE).get_page(page_number)
+
+    @staticmethod
+    def get_date_window(start_date: date, end_date: date, window=None) -> Dict[str, Any]:
+        days_per_window = AttendanceMatrixPaginator.DAYS_PER_WINDOW
+        window_count = (end_date - start_date).days // days_per_window + 1
+        try:
+            window = int(window)
+        except (TypeError, ValueError):
+            # Default to the most recent days of the range
+            window = window_count
+        window = min(max(window, 1), window_count)
+
+        # Counted back from end_date, so the newest window is always full and only the
+        # oldest one can be short
+        window_end = end_date - timedelta(days=(window_count - window) * days_per_window)
+        window_start = max(window_end - timedelta(days=days_per_window - 1), start_date)
+        return {
+            'number': window,
+            'count': window_count,
+            'start_date': window_start,
+            'end_date': window_end,
+            'has_previous': window > 1,
+            'has_next': window < window_count,
+        }
+
+
+class HolidayCalendar:
+    # Signals only reach the current process, so other workers reload on this interval
+    CACHE_TTL = 300
+
+    _lookup: Optional[Tuple[Dict[date, Tuple[date, str]], Dict[Tuple[int, int], Tuple[date, str]]]] = None
+    _loaded_at = 0.0
+
+    @staticmethod
+    def get_queryset():
+        return Holiday.objects.order_by('date').values_list('date', 'name', 'is_recurring')
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[date, str, bool]]) -> Tuple[Dict[date, Tuple[date, str]], Dict[Tuple[int, int], Tuple[date, str]]]:
+        by_date = {}
+        recurring = {}
+        for holiday_date, name, is_recurring in rows:
+            by_date[holiday_date] = (holiday_date, name)
+            if is_recurring:
+                recurring.setdefault((holiday_date.month, holiday_date.day), (holiday_date, name))
+        lookup = (by_date, recurring)
+        cls._loaded_at = time.monotonic()
+        cls._lookup = lookup
+        return lookup
+
+    @classmethod
+    def load(cls) -> Tuple[Dict[date, Tuple[date, str]], Dict[Tuple[int, int], Tuple[date, str]]]:
+        return cls.build(cls.get_queryset())
+
+    @classmethod
+    def is_stale(cls) -> bool:
+        return cls._lookup is None or time.monotonic() - cls._loaded_at > cls.CACHE_TTL
+
+    @classmethod
+    async def aensure_loaded(cls) -> Tuple[Dict[date, Tuple[date, str]], Dict[Tuple[int, int], Tuple[date, str]]]:
+        # Async views pass the returned snapshot on, so an invalidation or TTL expiry
+        # in between can never make get_lookup() query from the event loop
+        lookup = cls._lookup
+        if cls.is_stale():
+            lookup = cls.build([row async for row in cls.get_queryset()])
+        return lookup
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls._lookup = None
+
+    @classmethod
+    def get_lookup(cls) -> Tuple[Dict[date, Tuple[date, str]], Dict[Tuple[int, int], Tuple[date, str]]]:
+        lookup = cls._lookup
+        if cls.is_stale():
+            lookup = cls.load()
+        return lookup
+
+    @classmethod
+    def get_holiday_name(cls, date_obj: date) -> Optional[str]:
+        by_date, recurring = cls.get_lookup()
+        matches = [m for m in (by_date.get(date_obj), recurring.get((date_obj.month, date_obj.day))) if m]
+        if not matches:
+            return None
+        # Same precedence as the old ordered .first() query: earliest holiday date wins
+        return min(matches)[1]
+
+    @classmethod
+    def is_holiday(cls, date_obj: date) -> bool:
+        return cls.get_holiday_name(date_obj) is not None
+
+
+class WorkingDayCalendar:
+    # One flag byte per day of the year plus a running count of working days, so
+    # range questions are slices and subtractions once a year has been built
+    WEEKEND = 1
+    HOLIDAY = 2
+
+    # The holiday lookup the years were built from, paired with them so a reset by
+    # another thread can never mix years built from different lookups
+    _memo: Tuple[Any, Dict[int, Tuple[bytes, array]]] = (None, {})
+
+    @classmethod
+    def build_year(cls, year: int, lookup) -> Tuple[bytes, array]:
+        by_date, recurring = lookup
+        first_day = date(year, 1, 1)
+        flags = bytearray(366 if calendar.isleap(year) else 365)
+        weekday = first_day.weekday()
+        for index in range(len(flags)):
+            if (weekday + index) % 7 >= 5:
+                flags[index] = cls.WEEKEND
+        holiday_dates = [holiday_date for holiday_date in by_date if holiday_date.year == year]
+        for month, day in recurring:
+            if month != 2 or day != 29 or calendar.isleap(year):
+                holiday_dates.append(date(year, month, day))
+        for holiday_date in holiday_dates:
+            flags[(holiday_date - first_day).days] |= cls.HOLIDAY
+        # working[i] is the number of working days before day i of the year
+        working = array('H', accumulate((flag == 0 for flag in flags), initial=0))
+        return bytes(flags), working
+
+    @classmethod
+    def get_year(cls, year: int, lookup=None) -> Tuple[bytes, array]:
+        if lookup is None:
+            lookup = HolidayCalendar.get_lookup()
+        source, years = cls._memo
+        if source is not lookup:
+            # Holidays were reloaded or invalidated, so every memoized year is suspect
+            years = {}
+            cls._memo = (lookup, years)
+        built = years.get(year)
+        if built is None:
+            # Stored in this lookup's dict even if the memo has moved on meanwhile
+            built = years[year] = cls.build_year(year, lookup)
+        return built
+
+    @classmethod
+    def get_flag(cls, date_obj: date) -> int:
+        flags, _ = cls.get_year(date_obj.year)
+        return flags[date_obj.timetuple().tm_yday - 1]
+
+    @classmethod
+    def is_weekend(cls, date_obj: date) -> bool:
+        return bool(cls.get_flag(date_obj) & cls.WEEKEND)
+
+    @classmethod
+    def is_holiday(cls, date_obj: date) -> bool:
+        return bool(cls.get_flag(date_obj) & cls.HOLIDAY)
+
+    @classmethod
+    def is_working_day(cls, date_obj: date) -> bool:
+        return cls.get_flag(date_obj) == 0
+
+    @classmethod
+    def get_flags(cls, start_date: date, end_date: date, lookup=None) -> bytes:
+        chunks = []
+        for year in range(start_date.year, end_date.year + 1):
+            flags, _ = cls.get_year(year, lookup)
+            first = (start_date.timetuple().tm_yday - 1) if year == start_date.year else 0
+            last = end_date.timetuple().tm_yday if year == end_date.year else len(flags)
+            chunks.append(flags[first:last])
+        return b''.join(chunks)
+
+    @classmethod
+    def count_working_days(cls, start_date: date, end_date: date, lookup=None) -> int:
+        if start_date > end_date:
+            return 0
+        total = 0
+        for year in range(start_date.year, end_date.year + 1):
+            flags, working = cls.get_year(year, lookup)
+            first = (start_date.timetuple().tm_yday - 1) if year == start_date.year else 0
+            last = end_date.timetuple().tm_yday if year == end_date.year else len(flags)
+            total += working[last] - working[first]
+        return total
+
+    @classmethod
+    def iter_working_days(cls, start_date: date, end_date: date) -> Iterator[date]:
+        for offset, flag in enumerate(cls.get_flags(start_date, end_date)):
+            if not flag:
+                yield start_date + timedelta(days=offset)
+
+
+class FragmentCache:
+    # Fragments are keyed by the versions of the data they were built from, so a write
+    # only orphans the entries that read it; closed months keep their cached grids.
+    # Versions are only bumped in the writing process's cache, so the timeout
+    # (FRAGMENT_CACHE_TIMEOUT) bounds how stale a process-local cache can get.
+    EMPLOYEES = 'employees'
+    HOLIDAYS = 'holidays'
+
+    @staticmethod
+    def attendance_scopes(dates: Iterable[date]) -> List[str]:
+        return sorted({f'attendance:{d:%Y-%m}' for d in dates if d is not None})
+
+    @staticmethod
+    def attendance_range_scopes(start_date: date, end_date: date) -> List[str]:
+        scopes = []
+        month = start_date.replace(day=1)
+        while month <= end_date:
+            scopes.append(f'attendance:{month:%Y-%m}')
+            month += relativedelta(months=1)
+        return scopes
+
+    @staticmethod
+    def version_key(scope: str) -> str:
+        return f'fragment-version:{scope}'
+
+    @classmethod
+    def get_versions(cls, scopes: Iterable[str]) -> Dict[str, int]:
+        keys = {cls.version_key(scope): scope for scope in scopes}
+        found = cache.get_many(keys)
+        versions = {}
+        for key, scope in keys.items():
+            version = found.get(key)
+            if version is None:
+                # Start from the clock so an evicted counter never reuses an old version
+                cache.add(key, time.time_ns(), None)
+                version = cache.get(key)
+            versions[scope] = version
+        return versions
+
+    @classmethod
+    async def aget_versions(cls, scopes: Iterable[str]) -> Dict[str, int]:
+        keys = {cls.version_key(scope): scope for scope in scopes}
+        found = await cache.aget_many(keys)
+        versions = {}
+        for key, scope in keys.items():
+            version = found.get(key)
+            if version is None:
+                await cache.aadd(key, time.time_ns(), None)
+                version = await cache.aget(key)
+            versions[scope] = version
+        return versions
+
+    @classmethod
+    def bump(cls, scopes: Iterable[str]) -> None:
+        for scope in set(scopes):
+            key = cls.version_key(scope)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), None)
+
+    @classmethod
+    def bump_on_commit(cls, scopes: Iterable[str]) -> None:
+        scopes = list(scopes)
+        cls.bump(scopes)
+        # Readers may have cached uncommitted-era data under the new version meanwhile
+        transaction.on_commit(lambda: cls.bump(scopes))
+
+    @staticmethod
+    def build_key(name: str, parts: Iterable[Any], versions: Dict[str, int]) -> str:
+        raw = '|'.join([*map(str, parts), *(f'{scope}={version}' for scope, version in sorted(versions.items()))])
+        return f'fragment:{name}:{hashlib.md5(raw.encode()).hexdigest()}'
+
+    @classmethod
+    def make_key(cls, name: str, parts: Iterable[Any], scopes: Iterable[str]) -> str:
+        return cls.build_key(name, parts, cls.get_versions(scopes))
+
+    @classmethod
+    def get_or_render(cls, name: str, parts: Iterable[Any], scopes: Iterable[str], render) -> Any:
+        key = cls.make_key(name, parts, scopes)
+        value = cache.get(key)
+        if value is None:
+            value = render()
+            cache.set(key, value, settings.FRAGMENT_CACHE_TIMEOUT)
+        return value
+
+    @classmethod
+    async def aget_or_render(cls, name: str, parts: Iterable[Any], scopes: Iterable[str], render) -> Any:
+        # render stays synchronous (templates, paginators) and only runs on a miss
+        key = cls.build_key(name, parts, await cls.aget_versions(scopes))
+        value = await cache.aget(key)
+        if value is None:
+            value = await sync_to_async(render)()
+            await cache.aset(key, value, settings.FRAGMENT_CACHE_TIMEOUT)
+        return value
+
+
+class FreshnessService:
+
+    @staticmethod
+    def get_state(querysets: Iterable) -> Tuple[List[Tuple[int, Optional[datetime]]], Optional[datetime]]:
+        # Row counts catch deletes, which leave no newer updated_at behind. COUNT(*) and
+        # MAX(updated_at) over a date range are both answered from attendance_date_updated_idx
+        states = []
+        for queryset in querysets:
+            state = queryset.order_by().aggregate(count=Count('*'), last=Max('updated_at'))
+            states.append((state['count'], state['last']))
+        return FreshnessService.combine(states)
+
+    @staticmethod
+    async def aget_state(querysets: Iterable) -> Tuple[List[Tuple[int, Optional[datetime]]], Optional[datetime]]:
+        # Django's async ORM runs every query on the one thread-sensitive sync thread,
+        # so these are awaited in turn; gathering them would not overlap anything
+        results = [
+            await queryset.order_by().aaggregate(count=Count('*'), last=Max('updated_at'))
+            for queryset in querysets
+        ]
+        return FreshnessService.combine([(state['count'], state['last']) for state in results])
+
+    @staticmethod
+    def combine(states: List[Tuple[int, Optional[datetime]]]) -> Tuple[List[Tuple[int, Optional[datetime]]], Optional[datetime]]:
+        timestamps = [last for _, last in states if last is not None]
+        return states, max(timestamps) if timestamps else None
+
+
+class DashboardStatsService:
+
+    @staticmethod
+    def status_counts() -> Dict[str, Count]:
+        return {
+            'total': Count('id'),
+            'present': Count('id', filter=Q(status='present')),
+            'absent': Count('id', filter=Q(status='absent')),
+        }
+
+    @staticmethod
+    def today_totals(today: date) -> Dict[str, Count]:
+        return {
+            'today_total': Count('id', filter=Q(date=today)),
+            'today_present': Count('id', filter=Q(date=today, status='present')),
+            'today_absent': Count('id', filter=Q(date=today, status='absent')),
+            'recent_attendance_count': Count('id'),
+        }
+
+    @staticmethod
+    def headcounts_queryset():
+        return (
+            Employee.objects.filter(department__isnull=False)
+            .values_list('department')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+
+    @staticmethod
+    def present_counts_queryset(today: date):
+        return (
+            Attendance.objects.filter(date=today, status='present', employee__department__isnull=False)
+            .values_list('employee__department')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+
+    @staticmethod
+    def build_department_stats(departments, headcounts: Dict[int, int], present_counts: Dict[int, int]) -> List[dict]:
+        return [
+            {
+                'name': dept.name,
+                'employee_count': headcounts.get(dept.id, 0),
+                'today_present': present_counts.get(dept.id, 0),
+            }
+            for dept in departments
+        ]
+
+    @staticmethod
+    def build_week_trend(start_date: date, days: int, counts: Dict[date, Dict[str, int]]) -> List[dict]:
+        week_attendance = []
+        for i in range(days):
+            day = start_date + timedelta(days=i)
+            day_counts = counts.get(day, {})
+            week_attendance.append({
+                'date': day,
+                'total': day_counts.get('total', 0),
+                'present': day_counts.get('present', 0),
+                'absent': day_counts.get('absent', 0),
+            })
+        return week_attendance
+
+    @staticmethod
+    def build_stats(total_employees: int, totals: Dict[str, int], department_stats: List[dict], week_attendance: List[dict]) -> Dict[str, Any]:
+        today_total = totals['today_total']
+        today_present = totals['today_present']
+        return {
+            'total_employees': total_employees,
+            'today_present': today_present,
+            'today_absent': totals['today_absent'],
+            'today_total': today_total,
+            'today_percentage': round((today_present / today_total * 100) if today_total > 0 else 0, 1),
+            'recent_attendance_count': totals['recent_attendance_count'],
+            'department_stats': department_stats,
+            'week_attendance': week_attendance,
+        }
+
+    @staticmethod
+    def get_today_totals(today: date, week_start: date) -> Dict[str, int]:
+        return Attendance.objects.filter(date__gte=week_start).aggregate(**DashboardStatsService.today_totals(today))
+
+    @staticmethod
+    def get_department_stats(today: date) -> List[dict]:
+        return DashboardStatsService.build_department_stats(
+            Department.objects.all(),
+            dict(DashboardStatsService.headcounts_queryset()),
+            dict(DashboardStatsService.present_counts_queryset(today)),
+        )
+
+    @staticmethod
+    def get_week_trend(today: date, days: int = 7) -> List[dict]:
+        start_date = today - timedelta(days=days - 1)
+        counts = AttendanceSummaryService.get_daily_counts(start_date, today)
+        return DashboardStatsService.build_week_trend(start_date, days, counts)
+
+    @staticmethod
+    def get_stats(today: date) -> Dict[str, Any]:
+        week_start = today - timedelta(days=today.weekday())
+        return DashboardStatsService.build_stats(
+            Employee.objects.count(),
+            DashboardStatsService.get_today_totals(today, week_start),
+            DashboardStatsService.get_department_stats(today),
+            DashboardStatsService.get_week_trend(today),
+        )
+
+    @staticmethod
+    async def aget_today_totals(today: date, week_start: date) -> Dict[str, int]:
+        return await Attendance.objects.filter(date__gte=week_start).aaggregate(**DashboardStatsService.today_totals(today))
+
+    @staticmethod
+    async def aget_department_stats(today: date) -> List[dict]:
+        departments = await alist(Department.objects.all())
+        headcounts = await alist(DashboardStatsService.headcounts_queryset())
+        present_counts = await alist(DashboardStatsService.present_counts_queryset(today))
+        return DashboardStatsService.build_department_stats(departments, dict(headcounts), dict(present_counts))
+
+    @staticmethod
+    async def aget_week_trend(today: date, days: int = 7) -> List[dict]:
+        start_date = today - timedelta(days=days - 1)
+        counts = await AttendanceSummaryService.aget_daily_counts(start_date, today)
+        return DashboardStatsService.build_week_trend(start_date, days, counts)
+
+    @staticmethod
+    async def aget_stats(today: date) -> Dict[str, Any]:
+        week_start = today - timedelta(days=today.weekday())
+        return DashboardStatsService.build_stats(
+            await Employee.objects.acount(),
+            await DashboardStatsService.aget_today_totals(today, week_start),
+            await DashboardStatsService.aget_department_stats(today),
+            await DashboardStatsService.aget_week_trend(today),
+        )
+
+
+class DepartmentAnalyticsService:
+    PRESETS = ['last7days', 'last30days', 'last90days', 'thisweek', 'lastweek', 'thismonth', 'lastmonth', 'thisyear', 'lastyear']
+    DEFAULT_PRESET = 'last30days'
+    GRANULARITIES = {'week': TruncWeek, 'month': TruncMonth}
+
+    @staticmethod
+    def get_queryset(start_date: date, end_date: date, granularity: str):
+        # One grouped pass over the per-day, per-department summary rather than raw attendance
+        trunc = DepartmentAnalyticsService.GRANULARITIES[granularity]
+        return (
+            DailyAttendanceSummary.objects.filter(date__gte=start_date, date__lte=end_date)
+            .annotate(period=trunc('date'))
+            .values('department', 'department__name', 'period')
+            .annotate(total=Sum('total'), present=Sum('present'), absent=Sum('absent'))
+            .order_by('period')
+        )
+
+    @staticmethod
+    def build(rows: Iterable[dict]) -> Tuple[List[date], List[dict]]:
+        periods = []
+        departments = {}
+        for row in rows:
+            period = row['period']
+            if not periods or periods[-1] != period:
+                periods.append(period)
+            stats = departments.get(row['department'])
+            if stats is None:
+                stats = departments[row['department']] = {
+                    'id': row['department'],
+                    'name': row['department__name'] or 'No Department',
+                    'total': 0,
+                    'present': 0,
+                    'absent': 0,
+                    'trend': {},
+                }
+            stats['total'] += row['total']
+            stats['present'] += row['present']
+            stats['absent'] += row['absent']
+            stats['trend'][period] = EmployeeAttendanceHistoryService.presence_rate(row['present'], row['total'])
+        results = []
+        for stats in departments.values():
+            stats['presence_rate'] = EmployeeAttendanceHistoryService.presence_rate(stats['present'], stats['total'])
+            # Periods without records stay None so every trend lines up with the period list
+            stats['trend'] = [stats['trend'].get(period) for period in periods]
+            results.append(stats)
+        results.sort(key=lambda stats: (stats['id'] is None, stats['name']))
+        return periods, results
+
+    @staticmethod
+    def compute(start_date: date, end_date: date, granularity: str) -> Dict[str, Any]:
+        periods, departments = DepartmentAnalyticsService.build(
+            DepartmentAnalyticsService.get_queryset(start_date, end_date, granularity)
+        )
+        return {'periods': periods, 'departments': departments}
+
+    @staticmethod
+    def get_scopes(start_date: date, end_date: date) -> List[str]:
+        # Summaries follow attendance writes; department renames and moves bump EMPLOYEES
+        return [FragmentCache.EMPLOYEES, *FragmentCache.attendance_range_scopes(start_date, end_date)]
+
+    @staticmethod
+    async def aget_analytics(preset: str, granularity: str, today: date) -> Dict[str, Any]:
+        start_date, end_date = DateRangeService.get_predefined_range(preset, today)
+        analytics = await FragmentCache.aget_or_render(
+            'department-analytics',
+            [preset, granularity, start_date, end_date],
+            DepartmentAnalyticsService.get_scopes(start_date, end_date),
+            lambda: DepartmentAnalyticsService.compute(start_date, end_date, granularity),
+        )
+        return {'preset': preset, 'granularity': granularity, 'start_date': start_date, 'end_date': end_date, **analytics}
+
+
+class EmployeeAttendanceHistoryService:
+    PAGE_SIZE = 25
+
+    @staticmethod
+    def get_queryset(employee_id: int, start_date: date, end_date: date):
+        # Served by the (employee, date) unique index, however long the history is
+        return Attendance.objects.filter(employee_id=employee_id, date__gte=start_date, date__lte=end_date).order_by()
+
+    @staticmethod
+    def presence_rate(present: int, total: int) -> float:
+        return round(present / total * 100, 1) if total else 0.0
+
+    @staticmethod
+    def get_totals(queryset) -> Dict[str, Any]:
+        totals = queryset.aggregate(
+            **DashboardStatsService.status_counts(), first_date=Min('date'), last_date=Max('date'),
+        )
+        totals['presence_rate'] = EmployeeAttendanceHistoryService.presence_rate(totals['present'], totals['total'])
+        return totals
+
+    @staticmethod
+    def get_monthly_breakdown(queryset) -> List[dict]:
+        rows = (
+            queryset.annotate(month=TruncMonth('date'))
+            .values('month')
+            .annotate(**DashboardStatsService.status_counts())
+            .order_by('-month')
+        )
+        return [
+            {**row, 'presence_rate': EmployeeAttendanceHistoryService.presence_rate(row['present'], row['total'])}
+            for row in rows
+        ]
+
+    @staticmethod
+    def get_absence_streaks(queryset) -> Dict[str, Any]:
+        # Only the first record of each run of equal statuses comes back; a run's
+        # length is the distance to the next run's position
+        ordering = F('date').asc()
+        starts = list(
+            queryset.annotate(
+                position=Window(RowNumber(), order_by=ordering),
+                previous_status=Window(Lag('status'), order_by=ordering),
+                record_count=Window(Count('id')),
+            )
+            .filter(Q(previous_status__isnull=True) | ~Q(previous_status=F('status')))
+            .order_by('date')
+            .values_list('position', 'date', 'status', 'record_count')
+        )
+        streaks = []
+        for index, (position, start_date, status, record_count) in enumerate(starts):
+            if status == 'absent':
+                end_position = starts[index + 1][0] if index + 1 < len(starts) else record_count + 1
+                streaks.append({'start_date': start_date, 'length': end_position - position})
+        return {
+            'count': len(streaks),
+            'longest': max((streak['length'] for streak in streaks), default=0),
+            'current': streaks[-1]['length'] if starts and starts[-1][2] == 'absent' else 0,
+            'streaks': streaks,
+        }
+
+    @staticmethod
+    def get_page(queryset, page_number) -> Page:
+        records = queryset.order_by('-date').only('id', 'date', 'status', 'created_at')
+        return Paginator(records, EmployeeAttendanceHistoryService.PAGE_SIZE).get_page(page_number)
+
+    @staticmethod
+    def get_history(employee_id: int, start_date: date, end_date: date, page_number=None) -> Dict[str, Any]:
+        queryset = EmployeeAttendanceHistoryService.get_queryset(employee_id, start_date, end_date)
+        return {
+            'totals': EmployeeAttendanceHistoryService.get_totals(queryset),
+            'monthly': EmployeeAttendanceHistoryService.get_monthly_breakdown(queryset),
+            'absence_streaks': EmployeeAttendanceHistoryService.get_absence_streaks(queryset),
+            'page': EmployeeAttendanceHistoryService.get_page(queryset, page_number),
+        }
+
+
+class AttendanceBulkWriter:
+    STATUS_PREFIX = 'status_'
+    BATCH_SIZE = 500
+
+    @staticmethod
+    def parse_statuses(data: Mapping[str, str]) -> Dict[int, str]:
+        valid_statuses = {value for value, _ in Attendance.STATUS_CHOICES}
+        prefix = AttendanceBulkWriter.STATUS_PREFIX
+        statuses = {}
+        for key, status in data.items():
+            if not key.startswith(prefix) or status not in valid_statuses:
+                continue
+            try:
+                statuses[int(key[len(prefix):])] = status
+            except ValueError:
+                continue
+        return statuses
+
+    @staticmethod
+    def write(attendance_date: date, statuses: Dict[int, str]) -> Tuple[int, int]:
+        if not statuses:
+            return 0, 0
+
+        with transaction.atomic():
+            employee_ids = set(Employee.objects.filter(id__in=statuses.keys()).values_list('id', flat=True).order_by())
+            existing_ids = set(
+                Attendance.objects.filter(date=attendance_date, employee_id__in=employee_ids)
+                .values_list('employee_id', flat=True)
+                .order_by()
+            )
+            now = timezone.now()
+            Attendance.objects.bulk_create(
+                [
+                    Attendance(employee_id=employee_id, date=attendance_date, status=statuses[employee_id], created_at=now)
+                    for employee_id in sorted(employee_ids)
+                ],
+                batch_size=AttendanceBulkWriter.BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['employee', 'date'],
+                update_fields=['status', 'created_at', 'updated_at'],
+            )
+            AttendanceSummaryService.refresh_dates([attendance_date])
+            FragmentCache.bump_on_commit(FragmentCache.attendance_scopes([attendance_date]))
+
+        updated = len(existing_ids)
+        return len(employee_ids) - updated, updated
+
+
+class AttendanceSummaryService:
+    BATCH_SIZE = 500
+    LOCK_NAMESPACE = 6001
+
+    _pending = threading.local()
+
+    @staticmethod
+    def build_summaries(attendances) -> List[DailyAttendanceSummary]:
+        rows = (
+            attendances.values('date', 'employee__department')
+            .annotate(**DashboardStatsService.status_counts())
+            .order_by()
+        )
+        return [
+            DailyAttendanceSummary(
+                date=row['date'],
+                department_id=row['employee__department'],
+                present=row['present'],
+                absent=row['absent'],
+                total=row['total'],
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def lock_dates(dates: List[date]) -> None:
+        # Concurrent refreshes of one date would otherwise interleave on PostgreSQL. Rows
+        # without a department can't rely on ON CONFLICT (NULLs never conflict), so the
+        # refreshes are serialised per date until the transaction ends. Sorted dates keep
+        # the lock order consistent. SQLite already serialises writers.
+        if connection.vendor != 'postgresql':
+            return
+        with connection.cursor() as cursor:
+            for day in dates:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s, %s)', [AttendanceSummaryService.LOCK_NAMESPACE, day.toordinal()])
+
+    @staticmethod
+    def refresh_dates(dates: Iterable[date]) -> None:
+        dates = sorted(set(dates))
+        if not dates:
+            return
+        with transaction.atomic():
+            AttendanceSummaryService.lock_dates(dates)
+            summaries = AttendanceSummaryService.build_summaries(Attendance.objects.filter(date__in=dates))
+            departments = {day: [] for day in dates}
+            for summary in summaries:
+                if summary.department_id is not None:
+                    departments[summary.date].append(summary.department_id)
+
+            # Upsert the department rows and drop those whose department has no records left
+            stale = Q(department__isnull=True)
+            for day, department_ids in departments.items():
+                stale |= Q(date=day) & ~Q(department_id__in=department_ids)
+            DailyAttendanceSummary.objects.filter(date__in=dates).filter(stale).delete()
+            DailyAttendanceSummary.objects.bulk_create(
+                [summary for summary in summaries if summary.department_id is not None],
+                batch_size=AttendanceSummaryService.BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['date', 'department'],
+                update_fields=['present', 'absent', 'total'],
+            )
+            DailyAttendanceSummary.objects.bulk_create(
+                [summary for summary in summaries if summary.department_id is None],
+                batch_size=AttendanceSummaryService.BATCH_SIZE,
+            )
+
+    @classmethod
+    def schedule_refresh(cls, dates: Iterable[date]) -> None:
+        # Coalesce per transaction so cascades (e.g. deleting an employee) refresh each date once.
+        # One flush is queued per batch, bound to that batch's set; a rollback drops both and
+        # the next call starts a new batch instead of adding to the dead one.
+        dates = {d for d in dates if d is not None}
+        if not dates:
+            return
+        run_on_commit = transaction.get_connection().run_on_commit
+        pending = getattr(cls._pending, 'dates', None)
+        slot, flush = getattr(cls._pending, 'queued', (0, None))
+        if pending and slot < len(run_on_commit) and run_on_commit[slot][1] is flush:
+            pending.update(dates)
+            return
+        pending = cls._pending.dates = dates
+        flush = partial(cls.flush, pending)
+        cls._pending.queued = (len(run_on_commit), flush)
+        transaction.on_commit(flush)
+
+    @classmethod
+    def flush(cls, pending: Set[date]) -> None:
+        dates = set(pending)
+        pending.clear()
+        if dates:
+            cls.refresh_dates(dates)
+
+    @staticmethod
+    def rebuild(start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+        full_rebuild = start_date is None and end_date is None
+        if start_date is None or end_date is None:
+            bounds = Attendance.objects.aggregate(first=Min('date'), last=Max('date'))
+            start_date = start_date or bounds['first']
+            end_date = end_date or bounds['last']
+        if full_rebuild:
+            # Summaries left outside the attendance range were cached under their own months
+            stale = DailyAttendanceSummary.objects.aggregate(first=Min('date'), last=Max('date'))
+            with transaction.atomic():
+                DailyAttendanceSummary.objects.all().delete()
+                if stale['first'] is not None:
+                    FragmentCache.bump_on_commit(FragmentCache.attendance_range_scopes(stale['first'], stale['last']))
+        if start_date is None or end_date is None or start_date > end_date:
+            return 0
+
+        created = 0
+        chunk_start = start_date
+        while chunk_start <= end_date:
+            _, month_end = DateRangeService.get_month_range(chunk_start.month, chunk_start.year)
+            chunk_end = min(month_end, end_date)
+            with transaction.atomic():
+                DailyAttendanceSummary.objects.filter(date__gte=chunk_start, date__lte=chunk_end).delete()
+                summaries = DailyAttendanceSummary.objects.bulk_create(
+                    AttendanceSummaryService.build_summaries(
+                        Attendance.objects.filter(date__gte=chunk_start, date__lte=chunk_end)
+                    ),
+                    batch_size=AttendanceSummaryService.BATCH_SIZE,
+                )
+                FragmentCache.bump_on_commit(FragmentCache.attendance_range_scopes(chunk_start, chunk_end))
+            created += len(summaries)
+            chunk_start = chunk_end + timedelta(days=1)
+        return created
+
+    @staticmethod
+    def daily_counts_queryset(start_date: date, end_date: date):
+        return (
+            DailyAttendanceSummary.objects.filter(date__gte=start_date, date__lte=end_date)
+            .values('date')
+            .annotate(total=Sum('total'), present=Sum('present'), absent=Sum('absent'))
+            .order_by()
+        )
+
+    @staticmethod
+    def build_daily_counts(rows: Iterable[dict]) -> Dict[date, Dict[str, int]]:
+        return {
+            row['date']: {'total': row['total'], 'present': row['present'], 'absent': row['absent']}
+            for row in rows
+        }
+
+    @staticmethod
+    def get_daily_counts(start_date: date, end_date: date) -> Dict[date, Dict[str, int]]:
+        return AttendanceSummaryService.build_daily_counts(
+            AttendanceSummaryService.daily_counts_queryset(start_date, end_date)
+        )
+
+    @staticmethod
+    async def aget_daily_counts(start_date: date, end_date: date) -> Dict[date, Dict[str, int]]:
+        return AttendanceSummaryService.build_daily_counts(
+            await alist(AttendanceSummaryService.daily_counts_queryset(start_date, end_date))
+        )
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+class AttendanceExportService:
+    CHUNK_SIZE = 2000
+    FIELDS = ['date', 'employee_id', 'first_name', 'last_name', 'email', 'department', 'status']
+
+    @staticmethod
+    def get_rows(start_date: date, end_date: date, department_id: Optional[int] = None) -> Iterator[tuple]:
+        queryset = Attendance.objects.filter(date__gte=start_date, date__lte=end_date)
+        if department_id is not None:
+            queryset = queryset.filter(employee__department_id=department_id)
+        # Pin the database now: the rows stream after the view (and its routing) has returned
+        queryset = queryset.using(queryset.db)
+        return queryset.values_list(
+            'date',
+            'employee_id',
+            'employee__first_name',
+            'employee__last_name',
+            'employee__email',
+            'employee__department__name',
+            'status',
+        ).order_by('date', 'employee_id').iterator(chunk_size=AttendanceExportService.CHUNK_SIZE)
+
+    @staticmethod
+    def stream_csv(rows: Iterable[tuple]) -> Iterator[str]:
+        writer = csv.writer(Echo())
+        yield writer.writerow(AttendanceExportService.FIELDS)
+        for row in rows:
+            yield writer.writerow((row[0].isoformat(),) + row[1:])
+
+    @staticmethod
+    def stream_ndjson(rows: Iterable[tuple]) -> Iterator[str]:
+        fields = AttendanceExportService.FIELDS
+        for row in rows:
+            yield json.dumps(dict(zip(fields, (row[0].isoformat(),) + row[1:]))) + '\n'
+
+
+class AttendanceGapReportService:
+    CHUNK_SIZE = 5000
+    CSV_FIELDS = ['employee_id', 'name', 'email', 'department', 'expected', 'recorded', 'absent', 'missing', 'absence_rate', 'gaps']
+
+    @staticmethod
+    def get_employees(department_id: Optional[int] = None):
+        queryset = Employee.objects.all()
+        if department_id is not None:
+            queryset = queryset.filter(department_id=department_id)
+        return queryset.order_by('id').values_list('id', 'first_name', 'last_name', 'email', 'department__name', 'hire_date')
+
+    @staticmethod
+    def get_records(start_date: date, end_date: date, department_id: Optional[int] = None) -> Iterator[tuple]:
+        # Ordered like the (employee, date) unique index so it can be merged against employees
+        queryset = Attendance.objects.filter(date__gte=start_date, date__lte=end_date)
+        if department_id is not None:
+            queryset = queryset.filter(employee__department_id=department_id)
+        return (
+            queryset.order_by('employee_id', 'date')
+            .values_list('employee_id', 'date', 'status')
+            .iterator(chunk_size=AttendanceGapReportService.CHUNK_SIZE)
+        )
+
+    @staticmethod
+    def build_row(employee: tuple, working_days: List[date], statuses: Dict[date, str]) -> Dict[str, Any]:
+        employee_id, first_name, last_name, email, department, hire_date = employee
+        # Nothing is expected before the hire date
+        expected = working_days[bisect_left(working_days, hire_date):] if hire_date else working_days
+        present = absent = 0
+        gaps = []
+        in_gap = False
+        for day in expected:
+            status = statuses.get(day)
+            if status is None:
+                # Consecutive missing working days form one gap, even across weekends
+                if not in_gap:
+                    gaps.append([day, day, 0])
+                    in_gap = True
+                gaps[-1][1] = day
+                gaps[-1][2] += 1
+                continue
+            in_gap = False
+            if status == 'present':
+                present += 1
+            else:
+                absent += 1
+        recorded = present + absent
+        missing = len(expected) - recorded
+        return {
+            'employee_id': employee_id,
+            'name': f'{first_name} {last_name}',
+            'email': email,
+            'department': department,
+            'expected': len(expected),
+            'recorded': recorded,
+            'present': present,
+            'absent': absent,
+            'missing': missing,
+            'absence_rate': round(absent / recorded * 100, 1) if recorded else 0.0,
+            'missing_rate': round(missing / len(expected) * 100, 1) if expected else 0.0,
+            'gaps': [tuple(gap) for gap in gaps],
+        }
+
+    @staticmethod
+    def run(start_date: date, end_date: date, department_id: Optional[int] = None, only_missing: bool = False) -> Iterator[Dict[str, Any]]:
+        # One sorted pass over employees and their records; no per-day or per-employee queries
+        working_days = list(WorkingDayCalendar.iter_working_days(start_date, end_date))
+        records = AttendanceGapReportService.get_records(start_date, end_date, department_id)
+        record = next(records, None)
+        for employee in AttendanceGapReportService.get_employees(department_id).iterator(
+            chunk_size=AttendanceGapReportService.CHUNK_SIZE
+        ):
+            employee_id = employee[0]
+            statuses = {}
+            while record is not None and record[0] <= employee_id:
+                if record[0] == employee_id:
+                    statuses[record[1]] = record[2]
+                record = next(records, None)
+            row = AttendanceGapReportService.build_row(employee, working_days, statuses)
+            if row['missing'] or not only_missing:
+                yield row
+
+    @staticmethod
+    def format_gaps(gaps: Iterable[tuple]) -> str:
+        return ' '.join(
+            first.isoformat() if days == 1 else f'{first.isoformat()}..{last.isoformat()}'
+            for first, last, days in gaps
+        )
+
+    @staticmethod
+    def csv_row(row: Dict[str, Any]) -> list:
+        fields = AttendanceGapReportService.CSV_FIELDS[:-1]
+        return [row[field] for field in fields] + [AttendanceGapReportService.format_gaps(row['gaps'])]
+
+    @staticmethod
+    def summarize(rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        totals = {'employees': 0, 'expected': 0, 'recorded': 0, 'absent': 0, 'missing': 0}
+        for row in rows:
+            totals['employees'] += 1
+            for key in ('expected', 'recorded', 'absent', 'missing'):
+                totals[key] += row[key]
+        totals['absence_rate'] = round(totals['absent'] / totals['recorded'] * 100, 1) if totals['recorded'] else 0.0
+        totals['missing_rate'] = round(totals['missing'] / totals['expected'] * 100, 1) if totals['expected'] else 0.0
+        return totals
+
+
+class AttendanceImportService:
+    BATCH_SIZE = 5000
+    MAX_REPORTED_ERRORS = 1000
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        dry_run: bool = False,
+        today: Optional[date] = None,
+        update_existing: bool = False,
+    ):
+        self.batch_size = batch_size or AttendanceImportService.BATCH_SIZE
+        self.dry_run = dry_run
+        self.update_existing = update_existing
+        self.today = today or timezone.now().date()
+        self.valid_statuses = {value for value, _ in Attendance.STATUS_CHOICES}
+        self.employee_ids = set()
+        self.employee_ids_by_email = {}
+        for employee_id, email in Employee.objects.values_list('id', 'email').order_by():
+            self.employee_ids.add(employee_id)
+            self.employee_ids_by_email[email.lower()] = employee_id
+        self.seen = set()
+        self.pending: List[Tuple[int, Attendance]] = []
+        self.result = {
+            'processed': 0,
+            'created': 0,
+            'updated': 0,
+            'error_count': 0,
+            'errors': [],
+            'elapsed': 0.0,
+            'rows_per_second': 0.0,
+        }
+
+    @staticmethod
+    def has_required_columns(fieldnames: Optional[Iterable[str]]) -> bool:
+        columns = set(fieldnames or [])
+        return {'date', 'status'} <= columns and bool(columns & {'employee_id', 'email'})
+
+    def add_error(self, line: int, message: str) -> None:
+        self.result['error_count'] += 1
+        if len(self.result['errors']) < AttendanceImportService.MAX_REPORTED_ERRORS:
+            self.result['errors'].append((line, message))
+
+    def resolve_employee(self, row: Mapping[str, str]) -> Optional[int]:
+        employee_id = (row.get('employee_id') or '').strip()
+        if employee_id:
+            try:
+                employee_id = int(employee_id)
+            except ValueError:
+                return None
+            return employee_id if employee_id in self.employee_ids else None
+        email = (row.get('email') or '').strip().lower()
+        return self.employee_ids_by_email.get(email)
+
+    def parse_row(self, line: int, row: Mapping[str, str]) -> Optional[Attendance]:
+        employee_id = self.resolve_employee(row)
+        if employee_id is None:
+            self.add_error(line, 'Unknown employee.')
+            return None
+
+        try:
+            attendance_date = date.fromisoformat((row.get('date') or '').strip())
+        except ValueError:
+            self.add_error(line, f'Invalid date "{row.get("date")}", expected YYYY-MM-DD.')
+            return None
+
+        status = (row.get('status') or '').strip().lower()
+        if status not in self.valid_statuses:
+            self.add_error(line, f'Invalid status "{row.get("status")}".')
+            return None
+
+        if attendance_date > self.today:
+            self.add_error(line, 'Attendance date cannot be in the future.')
+            return None
+        if WorkingDayCalendar.is_weekend(attendance_date):
+            self.add_error(line, f'Attendance cannot be marked on {attendance_date:%A}s (weekends).')
+            return None
+        holiday_name = HolidayCalendar.get_holiday_name(attendance_date)
+        if holiday_name is not None:
+            self.add_error(line, f'Attendance cannot be marked on {holiday_name}.')
+            return None
+
+        key = (employee_id, attendance_date)
+        if key in self.seen:
+            self.add_error(line, f'Duplicate row for employee {employee_id} on {attendance_date}.')
+            return None
+        self.seen.add(key)
+        return Attendance(employee_id=employee_id, date=attendance_date, status=status)
+
+    def split_existing(self, pending: List[Tuple[int, Attendance]]) -> Tuple[List[Attendance], List[Attendance], List[Tuple[int, Attendance]]]:
+        existing = set(
+            Attendance.objects.filter(
+                date__in={attendance.date for _, attendance in pending},
+                employee_id__in={attendance.employee_id for _, attendance in pending},
+            ).values_list('employee_id', 'date').order_by()
+        )
+
+        new_attendances = []
+        updated_attendances = []
+        duplicates = []
+        for line, attendance in pending:
+            if (attendance.employee_id, attendance.date) not in existing:
+                new_attendances.append(attendance)
+            elif self.update_existing:
+                updated_attendances.append(attendance)
+            else:
+                duplicates.append((line, attendance))
+        return new_attendances, updated_attendances, duplicates
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        dates = {attendance.date for _, attendance in pending}
+
+        retried = False
+        while True:
+            new_attendances, updated_attendances, duplicates = self.split_existing(pending)
+            if self.dry_run or not (new_attendances or updated_attendances):
+                break
+            try:
+                with transaction.atomic():
+                    Attendance.objects.bulk_create(new_attendances, batch_size=AttendanceBulkWriter.BATCH_SIZE)
+                    Attendance.objects.bulk_create(
+                        updated_attendances,
+                        batch_size=AttendanceBulkWriter.BATCH_SIZE,
+                        update_conflicts=True,
+                        unique_fields=['employee', 'date'],
+                        update_fields=['status', 'updated_at'],
+                    )
+                    AttendanceSummaryService.refresh_dates(dates)
+                    FragmentCache.bump_on_commit(FragmentCache.attendance_scopes(dates))
+                break
+            except IntegrityError:
+                # Someone else inserted some of these rows after they were checked;
+                # check again so they are reported (or updated) instead of failing the batch
+                if retried:
+                    raise
+                retried = True
+                for attendance in new_attendances:
+                    attendance.pk = None
+
+        for line, attendance in duplicates:
+            self.add_error(line, f'Attendance for employee {attendance.employee_id} on {attendance.date} already exists.')
+        self.result['created'] += len(new_attendances)
+        self.result['updated'] += len(updated_attendances)
+
+    def run(self, rows: Iterable[Mapping[str, str]], first_line: int = 2) -> Dict[str, Any]:
+        started = time.perf_counter()
+        # Line 1 of a CSV file is the header
+        for line, row in enumerate(rows, start=first_line):
+            self.result['processed'] += 1
+            attendance = self.parse_row(line, row)
+            if attendance is not None:
+                self.pending.append((line, attendance))
+                if len(self.pending) >= self.batch_size:
+                    self.flush()
+        self.flush()
+
+        elapsed = time.perf_counter() - started
+        self.result['elapsed'] = elapsed
+        self.result['rows_per_second'] = self.result['processed'] / elapsed if elapsed > 0 else 0.0
+        return self.result
+
+
+class EmployeeSyncService:
+    BATCH_SIZE = 1000
+    FIELDS = ['first_name', 'last_name', 'phone_number', 'department', 'hire_date']
+
+    def __init__(self, dry_run: bool = False, today: Optional[date] = None):
+        self.dry_run = dry_run
+        self.today = today or timezone.now().date()
+        self.employees_by_email = {
+            employee.email.lower(): employee
+            for employee in Employee.objects.select_related('department')
+            .only('id', 'email', *self.FIELDS, 'department__name')
+            .order_by()
+        }
+        self.departments_by_name = {}
+        for department in Department.objects.order_by('-id'):
+            self.departments_by_name[department.name.strip().lower()] = department
+        self.seen_emails = set()
+        self.result = {'created': 0, 'updated': 0, 'unchanged': 0, 'errors': [], 'changes': []}
+
+    def clean_record(self, record: Mapping[str, Any]) -> Dict[str, Any]:
+        if not isinstance(record, Mapping):
+            raise ValidationError(f'Expected an object with employee fields, got {type(record).__name__}.')
+        cleaned = {}
+        email = str(record.get('email') or '').strip()
+        validate_email(email)
+        cleaned['email'] = email
+
+        for field in ('first_name', 'last_name', 'phone_number'):
+            value = str(record.get(field) or '').strip()
+            max_length = Employee._meta.get_field(field).max_length
+            if not value:
+                raise ValidationError(f'{field} is required.')
+            if len(value) > max_length:
+                raise ValidationError(f'{field} cannot be longer than {max_length} characters.')
+            cleaned[field] = value
+
+        hire_date = record.get('hire_date')
+        try:
+            hire_date = hire_date if isinstance(hire_date, date) else date.fromisoformat(str(hire_date or '').strip())
+        except ValueError:
+            raise ValidationError(f'Invalid hire_date "{record.get("hire_date")}", expected YYYY-MM-DD.')
+        if hire_date > self.today:
+            raise ValidationError('Hire date cannot be in the future.')
+        cleaned['hire_date'] = hire_date
+
+        cleaned['department'] = str(record.get('department') or '').strip() or None
+        return cleaned
+
+    def resolve_departments(self, names: Iterable[str]) -> None:
+        missing = {}
+        for name in names:
+            if name.lower() not in self.departments_by_name:
+                missing.setdefault(name.lower(), name)
+        if not missing:
+            return
+        if self.dry_run:
+            new_departments = [Department(name=name) for name in missing.values()]
+        else:
+            new_departments = Department.objects.bulk_create([Department(name=name) for name in missing.values()])
+        for department in new_departments:
+            self.departments_by_name[department.name.lower()] = department
+
+    def run(self, records: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+        cleaned_records = []
+        for number, record in enumerate(records, start=1):
+            try:
+                cleaned = self.clean_record(record)
+            except ValidationError as exc:
+                self.result['errors'].append((number, ' '.join(exc.messages)))
+                continue
+            email_key = cleaned['email'].lower()
+            if email_key in self.seen_emails:
+                self.result['errors'].append((number, f'Duplicate email {cleaned["email"]}.'))
+                continue
+            self.seen_emails.add(email_key)
+            cleaned_records.append(cleaned)
+
+        with transaction.atomic():
+            self.resolve_departments({r['department'] for r in cleaned_records if r['department']})
+
+            to_create, to_update, moved_employee_ids = [], [], []
+            now = timezone.now()
+            for cleaned in cleaned_records:
+                department = self.departments_by_name[cleaned['department'].lower()] if cleaned['department'] else None
+                employee = self.employees_by_email.get(cleaned['email'].lower())
+                if employee is None:
+                    to_create.append(Employee(
+                        email=cleaned['email'],
+                        first_name=cleaned['first_name'],
+                        last_name=cleaned['last_name'],
+                        phone_number=cleaned['phone_number'],
+                        department=department,
+                        hire_date=cleaned['hire_date'],
+                    ))
+                    self.result['changes'].append((cleaned['email'], 'create', {}))
+                    continue
+
+                diff = {}
+                for field in ('first_name', 'last_name', 'phone_number', 'hire_date'):
+                    if getattr(employee, field) != cleaned[field]:
+                        diff[field] = (getattr(employee, field), cleaned[field])
+                        setattr(employee, field, cleaned[field])
+                # A department created by a dry run has no id yet, so any employee put in it moves
+                if department is not None and department.pk is None:
+                    moved = True
+                else:
+                    moved = employee.department_id != (department.pk if department else None)
+                if moved:
+                    old_department = employee.department.name if employee.department_id else None
+                    diff['department'] = (old_department, department.name if department else None)
+                    employee.department = department
+                    moved_employee_ids.append(employee.id)
+
+                if diff:
+                    employee.updated_at = now
+                    to_update.append(employee)
+                    self.result['changes'].append((employee.email, 'update', diff))
+                else:
+                    self.result['unchanged'] += 1
+
+            if not self.dry_run:
+                Employee.objects.bulk_create(to_create, batch_size=self.BATCH_SIZE)
+                Employee.objects.bulk_update(to_update, [*self.FIELDS, 'updated_at'], batch_size=self.BATCH_SIZE)
+                if to_create or to_update:
+                    FragmentCache.bump_on_commit([FragmentCache.EMPLOYEES])
+                # bulk_update skips the signals that keep the daily summary in step
+                if moved_employee_ids:
+                    AttendanceSummaryService.refresh_dates(
+                        Attendance.objects.filter(employee_id__in=moved_employee_ids)
+                        .values_list('date', flat=True)
+                        .distinct()
+                        .order_by()
+                    )
+
+        self.result['created'] = len(to_create)
+        self.result['updated'] = len(to_update)
+        return self.result
+
+
+class PartitionedReportService:
+    """Attendance analytics for long ranges, computed one month per process and merged."""
+
+    @staticmethod
+    def get_partitions(start_date: date, end_date: date) -> List[Tuple[date, date]]:
+        partitions = []
+        current = start_date
+        while current <= end_date:
+            _, month_end = DateRangeService.get_month_range(current.month, current.year)
+            partitions.append((current, min(month_end, end_date)))
+            current = month_end + timedelta(days=1)
+        return partitions
+
+    @staticmethod
+    def compute_partition(start_date: date, end_date: date, using: Optional[str] = None) -> Dict[str, Any]:
+        # Plain tuples keep the result cheap to pickle back to the parent process
+        queryset = Attendance.objects.using(using).filter(date__gte=start_date, date__lte=end_date).order_by()
+        return {
+            'start_date': start_date,
+            'end_date': end_date,
+            'employees': list(
+                queryset.values_list('employee_id', 'employee__department_id', 'status').annotate(count=Count('id'))
+            ),
+            'days': list(queryset.values_list('date', 'status').annotate(count=Count('id'))),
+        }
+
+    @staticmethod
+    def build_counts(key_name: str, key: Any, counts: Dict[str, int], **extra) -> Dict[str, Any]:
+        present, absent = counts.get('present', 0), counts.get('absent', 0)
+        return {
+            key_name: key,
+            **extra,
+            'present': present,
+            'absent': absent,
+            'total': present + absent,
+            'presence_rate': EmployeeAttendanceHistoryService.presence_rate(present, present + absent),
+        }
+
+    @staticmethod
+    def merge(partials: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        # Everything is keyed and sorted, so the result is the same whatever order or
+        # number of processes the partitions were computed in
+        months, employees, departments, days, totals = [], {}, {}, {}, {}
+        employee_departments = {}
+        for partial in sorted(partials, key=lambda partial: partial['start_date']):
+            month = {}
+            for employee_id, department_id, status, count in partial['employees']:
+                employee_departments[employee_id] = department_id
+                for counts in (month, totals, employees.setdefault(employee_id, {}), departments.setdefault(department_id, {})):
+                    counts[status] = counts.get(status, 0) + count
+            months.append((partial['start_date'], partial['end_date'], month))
+            for day, status, count in partial['days']:
+                counts = days.setdefault(day, {})
+                counts[status] = counts.get(status, 0) + count
+
+        build_counts = PartitionedReportService.build_counts
+        return {
+            'totals': build_counts('partitions', len(months), totals),
+            'months': [build_counts('start_date', start, counts, end_date=end) for start, end, counts in months],
+            'departments': [
+                build_counts('department_id', department_id, departments[department_id])
+                for department_id in sorted(departments, key=lambda pk: (pk is not None, pk or 0))
+            ],
+            'employees': [
+                build_counts('employee_id', employee_id, employees[employee_id], department_id=employee_departments[employee_id])
+                for employee_id in sorted(employees)
+            ],
+            'days': [build_counts('date', day, days[day]) for day in sorted(days)],
+        }
+
+    @staticmethod
+    def can_use_processes(using: str) -> bool:
+        # Other processes can't see an in-memory SQLite database, e.g. the test database
+        database = connections[using]
+        return not (database.vendor == 'sqlite' and database.is_in_memory_db())
+
+    @staticmethod
+    def run(start_date: date, end_date: date, workers: Optional[int] = None) -> Dict[str, Any]:
+        partitions = PartitionedReportService.get_partitions(start_date, end_date)
+        using = Attendance.objects.db
+        workers = min(workers or os.cpu_count() or 1, len(partitions))
+        if workers <= 1 or not PartitionedReportService.can_use_processes(using):
+            partials = [PartitionedReportService.compute_partition(start, end, using) for start, end in partitions]
+        else:
+            # Each process opens its own connection, using the settings of the database
+            # this process reads from (which may be a replica or a test database)
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_worker,
+                initargs=({using: connections[using].settings_dict},),
+            ) as pool:
+                partials = list(pool.map(compute_partition, partitions, repeat(using)))
+        report = PartitionedReportService.merge(partials)
+        report.update({'start_date': start_date, 'end_date': end_date, 'workers': workers})
+        return report
+
+
+class AttendanceSnapshot:
+    """Attendance for a date range as compact columns and an employees x days status matrix."""
+    MISSING = 0
+    PRESENT = 1
+    ABSENT = 2
+    STATUS_CODES = {'present': PRESENT, 'absent': ABSENT}
+    CHUNK_SIZE = 10000
+
+    def __init__(self, start_date: date, end_date: date, employee_ids, employee_index, day_offset, status):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.days = (end_date - start_date).days + 1
+        # Sorted Employee ids; employee_index holds positions in it, one per record
+        self.employee_ids = employee_ids
+        self.employee_index = employee_index
+        self.day_offset = day_offset
+        self.status = status
+        self._matrix = None
+
+    @classmethod
+    def load(cls, start_date: date, end_date: date, department_id: Optional[int] = None) -> 'AttendanceSnapshot':
+        if np is None:
+            raise ImproperlyConfigured('AttendanceSnapshot requires NumPy (pip install numpy).')
+        employees = Employee.objects.all()
+        records = Attendance.objects.filter(date__gte=start_date, date__lte=end_date)
+        if department_id is not None:
+            employees = employees.filter(department_id=department_id)
+            records = records.filter(employee__department_id=department_id)
+        employee_ids = np.fromiter(employees.order_by('id').values_list('id', flat=True), dtype=np.int64)
+
+        # Rows go straight from the cursor into one packed array; no model instances
+        origin = start_date.toordinal()
+        codes = cls.STATUS_CODES
+        columns = np.fromiter(
+            (
+                (employee_id, day.toordinal() - origin, codes.get(status, cls.MISSING))
+                for employee_id, day, status in records.order_by().values_list('employee_id', 'date', 'status').iterator(chunk_size=cls.CHUNK_SIZE)
+            ),
+            dtype=[('employee_id', np.int64), ('day', np.int32), ('status', np.uint8)],
+        )
+        # Records of employees created (or moved into the department) after the employee
+        # query have no row in the matrix, so they are left out
+        columns = columns[np.isin(columns['employee_id'], employee_ids)]
+        employee_index = np.searchsorted(employee_ids, columns['employee_id']).astype(np.int32)
+        return cls(
+            start_date,
+            end_date,
+            employee_ids,
+            employee_index,
+            np.ascontiguousarray(columns['day']),
+            np.ascontiguousarray(columns['status']),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.employee_ids, self.employee_index, self.day_offset, self.status]
+        if self._matrix is not None:
+            arrays.append(self._matrix)
+        return sum(array.nbytes for array in arrays)
+
+    @property
+    def matrix(self):
+        if self._matrix is None:
+            self._matrix = np.zeros((len(self.employee_ids), self.days), dtype=np.uint8)
+            self._matrix[self.employee_index, self.day_offset] = self.status
+        return self._matrix
+
+    def get_date(self, offset: int) -> date:
+        return self.start_date + timedelta(days=int(offset))
+
+    def presence_rates(self) -> Dict[int, Dict[str, Any]]:
+        present = (self.matrix == self.PRESENT).sum(axis=1)
+        absent = (self.matrix == self.ABSENT).sum(axis=1)
+        total = present + absent
+        rates = np.round(np.divide(present * 100, total, out=np.zeros(len(total)), where=total > 0), 1)
+        return {
+            int(employee_id): {'present': int(p), 'absent': int(a), 'total': int(t), 'presence_rate': float(rate)}
+            for employee_id, p, a, t, rate in zip(self.employee_ids, present, absent, total, rates)
+        }
+
+    def daily_counts(self) -> Dict[date, Dict[str, int]]:
+        # Same shape as AttendanceSummaryService.get_daily_counts()
+        present = (self.matrix == self.PRESENT).sum(axis=0)
+        absent = (self.matrix == self.ABSENT).sum(axis=0)
+        return {
+            self.get_date(offset): {'total': int(present[offset] + absent[offset]), 'present': int(present[offset]), 'absent': int(absent[offset])}
+            for offset in np.flatnonzero(present + absent)
+        }
+
+    def absence_streaks(self) -> Dict[int, Dict[str, int]]:
+        # Runs of consecutive absent records per employee, like
+        # EmployeeAttendanceHistoryService.get_absence_streaks(); days without a record
+        # (weekends, holidays) neither extend nor break a run
+        employee_count = len(self.employee_ids)
+        order = np.lexsort((self.day_offset, self.employee_index))
+        employees = self.employee_index[order]
+        absent = self.status[order] == self.ABSENT
+        first_of_employee = np.ones(len(employees), dtype=bool)
+        first_of_employee[1:] = employees[1:] != employees[:-1]
+        last_of_employee = np.ones(len(employees), dtype=bool)
+        last_of_employee[:-1] = first_of_employee[1:]
+
+        previous_absent = np.zeros(len(absent), dtype=bool)
+        previous_absent[1:] = absent[:-1]
+        starts = absent & (first_of_employee | ~previous_absent)
+        run_ids = np.cumsum(starts) - 1
+        lengths = np.bincount(run_ids[absent], minlength=int(starts.sum()))
+        run_employees = employees[starts]
+
+        count = np.bincount(run_employees, minlength=employee_count)
+        longest = np.zeros(employee_count, dtype=np.int64)
+        np.maximum.at(longest, run_employees, lengths)
+        current = np.zeros(employee_count, dtype=np.int64)
+        ongoing = absent & last_of_employee
+        current[employees[ongoing]] = lengths[run_ids[ongoing]]
+        return {
+            int(employee_id): {'count': int(c), 'longest': int(l), 'current': int(cur)}
+            for employee_id, c, l, cur in zip(self.employee_ids, count, longest, current)
+        }
+
+
+class ReportJobService:
+    # Running jobs touch updated_at this often, so one whose heartbeat is older than
+    # STALE_AFTER belonged to a worker that died, however long the job itself takes
+    HEARTBEAT_INTERVAL = timedelta(minutes=1)
+    STALE_AFTER = timedelta(minutes=10)
+    CLAIM_BATCH = 10
+    HANDLERS = {
+        ReportJob.ATTENDANCE_EXPORT: 'run_attendance_export',
+        ReportJob.ATTENDANCE_GAPS: 'run_attendance_gaps',
+        ReportJob.REBUILD_SUMMARY: 'run_rebuild_summary',
+    }
+    EXPORT_FORMATS = {
+        'csv': AttendanceExportService.stream_csv,
+        'ndjson': AttendanceExportService.stream_ndjson,
+    }
+
+    @staticmethod
+    def submit(kind: str, params: Dict[str, Any], user=None) -> ReportJob:
+        if kind not in ReportJobService.HANDLERS:
+            raise ValueError(f'Unknown report type "{kind}".')
+        created_by = user if user is not None and user.is_authenticated else None
+        return ReportJob.objects.create(kind=kind, params=params, created_by=created_by)
+
+    @staticmethod
+    def claim(worker: str) -> Optional[Any]:
+        # The conditional UPDATE lets exactly one worker win a job, without row locks
+        now = timezone.now()
+        queued = ReportJob.objects.filter(status=ReportJob.QUEUED)
+        for job_id in queued.order_by('created_at').values_list('id', flat=True)[:ReportJobService.CLAIM_BATCH]:
+            claimed = queued.filter(pk=job_id).update(
+                status=ReportJob.RUNNING, worker=worker, started_at=now, updated_at=now,
+            )
+            if claimed:
+                return job_id
+        return None
+
+    @classmethod
+    def heartbeat(cls, job_id, stop: threading.Event) -> None:
+        # Runs in its own thread, and so on its own database connection
+        try:
+            while not stop.wait(cls.HEARTBEAT_INTERVAL.total_seconds()):
+                ReportJob.objects.filter(pk=job_id, status=ReportJob.RUNNING).update(updated_at=timezone.now())
+        finally:
+            connections.close_all()
+
+    @classmethod
+    def execute(cls, job_id) -> str:
+        job = ReportJob.objects.get(pk=job_id)
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=cls.heartbeat, args=(job_id, stop), daemon=True)
+        heartbeat.start()
+        try:
+            job.result = getattr(cls, cls.HANDLERS[job.kind])(job)
+            job.status = ReportJob.DONE
+        except Exception:
+            job.status = ReportJob.FAILED
+            job.error = traceback.format_exc()
+        finally:
+            stop.set()
+            heartbeat.join()
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'result', 'result_file', 'error', 'finished_at', 'updated_at'])
+        return job.status
+
+    @staticmethod
+    def fail(job_id, error: str) -> None:
+        now = timezone.now()
+        ReportJob.objects.filter(pk=job_id).update(status=ReportJob.FAILED, error=error, finished_at=now, updated_at=now)
+
+    @staticmethod
+    def requeue_stale(now: Optional[datetime] = None) -> int:
+        now = now or timezone.now()
+        return ReportJob.objects.filter(
+            status=ReportJob.RUNNING, updated_at__lt=now - ReportJobService.STALE_AFTER,
+        ).update(status=ReportJob.QUEUED, worker='', started_at=None, updated_at=now)
+
+    @staticmethod
+    def purge(older_than: datetime) -> int:
+        finished = ReportJob.objects.filter(
+            status__in=[ReportJob.DONE, ReportJob.FAILED], finished_at__lt=older_than,
+        )
+        purged = 0
+        for job in finished.iterator():
+            job.result_file.delete(save=False)
+            job.delete()
+            purged += 1
+        return purged
+
+    @staticmethod
+    def get_date(params: Mapping[str, Any], name: str) -> Optional[date]:
+        value = params.get(name)
+        return date.fromisoformat(value) if value else None
+
+    @staticmethod
+    def write_result(job: ReportJob, filename: str, lines: Iterable[str]) -> int:
+        # Spooled to a temporary file so a job that fails half way leaves no partial result
+        count = 0
+        with tempfile.TemporaryFile() as output:
+            for line in lines:
+                output.write(line.encode())
+                count += 1
+            job.result_file.save(filename, File(output, name=filename), save=False)
+        return count
+
+    @staticmethod
+    def run_attendance_export(job: ReportJob) -> Dict[str, Any]:
+        params = job.params
+        start_date = ReportJobService.get_date(params, 'start_date')
+        end_date = ReportJobService.get_date(params, 'end_date')
+        export_format = params.get('format', 'csv')
+        stream = ReportJobService.EXPORT_FORMATS[export_format]
+        rows = AttendanceExportService.get_rows(start_date, end_date, params.get('department_id'))
+        filename = f'attendance_{start_date:%Y%m%d}_{end_date:%Y%m%d}.{export_format}'
+        lines = ReportJobService.write_result(job, filename, stream(rows))
+        return {'rows': lines - 1 if export_format == 'csv' else lines}
+
+    @staticmethod
+    def run_attendance_gaps(job: ReportJob) -> Dict[str, Any]:
+        params = job.params
+        start_date = ReportJobService.get_date(params, 'start_date')
+        end_date = ReportJobService.get_date(params, 'end_date')
+        rows = list(AttendanceGapReportService.run(start_date, end_date, params.get('department_id')))
+        summary = AttendanceGapReportService.summarize(rows)
+        writer = csv.writer(Echo())
+
+        def lines():
+            yield writer.writerow(AttendanceGapReportService.CSV_FIELDS)
+            for row in rows:
+                if row['missing'] or params.get('include_all'):
+                    yield writer.writerow(AttendanceGapReportService.csv_row(row))
+
+        filename = f'attendance_gaps_{start_date:%Y%m%d}_{end_date:%Y%m%d}.csv'
+        summary['rows'] = ReportJobService.write_result(job, filename, lines()) - 1
+        return summary
+
+    @staticmethod
+    def run_rebuild_summary(job: ReportJob) -> Dict[str, Any]:
+        start_date = ReportJobService.get_date(job.params, 'start_date')
+        end_date = ReportJobService.get_date(job.params, 'end_date')
+        return {'rows': AttendanceSummaryService.rebuild(start_date, end_date)}
@@ -0,0 +1,68 @@
+from django.db import transaction
+
+from .models import Attendance, DailyAttendanceSummary
+from .services import AttendanceSummaryService, FragmentCache, HolidayCalendar
+
+
+def invalidate_holiday_calendar(sender, **kwargs):
+    HolidayCalendar.invalidate()
+    # Drop anything reloaded from uncommitted rows once the write is final
+    transaction.on_commit(HolidayCalendar.invalidate)
+
+
+def invalidate_holiday_fragments(sender, **kwargs):
+    FragmentCache.bump_on_commit([FragmentCache.HOLIDAYS])
+
+
+def invalidate_attendance_fragments(sender, instance, **kwargs):
+    FragmentCache.bump_on_commit(
+        FragmentCache.attendance_scopes([instance.date, getattr(instance, '_previous_date', None)])
+    )
+
+
+def invalidate_employee_fragments(sender, **kwargs):
+    # Matrix rows show names and department names, so department edits count too
+    FragmentCache.bump_on_commit([FragmentCache.EMPLOYEES])
+
+
+def _previous_value(sender, instance, field):
+    if instance._state.adding:
+        return None
+    loaded = getattr(instance, '_loaded_values', {})
+    if field in loaded:
+        return loaded[field]
+    # Deferred or never loaded through the ORM, so only the row itself knows
+    return sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+
+
+def _remember_saved_value(instance, field):
+    instance._loaded_values = {**getattr(instance, '_loaded_values', {}), field: getattr(instance, field)}
+
+
+def remember_previous_attendance_date(sender, instance, **kwargs):
+    instance._previous_date = _previous_value(sender, instance, 'date')
+
+
+def refresh_summary_for_attendance(sender, instance, **kwargs):
+    AttendanceSummaryService.schedule_refresh([instance.date, getattr(instance, '_previous_date', None)])
+    _remember_saved_value(instance, 'date')
+
+
+def remember_previous_department(sender, instance, **kwargs):
+    instance._previous_department_id = _previous_value(sender, instance, 'department_id')
+
+
+def refresh_summary_for_employee(sender, instance, created, **kwargs):
+    _remember_saved_value(instance, 'department_id')
+    if created or instance.department_id == getattr(instance, '_previous_department_id', None):
+        return
+    AttendanceSummaryService.schedule_refresh(
+        Attendance.objects.filter(employee=instance).values_list('date', flat=True).distinct()
+    )
+
+
+def refresh_summary_for_department(sender, instance, **kwargs):
+    # Its employees fall back to "no department", so those days need recounting
+    AttendanceSummaryService.schedule_refresh(
+        DailyAttendanceSummary.objects.filter(department=instance).values_list('date', flat=True)
+    )
@@ -0,0 +1,51 @@
+// Attendance Matrix Lazy Loading
+
+/**
+ * Fetches the next block of employee rows when the sentinel below the
+ * matrix scrolls into view, so large rosters are never rendered at once.
+ */
+function initAttendanceMatrixLoading() {
+    const sentinel = document.getElementById('attendance-matrix-sentinel');
+    const body = document.getElementById('attendance-matrix-body');
+    if (!sentinel || !body) return;
+
+    let loading = false;
+
+    async function loadNextPage(observer) {
+        const nextPage = sentinel.dataset.nextPage;
+        if (loading || !nextPage) return;
+        loading = true;
+
+        try {
+            const response = await fetch(`${sentinel.dataset.url}&page=${nextPage}`, {
+                headers: { 'Accept': 'application/json' },
+            });
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            const data = await response.json();
+
+            body.insertAdjacentHTML('beforeend', data.html);
+            if (data.next_page) {
+                sentinel.dataset.nextPage = data.next_page;
+            } else {
+                observer.disconnect();
+                sentinel.remove();
+            }
+        } catch (error) {
+            console.error('Failed to load attendance rows', error);
+            if (typeof showToast === 'function') {
+                showToast('Could not load more employees. Scroll to retry.', 'error');
+            }
+        } finally {
+            loading = false;
+        }
+    }
+
+    const observer = new IntersectionObserver((entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) {
+            loadNextPage(observer);
+        }
+    }, { rootMargin: '400px 0px' });
+    observer.observe(sentinel);
+}
+
+document.addEventListener('DOMContentLoaded', initAttendanceMatrixLoading);
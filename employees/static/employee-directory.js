@@ -0,0 +1,51 @@
+// Employee Directory Incremental Loading
+
+/**
+ * Appends the next keyset page of employee cards when the sentinel below the
+ * grid scrolls into view; the sentinel's link is the no-JavaScript fallback.
+ */
+function initEmployeeDirectoryLoading() {
+    const sentinel = document.getElementById('employee-directory-sentinel');
+    const grid = document.getElementById('employeeGrid');
+    if (!sentinel || !grid) return;
+
+    let loading = false;
+
+    async function loadNextPage(observer) {
+        const cursor = sentinel.dataset.nextCursor;
+        if (loading || !cursor) return;
+        loading = true;
+
+        try {
+            const response = await fetch(`${sentinel.dataset.url}&cursor=${encodeURIComponent(cursor)}`, {
+                headers: { 'Accept': 'application/json' },
+            });
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            const data = await response.json();
+
+            grid.insertAdjacentHTML('beforeend', data.html);
+            if (data.next_cursor) {
+                sentinel.dataset.nextCursor = data.next_cursor;
+            } else {
+                observer.disconnect();
+                sentinel.remove();
+            }
+        } catch (error) {
+            console.error('Failed to load employees', error);
+            if (typeof showToast === 'function') {
+                showToast('Could not load more employees. Scroll to retry.', 'error');
+            }
+        } finally {
+            loading = false;
+        }
+    }
+
+    const observer = new IntersectionObserver((entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) {
+            loadNextPage(observer);
+        }
+    }, { rootMargin: '400px 0px' });
+    observer.observe(sentinel);
+}
+
+document.addEventListener('DOMContentLoaded', initEmployeeDirectoryLoading);
@@ -0,0 +1,117 @@
+import random
+from datetime import date, timedelta
+from typing import Dict, Iterator, Optional
+
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import Attendance, DailyAttendanceSummary, Department, Employee, Holiday
+from .services import AttendanceSummaryService, FragmentCache, HolidayCalendar, WorkingDayCalendar
+
+FIRST_NAMES = ['Aarav', 'Priya', 'James', 'Maria', 'Chen', 'Fatima', 'Liam', 'Sofia', 'Noah', 'Aisha', 'Lucas', 'Mei']
+LAST_NAMES = ['Sharma', 'Smith', 'Garcia', 'Wang', 'Khan', 'Brown', 'Silva', 'Kim', 'Patel', 'Muller', 'Rossi', 'Sato']
+DEPARTMENT_NAMES = ['Engineering', 'Sales', 'Marketing', 'Finance', 'Operations', 'Support', 'Legal', 'HR']
+
+
+class SyntheticDataGenerator:
+
+    def __init__(self, seed: int = 42, end_date: Optional[date] = None, presence_rate: float = 0.9, batch_size: int = 5000):
+        self.random = random.Random(seed)
+        self.end_date = end_date or timezone.now().date()
+        self.presence_rate = presence_rate
+        self.batch_size = batch_size
+
+    @staticmethod
+    def clear() -> None:
+        bounds = Attendance.objects.aggregate(first=Min('date'), last=Max('date'))
+        with transaction.atomic(), connection.cursor() as cursor:
+            DailyAttendanceSummary.objects.all().delete()
+            # QuerySet.delete() would load every row to send the attendance signals
+            # and follow the employee cascade, so empty both tables with plain DELETEs
+            for model in (Attendance, Employee):
+                cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+            Department.objects.all().delete()
+            Holiday.objects.all().delete()
+        HolidayCalendar.invalidate()
+        scopes = [FragmentCache.EMPLOYEES, FragmentCache.HOLIDAYS]
+        if bounds['first'] is not None:
+            scopes += FragmentCache.attendance_range_scopes(bounds['first'], bounds['last'])
+        FragmentCache.bump(scopes)
+
+    def create_departments(self, count: int) -> list:
+        names = [
+            DEPARTMENT_NAMES[i % len(DEPARTMENT_NAMES)] + (f' {i // len(DEPARTMENT_NAMES) + 1}' if i >= len(DEPARTMENT_NAMES) else '')
+            for i in range(count)
+        ]
+        return Department.objects.bulk_create([Department(name=name) for name in names])
+
+    def create_employees(self, count: int, departments: list, start_date: date) -> None:
+        offset = (Employee.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+        employees = []
+        for i in range(offset, offset + count):
+            employees.append(Employee(
+                first_name=self.random.choice(FIRST_NAMES),
+                last_name=self.random.choice(LAST_NAMES),
+                email=f'synthetic{i}@example.com',
+                phone_number=f'555{i:07d}'[-15:],
+                department=self.random.choice(departments) if departments else None,
+                hire_date=start_date - timedelta(days=self.random.randint(1, 3650)),
+            ))
+        Employee.objects.bulk_create(employees, batch_size=self.batch_size)
+
+    def create_holidays(self, count: int, start_date: date) -> None:
+        taken = set(Holiday.objects.values_list('date', flat=True))
+        span = (self.end_date - start_date).days + 1
+        holidays = []
+        for i in range(min(count, span)):
+            holiday_date = start_date + timedelta(days=self.random.randrange(span))
+            if holiday_date in taken:
+                continue
+            taken.add(holiday_date)
+            holidays.append(Holiday(
+                name=f'Synthetic Holiday {i + 1}',
+                date=holiday_date,
+                is_recurring=self.random.random() < 0.3,
+            ))
+        Holiday.objects.bulk_create(holidays)
+        HolidayCalendar.invalidate()
+
+    def iter_attendance(self, start_date: date) -> Iterator[Attendance]:
+        employee_ids = list(Employee.objects.values_list('id', flat=True).order_by())
+        for current in WorkingDayCalendar.iter_working_days(start_date, self.end_date):
+            for employee_id in employee_ids:
+                status = 'present' if self.random.random() < self.presence_rate else 'absent'
+                yield Attendance(employee_id=employee_id, date=current, status=status)
+
+    def create_attendance(self, start_date: date) -> int:
+        created = 0
+        batch = []
+        for attendance in self.iter_attendance(start_date):
+            batch.append(attendance)
+            if len(batch) >= self.batch_size:
+                created += len(Attendance.objects.bulk_create(batch, ignore_conflicts=True))
+                batch = []
+        if batch:
+            created += len(Attendance.objects.bulk_create(batch, ignore_conflicts=True))
+        return created
+
+    def generate(self, departments: int, employees: int, days: int, holidays: int) -> Dict[str, int]:
+        start_date = self.end_date - timedelta(days=days - 1)
+        with transaction.atomic():
+            department_objs = self.create_departments(departments)
+            self.create_employees(employees, department_objs, start_date)
+            self.create_holidays(holidays, start_date)
+            attendance_count = self.create_attendance(start_date)
+            AttendanceSummaryService.rebuild(start_date, self.end_date)
+            FragmentCache.bump_on_commit([
+                FragmentCache.EMPLOYEES,
+                FragmentCache.HOLIDAYS,
+                *FragmentCache.attendance_range_scopes(start_date, self.end_date),
+            ])
+        return {
+            'departments': len(department_objs),
+            'employees': employees,
+            'holidays': Holiday.objects.count(),
+            'attendance': attendance_count,
+        }
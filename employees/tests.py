@@ -1,2 +1,1542 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import json
+import os
+import re
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+from datetime import date, timedelta
 
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.conf import settings
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from employee_management.instrumentation import histogram
+
+from .benchmarks import compare_results, run_benchmarks
+from .forms import AttendanceForm
+from .models import Attendance, DailyAttendanceSummary, Department, Employee, Holiday, ReportJob
+from .services import (
+    AttendanceBulkWriter,
+    AttendanceGapReportService,
+    AttendanceImportService,
+    AttendanceMatrixBuilder,
+    AttendanceMatrixPaginator,
+    AttendanceSnapshot,
+    AttendanceSummaryService,
+    DashboardStatsService,
+    DepartmentAnalyticsService,
+    EmployeeAttendanceHistoryService,
+    EmployeeDirectoryService,
+    EmployeeSyncService,
+    FragmentCache,
+    HolidayCalendar,
+    PartitionedReportService,
+    ReportJobService,
+    WorkingDayCalendar,
+)
+
+
+def make_dates(start_date, days):
+    return [
+        {
+            'date': start_date + timedelta(days=i),
+            'weekday': (start_date + timedelta(days=i)).strftime('%A'),
+            'is_non_working': False,
+        }
+        for i in range(days)
+    ]
+
+
+class AttendanceMatrixBuilderTests(TestCase):
+
+    def setUp(self):
+        self.department = Department.objects.create(name='Engineering')
+        self.alice = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', department=self.department, hire_date=date(2024, 1, 1),
+        )
+        self.bob = Employee.objects.create(
+            first_name='Bob', last_name='Jones', email='bob@example.com',
+            phone_number='456', department=self.department, hire_date=date(2024, 1, 1),
+        )
+        self.start_date = date(2024, 3, 4)
+        Attendance.objects.create(employee=self.alice, date=self.start_date, status='present')
+        Attendance.objects.create(employee=self.bob, date=self.start_date, status='absent')
+        Attendance.objects.create(employee=self.alice, date=self.start_date + timedelta(days=1), status='absent')
+
+    def test_rows_match_attendance_by_employee_and_date(self):
+        dates = make_dates(self.start_date, 3)
+        builder = AttendanceMatrixBuilder(self.start_date, self.start_date + timedelta(days=2))
+        with self.assertNumQueries(1):
+            builder.load()
+        rows = builder.build_rows([self.alice, self.bob], dates)
+
+        alice_statuses = [cell['attendance'].status if cell['attendance'] else None for cell in rows[0]['daily_attendance']]
+        bob_statuses = [cell['attendance'].status if cell['attendance'] else None for cell in rows[1]['daily_attendance']]
+        self.assertEqual(alice_statuses, ['present', 'absent', None])
+        self.assertEqual(bob_statuses, ['absent', None, None])
+
+    def test_daily_stats(self):
+        dates = make_dates(self.start_date, 3)
+        builder = AttendanceMatrixBuilder(self.start_date, self.start_date + timedelta(days=2))
+        builder.load()
+        stats = builder.build_daily_stats(dates)
+
+        self.assertEqual([(s['total'], s['present'], s['absent']) for s in stats], [(2, 1, 1), (1, 0, 1), (0, 0, 0)])
+
+    def test_attendance_list_view(self):
+        response = self.client.get(reverse('attendance_list'), {
+            'start_date': self.start_date.isoformat(),
+            'end_date': (self.start_date + timedelta(days=2)).isoformat(),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['matrix']['rows']), 2)
+
+    def test_build_scales_linearly(self):
+        def run(employee_count, days=30):
+            employees = [Employee(id=i, first_name='E', last_name=str(i)) for i in range(employee_count)]
+            dates = make_dates(self.start_date, days)
+            attendances = [
+                Attendance(employee_id=employee.id, date=d_info['date'], status='present')
+                for employee in employees for d_info in dates
+            ]
+            builder = AttendanceMatrixBuilder(dates[0]['date'], dates[-1]['date'])
+            started = time.perf_counter()
+            builder.load(attendances)
+            builder.build_rows(employees, dates)
+            builder.build_daily_stats(dates)
+            return time.perf_counter() - started
+
+        small = min(run(100) for _ in range(3))
+        large = min(run(400) for _ in range(3))
+        # 4x the cells should cost roughly 4x the time; quadratic lookups would be ~16x.
+        self.assertLess(large, small * 10)
+
+
+class HolidayCalendarTests(TestCase):
+
+    def setUp(self):
+        HolidayCalendar.invalidate()
+        Holiday.objects.create(name='New Year', date=date(2020, 1, 1), is_recurring=True)
+        Holiday.objects.create(name='Founders Day', date=date(2024, 3, 5))
+
+    def tearDown(self):
+        HolidayCalendar.invalidate()
+
+    def test_fixed_and_recurring_holidays(self):
+        self.assertEqual(HolidayCalendar.get_holiday_name(date(2024, 1, 1)), 'New Year')
+        self.assertEqual(HolidayCalendar.get_holiday_name(date(2024, 3, 5)), 'Founders Day')
+        self.assertIsNone(HolidayCalendar.get_holiday_name(date(2025, 3, 5)))
+        self.assertFalse(HolidayCalendar.is_holiday(date(2024, 3, 6)))
+
+    def test_lookups_are_query_free_after_load(self):
+        HolidayCalendar.load()
+        with self.assertNumQueries(0):
+            for i in range(730):
+                HolidayCalendar.is_holiday(date(2023, 1, 1) + timedelta(days=i))
+
+    def test_invalidated_on_save_and_delete(self):
+        self.assertFalse(HolidayCalendar.is_holiday(date(2024, 7, 4)))
+        holiday = Holiday.objects.create(name='Picnic', date=date(2024, 7, 4))
+        self.assertTrue(HolidayCalendar.is_holiday(date(2024, 7, 4)))
+        holiday.delete()
+        self.assertFalse(HolidayCalendar.is_holiday(date(2024, 7, 4)))
+
+    def test_working_day_calendar_matches_day_by_day_checks(self):
+        start_date, end_date = date(2023, 12, 1), date(2025, 1, 31)
+        expected = [
+            start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)
+            if (start_date + timedelta(days=i)).weekday() < 5 and not HolidayCalendar.is_holiday(start_date + timedelta(days=i))
+        ]
+        self.assertEqual(list(WorkingDayCalendar.iter_working_days(start_date, end_date)), expected)
+        self.assertEqual(WorkingDayCalendar.count_working_days(start_date, end_date), len(expected))
+        # Mar 4-8 2024 minus Founders Day; New Year 2025 recurs from its 2020 entry
+        self.assertEqual(WorkingDayCalendar.count_working_days(date(2024, 3, 4), date(2024, 3, 10)), 4)
+        self.assertFalse(WorkingDayCalendar.is_working_day(date(2025, 1, 1)))
+        self.assertTrue(WorkingDayCalendar.is_weekend(date(2024, 3, 9)))
+        self.assertEqual(WorkingDayCalendar.count_working_days(end_date, start_date), 0)
+
+        with self.assertNumQueries(0):
+            WorkingDayCalendar.count_working_days(start_date, end_date)
+        Holiday.objects.create(name='Picnic', date=date(2024, 3, 6))
+        self.assertEqual(WorkingDayCalendar.count_working_days(date(2024, 3, 4), date(2024, 3, 10)), 3)
+
+    def test_years_built_from_a_replaced_lookup_are_not_memoized(self):
+        HolidayCalendar.load()
+        build_year = WorkingDayCalendar.build_year
+        reloaded = []
+
+        def build_then_reload(year, lookup):
+            built = build_year(year, lookup)
+            if not reloaded:
+                # Meanwhile another thread saves a holiday and memoizes the new lookup
+                reloaded.append(Holiday.objects.create(name='Picnic', date=date(2024, 3, 6)))
+                WorkingDayCalendar.get_year(year)
+            return built
+
+        with mock.patch.object(WorkingDayCalendar, 'build_year', build_then_reload):
+            WorkingDayCalendar.get_year(2024)
+        self.assertEqual(WorkingDayCalendar.count_working_days(date(2024, 3, 4), date(2024, 3, 10)), 3)
+
+    def test_async_callers_use_the_loaded_snapshot(self):
+        async def load_then_invalidate():
+            holidays = await HolidayCalendar.aensure_loaded()
+            # Another thread saving a holiday must not make the next lookup query from the event loop
+            HolidayCalendar.invalidate()
+            return WorkingDayCalendar.count_working_days(date(2024, 3, 4), date(2024, 3, 10), holidays)
+
+        self.assertEqual(async_to_sync(load_then_invalidate)(), 4)
+
+    def test_attendance_form_rejects_holiday(self):
+        employee = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', hire_date=date(2024, 1, 1),
+        )
+        form = AttendanceForm(data={'employee': employee.pk, 'date': '2024-03-05', 'status': 'present'})
+        self.assertFalse(form.is_valid())
+        self.assertIn('Founders Day', form.errors['date'][0])
+
+
+class DashboardStatsServiceTests(TestCase):
+
+    def setUp(self):
+        self.today = date(2024, 3, 6)
+        self.engineering = Department.objects.create(name='Engineering')
+        self.sales = Department.objects.create(name='Sales')
+        self.alice = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', department=self.engineering, hire_date=date(2024, 1, 1),
+        )
+        self.bob = Employee.objects.create(
+            first_name='Bob', last_name='Jones', email='bob@example.com',
+            phone_number='456', department=self.sales, hire_date=date(2024, 1, 1),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Attendance.objects.create(employee=self.alice, date=self.today, status='present')
+            Attendance.objects.create(employee=self.bob, date=self.today, status='absent')
+            Attendance.objects.create(employee=self.alice, date=self.today - timedelta(days=3), status='present')
+
+    def test_stats(self):
+        stats = DashboardStatsService.get_stats(self.today)
+
+        self.assertEqual(stats['total_employees'], 2)
+        self.assertEqual((stats['today_total'], stats['today_present'], stats['today_absent']), (2, 1, 1))
+        self.assertEqual(stats['today_percentage'], 50.0)
+        self.assertEqual(stats['recent_attendance_count'], 2)
+        self.assertEqual(stats['department_stats'], [
+            {'name': 'Engineering', 'employee_count': 1, 'today_present': 1},
+            {'name': 'Sales', 'employee_count': 1, 'today_present': 0},
+        ])
+        self.assertEqual([day['total'] for day in stats['week_attendance']], [0, 0, 0, 1, 0, 0, 2])
+
+    def test_query_count_independent_of_department_count(self):
+        with CaptureQueriesContext(connection) as baseline:
+            DashboardStatsService.get_stats(self.today)
+
+        for i in range(10):
+            department = Department.objects.create(name=f'Department {i}')
+            employee = Employee.objects.create(
+                first_name='Extra', last_name=str(i), email=f'extra{i}@example.com',
+                phone_number='789', department=department, hire_date=date(2024, 1, 1),
+            )
+            Attendance.objects.create(employee=employee, date=self.today, status='present')
+
+        with CaptureQueriesContext(connection) as grown:
+            DashboardStatsService.get_stats(self.today)
+        self.assertEqual(len(grown), len(baseline))
+
+    def test_dashboard_view(self):
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('department_stats', response.context)
+
+    async def test_async_stats_match_sync(self):
+        stats = await DashboardStatsService.aget_stats(self.today)
+        self.assertEqual(stats, await sync_to_async(DashboardStatsService.get_stats)(self.today))
+
+    async def test_async_views(self):
+        for name in ('dashboard', 'attendance_list', 'attendance_matrix_data'):
+            self.assertTrue(asyncio.iscoroutinefunction(resolve(reverse(name)).func), name)
+
+        response = await self.async_client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        response = await self.async_client.get(reverse('dashboard'), headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+        response = await self.async_client.get(reverse('api_collection', args=['departments']), {'fields': 'name'})
+        self.assertEqual(response.json()['results'], [{'name': 'Engineering'}, {'name': 'Sales'}])
+
+
+class AttendanceBulkWriterTests(TestCase):
+
+    def setUp(self):
+        HolidayCalendar.invalidate()
+        self.alice = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', hire_date=date(2024, 1, 1),
+        )
+        self.bob = Employee.objects.create(
+            first_name='Bob', last_name='Jones', email='bob@example.com',
+            phone_number='456', hire_date=date(2024, 1, 1),
+        )
+        self.day = date(2024, 3, 6)
+
+    def test_parse_statuses_ignores_unknown_keys_and_values(self):
+        statuses = AttendanceBulkWriter.parse_statuses({
+            f'status_{self.alice.id}': 'present',
+            f'status_{self.bob.id}': 'late',
+            'status_abc': 'present',
+            'selected_date': '2024-03-06',
+        })
+        self.assertEqual(statuses, {self.alice.id: 'present'})
+
+    def test_write_creates_then_updates(self):
+        Attendance.objects.create(employee=self.alice, date=self.day, status='absent')
+
+        with self.assertNumQueries(10):
+            created, updated = AttendanceBulkWriter.write(self.day, {
+                self.alice.id: 'present',
+                self.bob.id: 'absent',
+                999999: 'present',
+            })
+
+        self.assertEqual((created, updated), (1, 1))
+        self.assertEqual(
+            dict(Attendance.objects.filter(date=self.day).values_list('employee_id', 'status')),
+            {self.alice.id: 'present', self.bob.id: 'absent'},
+        )
+
+    def test_mark_attendance_post(self):
+        response = self.client.post(reverse('mark_attendance'), {
+            'selected_date': self.day.isoformat(),
+            f'status_{self.alice.id}': 'present',
+            f'status_{self.bob.id}': 'absent',
+        })
+        self.assertRedirects(response, reverse('attendance_list'), fetch_redirect_response=False)
+        self.assertEqual(Attendance.objects.filter(date=self.day).count(), 2)
+
+
+class DepartmentAnalyticsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.today = date(2024, 3, 13)
+        self.engineering = Department.objects.create(name='Engineering')
+        self.alice = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', department=self.engineering, hire_date=date(2024, 1, 1),
+        )
+        self.bob = Employee.objects.create(
+            first_name='Bob', last_name='Jones', email='bob@example.com',
+            phone_number='456', hire_date=date(2024, 1, 1),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            for day, status in ((4, 'present'), (5, 'absent'), (11, 'present'), (12, 'present')):
+                Attendance.objects.create(employee=self.alice, date=date(2024, 3, day), status=status)
+            Attendance.objects.create(employee=self.bob, date=date(2024, 3, 12), status='absent')
+
+    async def test_weekly_trend_per_department(self):
+        analytics = await DepartmentAnalyticsService.aget_analytics('thismonth', 'week', self.today)
+        self.assertEqual((analytics['start_date'], analytics['end_date']), (date(2024, 3, 1), self.today))
+        self.assertEqual(analytics['periods'], [date(2024, 3, 4), date(2024, 3, 11)])
+        engineering, unassigned = analytics['departments']
+        self.assertEqual((engineering['name'], engineering['total'], engineering['presence_rate']), ('Engineering', 4, 75.0))
+        self.assertEqual(engineering['trend'], [50.0, 100.0])
+        self.assertEqual((unassigned['name'], unassigned['trend']), ('No Department', [None, 0.0]))
+
+        monthly = await DepartmentAnalyticsService.aget_analytics('thismonth', 'month', self.today)
+        self.assertEqual(monthly['periods'], [date(2024, 3, 1)])
+
+    def test_cached_until_attendance_changes(self):
+        get_analytics = async_to_sync(DepartmentAnalyticsService.aget_analytics)
+        with CaptureQueriesContext(connection) as first:
+            get_analytics('thismonth', 'week', self.today)
+        self.assertEqual(len(first), 1)
+        with self.assertNumQueries(0):
+            get_analytics('thismonth', 'week', self.today)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            attendance = Attendance.objects.get(employee=self.bob)
+            attendance.status = 'present'
+            attendance.save()
+        analytics = get_analytics('thismonth', 'week', self.today)
+        self.assertEqual(analytics['departments'][1]['presence_rate'], 100.0)
+
+    def test_rebuild_invalidates_cached_analytics(self):
+        get_analytics = async_to_sync(DepartmentAnalyticsService.aget_analytics)
+        self.assertEqual(get_analytics('thismonth', 'week', self.today)['departments'][1]['presence_rate'], 0.0)
+
+        # A queryset update skips the signals, so only the rebuild brings the summary up to date
+        Attendance.objects.filter(employee=self.bob).update(status='present')
+        with self.captureOnCommitCallbacks(execute=True):
+            AttendanceSummaryService.rebuild(date(2024, 3, 1), date(2024, 3, 31))
+        self.assertEqual(get_analytics('thismonth', 'week', self.today)['departments'][1]['presence_rate'], 100.0)
+
+    def test_view(self):
+        response = self.client.get(reverse('department_analytics'), {'range': 'lastyear', 'period': 'month'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.context['preset'], response.context['granularity']), ('lastyear', 'month'))
+
+        response = self.client.get(reverse('department_analytics'), {'range': 'bogus', 'format': 'json'})
+        self.assertEqual(response.json()['preset'], DepartmentAnalyticsService.DEFAULT_PRESET)
+
+
+class EmployeeDirectoryTests(TestCase):
+
+    def setUp(self):
+        self.engineering = Department.objects.create(name='Engineering')
+        people = [('Alice', 'Smith', 2019), ('Alan', 'Turing', 2021), ('Bob', 'Jones', 2018), ('Carol', 'Alvarez', 2022), ('Dave', 'Brown', 2020)]
+        for first_name, last_name, year in people:
+            Employee.objects.create(
+                first_name=first_name, last_name=last_name, email=f'{first_name.lower()}@example.com',
+                phone_number='123', department=self.engineering if first_name == 'Dave' else None, hire_date=date(year, 1, 1),
+            )
+
+    def collect(self, query='', sort='name'):
+        names, cursor = [], None
+        while True:
+            employees, cursor = EmployeeDirectoryService.get_page(query, sort, cursor, limit=2)
+            names += [employee.first_name for employee in employees]
+            if cursor is None:
+                return names
+
+    def test_keyset_pages_cover_every_sort(self):
+        self.assertEqual(self.collect(), ['Alan', 'Alice', 'Bob', 'Carol', 'Dave'])
+        self.assertEqual(self.collect(sort='-name'), ['Dave', 'Carol', 'Bob', 'Alice', 'Alan'])
+        self.assertEqual(self.collect(sort='-hire_date'), ['Carol', 'Alan', 'Dave', 'Alice', 'Bob'])
+        with self.assertRaises(ValueError):
+            EmployeeDirectoryService.get_page(cursor='not-a-cursor')
+
+    def test_search_by_name_email_and_department(self):
+        # "Al" is a first-name prefix for Alan and Alice and a last-name prefix for Carol Alvarez
+        self.assertEqual(self.collect('al'), ['Alan', 'Alice', 'Carol'])
+        self.assertEqual(self.collect('engin'), ['Dave'])
+        self.assertEqual(self.collect('bob@'), ['Bob'])
+        self.assertEqual(self.collect('al smi'), ['Alice'])
+        self.assertEqual(self.collect('100%'), [])
+
+    def test_fragments(self):
+        response = self.client.get(reverse('employee_list'), {'q': 'a'})
+        self.assertEqual([employee.first_name for employee in response.context['employees']], ['Alan', 'Alice', 'Carol'])
+
+        _, cursor = EmployeeDirectoryService.get_page(limit=2)
+        data = self.client.get(reverse('employee_list'), {'format': 'json', 'cursor': cursor}).json()
+        self.assertIn('Bob Jones', data['html'])
+        self.assertNotIn('Alice Smith', data['html'])
+        self.assertIsNone(data['next_cursor'])
+        self.assertEqual(self.client.get(reverse('employee_list'), {'format': 'json', 'cursor': 'x'}).status_code, 400)
+
+
+class EmployeeAttendanceHistoryTests(TestCase):
+
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', hire_date=date(2024, 1, 1),
+        )
+        statuses = 'PAAPPAAAPPPA' + 'P' * 20 + 'AA'
+        start_date = date(2024, 1, 1)
+        Attendance.objects.bulk_create([
+            Attendance(employee=self.employee, date=start_date + timedelta(days=i), status='present' if status == 'P' else 'absent')
+            for i, status in enumerate(statuses)
+        ])
+        self.start_date = start_date
+        self.end_date = start_date + timedelta(days=len(statuses) - 1)
+
+    def test_history(self):
+        history = EmployeeAttendanceHistoryService.get_history(self.employee.pk, self.start_date, self.end_date)
+        self.assertEqual(history['totals']['total'], 34)
+        self.assertEqual(history['totals']['absent'], 8)
+        self.assertEqual(history['totals']['presence_rate'], 76.5)
+        self.assertEqual(
+            [(row['month'], row['present'], row['absent']) for row in history['monthly']],
+            [(date(2024, 2, 1), 1, 2), (date(2024, 1, 1), 25, 6)],
+        )
+        streaks = history['absence_streaks']
+        self.assertEqual([(streak['start_date'].day, streak['length']) for streak in streaks['streaks']], [(2, 2), (6, 3), (12, 1), (2, 2)])
+        self.assertEqual((streaks['count'], streaks['longest'], streaks['current']), (4, 3, 2))
+        self.assertEqual(len(history['page']), EmployeeAttendanceHistoryService.PAGE_SIZE)
+        self.assertEqual(history['page'][0].date, self.end_date)
+
+    def test_range_filter(self):
+        streaks = EmployeeAttendanceHistoryService.get_absence_streaks(
+            EmployeeAttendanceHistoryService.get_queryset(self.employee.pk, date(2024, 1, 7), date(2024, 1, 31))
+        )
+        self.assertEqual((streaks['count'], streaks['longest'], streaks['current']), (2, 2, 0))
+
+    def test_employee_detail_view(self):
+        url = reverse('employee_detail', args=[self.employee.pk])
+        response = self.client.get(url, {'start_date': '2024-01-01', 'end_date': '2024-02-29', 'page': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['page'].number, 2)
+        self.assertEqual(len(response.context['page']), 9)
+        self.assertContains(response, 'page=1')
+
+        response = self.client.get(url)
+        self.assertEqual(response.context['totals']['total'], 0)
+        self.assertContains(response, 'No attendance recorded in this range.')
+
+
+class QueryPlanTests(TestCase):
+
+    def assertUsesIndex(self, queryset, *index_names):
+        if connection.vendor == 'postgresql':
+            # Tiny test tables always favour a sequential scan, so rule it out to see the usable index
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                plan = queryset.explain()
+        elif connection.vendor == 'sqlite':
+            plan = queryset.explain()
+        else:
+            self.skipTest(f'No plan assertions for {connection.vendor}')
+        self.assertTrue(any(name in plan for name in index_names), plan)
+
+    def test_dashboard_queries_use_date_status_index(self):
+        today = date(2024, 3, 6)
+        week_start = today - timedelta(days=today.weekday())
+        self.assertUsesIndex(
+            Attendance.objects.filter(date__gte=week_start).values('date').annotate(**DashboardStatsService.status_counts()).order_by(),
+            'attendance_date_status_idx',
+        )
+        self.assertUsesIndex(
+            Attendance.objects.filter(date=today, status='present').values_list('employee__department').annotate(count=Count('id')).order_by(),
+            'attendance_date_status_idx',
+        )
+
+    def test_attendance_list_range_query_uses_date_index(self):
+        builder = AttendanceMatrixBuilder(date(2024, 1, 1), date(2024, 3, 31))
+        self.assertUsesIndex(
+            builder.get_queryset(),
+            'attendance_date_status_idx', 'attendance_date_employee_idx', 'attendance_date_id_idx', 'attendance_date_updated_idx',
+        )
+
+    def test_freshness_checks_use_updated_at_indexes(self):
+        self.assertUsesIndex(
+            Attendance.objects.filter(date__gte=date(2024, 1, 1), date__lte=date(2024, 3, 31)).values_list('updated_at').order_by(),
+            'attendance_date_updated_idx',
+        )
+        self.assertUsesIndex(Employee.objects.order_by('-updated_at')[:1], 'employee_updated_at_idx')
+
+    def test_employee_history_uses_unique_employee_date_index(self):
+        self.assertUsesIndex(
+            EmployeeAttendanceHistoryService.get_queryset(1, date(2020, 1, 1), date(2024, 12, 31)),
+            'unique_employee_date', 'sqlite_autoindex_employees_attendance',
+        )
+
+    def test_employee_search_uses_search_indexes(self):
+        queryset = EmployeeDirectoryService.search(Employee.objects.all(), 'ali')
+        if connection.vendor == 'sqlite':
+            self.assertUsesIndex(queryset, 'employee_first_name_nocase_idx')
+            self.assertUsesIndex(queryset, 'employee_email_nocase_idx')
+        else:
+            self.assertUsesIndex(queryset, 'employee_first_name_trgm_idx')
+
+    def test_api_keyset_pages_use_ordering_index(self):
+        self.assertUsesIndex(
+            Attendance.objects.filter(Q(date__gt=date(2024, 3, 1)) | Q(date=date(2024, 3, 1), id__gt=10)).order_by('date', 'id'),
+            'attendance_date_id_idx',
+        )
+
+
+class AttendanceSummaryTests(TestCase):
+
+    def setUp(self):
+        self.day = date(2024, 3, 6)
+        self.engineering = Department.objects.create(name='Engineering')
+        self.sales = Department.objects.create(name='Sales')
+        self.alice = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', department=self.engineering, hire_date=date(2024, 1, 1),
+        )
+        self.bob = Employee.objects.create(
+            first_name='Bob', last_name='Jones', email='bob@example.com',
+            phone_number='456', department=self.sales, hire_date=date(2024, 1, 1),
+        )
+
+    def summary(self):
+        return {
+            (row.date, row.department_id): (row.present, row.absent, row.total)
+            for row in DailyAttendanceSummary.objects.all()
+        }
+
+    def test_maintained_on_save_and_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            attendance = Attendance.objects.create(employee=self.alice, date=self.day, status='present')
+            Attendance.objects.create(employee=self.bob, date=self.day, status='absent')
+        self.assertEqual(self.summary(), {
+            (self.day, self.engineering.id): (1, 0, 1),
+            (self.day, self.sales.id): (0, 1, 1),
+        })
+
+        with self.captureOnCommitCallbacks(execute=True):
+            attendance.status = 'absent'
+            attendance.save()
+        self.assertEqual(self.summary()[(self.day, self.engineering.id)], (0, 1, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            attendance.delete()
+        self.assertNotIn((self.day, self.engineering.id), self.summary())
+
+    def test_maintained_on_department_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Attendance.objects.create(employee=self.alice, date=self.day, status='present')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.alice.department = self.sales
+            self.alice.save()
+        self.assertEqual(self.summary(), {(self.day, self.sales.id): (1, 0, 1)})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sales.delete()
+        self.assertEqual(self.summary(), {(self.day, None): (1, 0, 1)})
+
+    def test_bulk_writer_refreshes_summary(self):
+        AttendanceBulkWriter.write(self.day, {self.alice.id: 'present', self.bob.id: 'present'})
+        self.assertEqual(AttendanceSummaryService.get_daily_counts(self.day, self.day), {
+            self.day: {'total': 2, 'present': 2, 'absent': 0},
+        })
+
+    def test_refresh_upserts_and_drops_emptied_departments(self):
+        Attendance.objects.create(employee=self.alice, date=self.day, status='present')
+        Attendance.objects.create(employee=self.bob, date=self.day, status='absent')
+        AttendanceSummaryService.refresh_dates([self.day])
+        engineering_row = DailyAttendanceSummary.objects.get(department=self.engineering)
+
+        Employee.objects.filter(pk=self.bob.pk).update(department=None)
+        Attendance.objects.filter(employee=self.alice).update(status='absent')
+        AttendanceSummaryService.refresh_dates([self.day])
+        AttendanceSummaryService.refresh_dates([self.day])
+        self.assertEqual(self.summary(), {
+            (self.day, self.engineering.id): (0, 1, 1),
+            (self.day, None): (0, 1, 1),
+        })
+        # Updated in place rather than deleted and inserted again
+        self.assertTrue(DailyAttendanceSummary.objects.filter(pk=engineering_row.pk).exists())
+
+    def test_rolled_back_dates_are_not_refreshed_later(self):
+        try:
+            with transaction.atomic():
+                AttendanceSummaryService.schedule_refresh([date(2024, 1, 2)])
+                raise ValueError
+        except ValueError:
+            pass
+        with self.captureOnCommitCallbacks() as callbacks:
+            AttendanceSummaryService.schedule_refresh([self.day])
+        self.assertEqual(AttendanceSummaryService._pending.dates, {self.day})
+        callbacks[0]()
+
+    def test_one_flush_is_queued_per_transaction(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            AttendanceSummaryService.schedule_refresh([self.day])
+            AttendanceSummaryService.schedule_refresh([self.day, date(2024, 3, 7)])
+            AttendanceSummaryService.schedule_refresh([None])
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(AttendanceSummaryService._pending.dates, {self.day, date(2024, 3, 7)})
+        callbacks[0]()
+
+    def test_moving_a_loaded_attendance_reuses_its_loaded_date(self):
+        moved_to = date(2024, 3, 7)
+        with self.captureOnCommitCallbacks(execute=True):
+            Attendance.objects.create(employee=self.alice, date=self.day, status='present')
+        attendance = Attendance.objects.get(employee=self.alice)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                attendance.date = moved_to
+                attendance.save()
+        self.assertEqual([q['sql'].split()[0] for q in queries.captured_queries], ['UPDATE'])
+        self.assertEqual(self.summary(), {(moved_to, self.engineering.id): (1, 0, 1)})
+
+        # The snapshot follows the save, so moving it back clears the new date too
+        with self.captureOnCommitCallbacks(execute=True):
+            attendance.date = self.day
+            attendance.save()
+        self.assertEqual(self.summary(), {(self.day, self.engineering.id): (1, 0, 1)})
+
+    def test_rebuild_command(self):
+        Attendance.objects.create(employee=self.alice, date=self.day, status='present')
+        Attendance.objects.create(employee=self.bob, date=date(2024, 4, 2), status='absent')
+        DailyAttendanceSummary.objects.all().delete()
+
+        call_command('rebuild_attendance_summary', stdout=StringIO())
+        self.assertEqual(self.summary(), {
+            (self.day, self.engineering.id): (1, 0, 1),
+            (date(2024, 4, 2), self.sales.id): (0, 1, 1),
+        })
+
+
+class AttendanceMatrixPaginationTests(TestCase):
+
+    def setUp(self):
+        Employee.objects.bulk_create([
+            Employee(
+                first_name=f'Employee{i:03d}', last_name='Test', email=f'employee{i}@example.com',
+                phone_number='123', hire_date=date(2024, 1, 1),
+            )
+            for i in range(AttendanceMatrixPaginator.EMPLOYEES_PER_PAGE + 5)
+        ])
+        self.first = Employee.objects.order_by('first_name').first()
+        Attendance.objects.create(employee=self.first, date=date(2024, 3, 6), status='present')
+
+    def test_date_window(self):
+        window = AttendanceMatrixPaginator.get_date_window(date(2024, 1, 1), date(2024, 3, 31))
+        self.assertEqual((window['number'], window['count']), (3, 3))
+        self.assertEqual((window['start_date'], window['end_date']), (date(2024, 3, 1), date(2024, 3, 31)))
+
+        first = AttendanceMatrixPaginator.get_date_window(date(2024, 1, 1), date(2024, 3, 31), '1')
+        self.assertEqual((first['start_date'], first['end_date']), (date(2024, 1, 1), date(2024, 1, 29)))
+        self.assertFalse(first['has_previous'])
+
+    def test_date_window_keeps_the_newest_window_full(self):
+        window = AttendanceMatrixPaginator.get_date_window(date(2024, 1, 1), date(2024, 2, 1))
+        self.assertEqual((window['number'], window['count']), (2, 2))
+        self.assertEqual((window['start_date'], window['end_date']), (date(2024, 1, 2), date(2024, 2, 1)))
+
+        oldest = AttendanceMatrixPaginator.get_date_window(date(2024, 1, 1), date(2024, 2, 1), '1')
+        self.assertEqual((oldest['start_date'], oldest['end_date']), (date(2024, 1, 1), date(2024, 1, 1)))
+
+    def test_attendance_list_renders_first_block_only(self):
+        response = self.client.get(reverse('attendance_list'), {
+            'start_date': '2023-03-01', 'end_date': '2024-03-06',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['matrix']['rows']), AttendanceMatrixPaginator.EMPLOYEES_PER_PAGE)
+        self.assertEqual(len(response.context['matrix_dates']), AttendanceMatrixPaginator.DAYS_PER_WINDOW)
+        self.assertEqual(response.context['matrix_dates'][-1]['date'], date(2024, 3, 6))
+        self.assertContains(response, 'attendance-matrix-sentinel')
+
+    def test_matrix_data_endpoint(self):
+        url = reverse('attendance_matrix_data')
+        response = self.client.get(url, {'start_date': '2024-03-01', 'end_date': '2024-03-06'})
+        data = response.json()
+        self.assertEqual(data['next_page'], 2)
+        self.assertEqual(data['dates'][-1], '2024-03-06')
+        self.assertEqual(data['rows'][0]['statuses'][-1], 'present')
+
+        data = self.client.get(url, {'start_date': '2024-03-01', 'end_date': '2024-03-06', 'page': 2}).json()
+        self.assertIsNone(data['next_page'])
+        self.assertEqual(len(data['rows']), 5)
+        self.assertIn('<tr', data['html'])
+
+
+class AttendanceExportTests(TestCase):
+
+    def setUp(self):
+        self.engineering = Department.objects.create(name='Engineering')
+        self.alice = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', department=self.engineering, hire_date=date(2024, 1, 1),
+        )
+        self.bob = Employee.objects.create(
+            first_name='Bob', last_name='Jones', email='bob@example.com',
+            phone_number='456', hire_date=date(2024, 1, 1),
+        )
+        Attendance.objects.create(employee=self.alice, date=date(2024, 3, 5), status='present')
+        Attendance.objects.create(employee=self.bob, date=date(2024, 3, 6), status='absent')
+        Attendance.objects.create(employee=self.alice, date=date(2024, 4, 1), status='absent')
+
+    def export(self, **params):
+        response = self.client.get(reverse('export_attendance'), {'start_date': '2024-03-01', 'end_date': '2024-03-31', **params})
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        response, content = self.export()
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(content.splitlines(), [
+            'date,employee_id,first_name,last_name,email,department,status',
+            f'2024-03-05,{self.alice.id},Alice,Smith,alice@example.com,Engineering,present',
+            f'2024-03-06,{self.bob.id},Bob,Jones,bob@example.com,,absent',
+        ])
+
+    def test_ndjson_export_filtered_by_department(self):
+        _, content = self.export(format='ndjson', department=self.engineering.id)
+        records = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(records, [{
+            'date': '2024-03-05', 'employee_id': self.alice.id, 'first_name': 'Alice', 'last_name': 'Smith',
+            'email': 'alice@example.com', 'department': 'Engineering', 'status': 'present',
+        }])
+
+    def test_rejects_unknown_format(self):
+        response = self.client.get(reverse('export_attendance'), {'format': 'xlsx'})
+        self.assertEqual(response.status_code, 400)
+
+
+class AttendanceGapReportTests(TestCase):
+
+    def setUp(self):
+        HolidayCalendar.invalidate()
+        self.engineering = Department.objects.create(name='Engineering')
+        self.alice = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', department=self.engineering, hire_date=date(2024, 1, 1),
+        )
+        # Hired mid-range, so nothing is expected before Mar 13
+        self.bob = Employee.objects.create(
+            first_name='Bob', last_name='Jones', email='bob@example.com',
+            phone_number='456', hire_date=date(2024, 3, 13),
+        )
+        Holiday.objects.create(name='Founders Day', date=date(2024, 3, 5))
+        # Mar 4-15 2024 has 9 working days once the holiday is taken out
+        for day in (4, 6, 11, 12, 15):
+            Attendance.objects.create(employee=self.alice, date=date(2024, 3, day), status='absent' if day == 12 else 'present')
+        Attendance.objects.create(employee=self.bob, date=date(2024, 3, 13), status='present')
+        # Weekend records are neither expected nor counted
+        Attendance.objects.create(employee=self.bob, date=date(2024, 3, 9), status='present')
+
+    def tearDown(self):
+        HolidayCalendar.invalidate()
+
+    def test_missing_records_and_gaps(self):
+        with self.assertNumQueries(3):
+            rows = {row['email']: row for row in AttendanceGapReportService.run(date(2024, 3, 4), date(2024, 3, 15))}
+        alice = rows['alice@example.com']
+        self.assertEqual((alice['expected'], alice['recorded'], alice['absent'], alice['missing']), (9, 5, 1, 4))
+        self.assertEqual(alice['absence_rate'], 20.0)
+        self.assertEqual(alice['gaps'], [
+            (date(2024, 3, 7), date(2024, 3, 8), 2),
+            (date(2024, 3, 13), date(2024, 3, 14), 2),
+        ])
+        bob = rows['bob@example.com']
+        self.assertEqual((bob['expected'], bob['recorded'], bob['missing']), (3, 1, 2))
+        self.assertEqual(bob['gaps'], [(date(2024, 3, 14), date(2024, 3, 15), 2)])
+
+        department_rows = list(AttendanceGapReportService.run(date(2024, 3, 4), date(2024, 3, 15), self.engineering.id))
+        self.assertEqual([row['email'] for row in department_rows], ['alice@example.com'])
+        summary = AttendanceGapReportService.summarize(rows.values())
+        self.assertEqual((summary['expected'], summary['missing']), (12, 6))
+
+    def test_view_and_command(self):
+        response = self.client.get(reverse('attendance_gaps'), {'start_date': '2024-03-04', 'end_date': '2024-03-15'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['email'] for row in response.context['page']], ['alice@example.com', 'bob@example.com'])
+        self.assertEqual(self.client.get(reverse('attendance_gaps'), {'department': 'x'}).status_code, 400)
+
+        out = StringIO()
+        call_command('attendance_gaps', '--start-date', '2024-03-04', '--end-date', '2024-03-15', '--csv', stdout=out, stderr=StringIO())
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].endswith('2024-03-07..2024-03-08 2024-03-13..2024-03-14'))
+
+
+class ReportJobTests(TestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_root = override_settings(MEDIA_ROOT=media.name)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+        self.alice = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', hire_date=date(2024, 1, 1),
+        )
+        for day in (4, 5, 6):
+            Attendance.objects.create(employee=self.alice, date=date(2024, 3, day), status='present')
+
+    def submit(self, **data):
+        return self.client.post(reverse('report_jobs'), {'start_date': '2024-03-04', 'end_date': '2024-03-08', **data})
+
+    def test_export_job_is_queued_run_by_a_worker_and_downloaded(self):
+        response = self.submit(kind='attendance_export')
+        job = ReportJob.objects.get()
+        self.assertRedirects(response, reverse('report_job_detail', args=[job.pk]))
+        self.assertEqual((job.status, job.params['format']), (ReportJob.QUEUED, 'csv'))
+        # Nothing is generated on the request path
+        self.assertEqual(self.client.get(reverse('report_job_download', args=[job.pk])).status_code, 404)
+
+        call_command('run_workers', '--workers', '0', '--once', stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), (ReportJob.DONE, {'rows': 3}))
+
+        status = self.client.get(reverse('report_job_detail', args=[job.pk]), {'format': 'json'}).json()
+        self.assertEqual(status['status'], 'done')
+        response = self.client.get(status['download_url'])
+        self.assertIn('attachment; filename="attendance_20240304_20240308', response['Content-Disposition'])
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].startswith(f'2024-03-04,{self.alice.id},Alice'))
+
+    def test_gap_report_job_and_invalid_requests(self):
+        self.submit(kind='attendance_gaps')
+        self.assertEqual(self.submit(kind='attendance_gaps', start_date='2024-03-09').status_code, 400)
+        self.assertEqual(self.submit(kind='attendance_export', format='xlsx').status_code, 400)
+        self.assertEqual(self.submit(kind='nonsense').status_code, 400)
+        self.assertEqual(self.submit(kind='rebuild_summary').status_code, 403)
+
+        job = ReportJob.objects.get()
+        self.assertEqual(ReportJobService.claim('test'), job.pk)
+        self.assertIsNone(ReportJobService.claim('other'))
+        self.assertEqual(ReportJobService.execute(job.pk), ReportJob.DONE)
+        job.refresh_from_db()
+        self.assertEqual((job.result['missing'], job.result['rows']), (2, 1))
+        with job.result_file.open('r') as result:
+            self.assertTrue(result.read().splitlines()[1].endswith('2024-03-07..2024-03-08'))
+
+    def test_failed_and_stale_jobs(self):
+        job = ReportJobService.submit(ReportJob.ATTENDANCE_EXPORT, {'start_date': 'not a date', 'end_date': '2024-03-08'})
+        ReportJobService.claim('test')
+        self.assertEqual(ReportJobService.execute(job.pk), ReportJob.FAILED)
+        job.refresh_from_db()
+        self.assertIn('ValueError', job.error)
+        self.assertFalse(job.result_file)
+
+        stale = ReportJobService.submit(ReportJob.REBUILD_SUMMARY, {})
+        ReportJobService.claim('test')
+        self.assertEqual(ReportJobService.requeue_stale(), 0)
+        # A recent heartbeat keeps a long job running, however long ago it started
+        later = timezone.now() + timedelta(hours=2)
+        ReportJob.objects.filter(pk=stale.pk).update(updated_at=later - ReportJobService.HEARTBEAT_INTERVAL)
+        self.assertEqual(ReportJobService.requeue_stale(later), 0)
+        self.assertEqual(ReportJobService.requeue_stale(later + ReportJobService.STALE_AFTER), 1)
+        stale.refresh_from_db()
+        self.assertEqual((stale.status, stale.worker), (ReportJob.QUEUED, ''))
+
+        self.assertEqual(ReportJobService.purge(timezone.now() + timedelta(seconds=1)), 1)
+        self.assertEqual(list(ReportJob.objects.values_list('pk', flat=True)), [stale.pk])
+
+
+class PartitionedReportTests(TestCase):
+
+    def setUp(self):
+        engineering = Department.objects.create(name='Engineering')
+        self.alice = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', department=engineering, hire_date=date(2024, 1, 1),
+        )
+        self.bob = Employee.objects.create(
+            first_name='Bob', last_name='Jones', email='bob@example.com',
+            phone_number='456', hire_date=date(2024, 1, 1),
+        )
+        for day in (date(2024, 1, 25) + timedelta(days=i) for i in range(40)):
+            Attendance.objects.create(employee=self.alice, date=day, status='absent' if day.day % 5 == 0 else 'present')
+            if day.month == 2:
+                Attendance.objects.create(employee=self.bob, date=day, status='present')
+
+    def test_partitions_follow_calendar_months(self):
+        self.assertEqual(PartitionedReportService.get_partitions(date(2024, 1, 20), date(2024, 3, 5)), [
+            (date(2024, 1, 20), date(2024, 1, 31)),
+            (date(2024, 2, 1), date(2024, 2, 29)),
+            (date(2024, 3, 1), date(2024, 3, 5)),
+        ])
+
+    def test_merged_report_matches_a_single_query(self):
+        start_date, end_date = date(2024, 1, 20), date(2024, 3, 5)
+        # The in-memory test database can't be shared with other processes
+        with self.assertNumQueries(6):
+            report = PartitionedReportService.run(start_date, end_date, workers=4)
+        self.assertEqual(report['workers'], 3)
+
+        expected = Attendance.objects.filter(date__gte=start_date, date__lte=end_date).aggregate(
+            **DashboardStatsService.status_counts()
+        )
+        self.assertEqual((report['totals']['present'], report['totals']['absent']), (expected['present'], expected['absent']))
+        self.assertEqual([month['total'] for month in report['months']], [7, 58, 4])
+        self.assertEqual([department['department_id'] for department in report['departments']], [None, self.alice.department_id])
+        bob = report['employees'][1]
+        self.assertEqual((bob['employee_id'], bob['department_id'], bob['total'], bob['presence_rate']), (self.bob.id, None, 29, 100.0))
+        self.assertEqual(report['days'][0]['date'], date(2024, 1, 25))
+
+        # Partitions may come back from the workers in any order
+        partials = [PartitionedReportService.compute_partition(*partition) for partition in PartitionedReportService.get_partitions(start_date, end_date)]
+        merged = PartitionedReportService.merge(reversed(partials))
+        self.assertEqual(merged, {key: value for key, value in report.items() if key in merged})
+
+
+class AttendanceSnapshotTests(TestCase):
+
+    def setUp(self):
+        if numpy is None:
+            self.skipTest('NumPy is not installed')
+        engineering = Department.objects.create(name='Engineering')
+        self.alice = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', department=engineering, hire_date=date(2024, 1, 1),
+        )
+        self.bob = Employee.objects.create(
+            first_name='Bob', last_name='Jones', email='bob@example.com',
+            phone_number='456', hire_date=date(2024, 1, 1),
+        )
+        self.carol = Employee.objects.create(
+            first_name='Carol', last_name='White', email='carol@example.com',
+            phone_number='789', department=engineering, hire_date=date(2024, 1, 1),
+        )
+        # Alice: absent Mar 6-7, then (across the weekend) Mar 8 and 11-12, still absent at the end
+        for day, status in [(4, 'present'), (6, 'absent'), (7, 'absent'), (8, 'present'), (11, 'absent'), (12, 'absent')]:
+            Attendance.objects.create(employee=self.alice, date=date(2024, 3, day), status=status)
+        for day in (4, 5, 6):
+            Attendance.objects.create(employee=self.bob, date=date(2024, 3, day), status='present' if day != 5 else 'absent')
+
+    def test_matrix_and_answers_match_the_orm(self):
+        start_date, end_date = date(2024, 3, 1), date(2024, 3, 14)
+        with self.assertNumQueries(2):
+            snapshot = AttendanceSnapshot.load(start_date, end_date)
+        self.assertEqual(snapshot.employee_index.dtype, numpy.int32)
+        self.assertEqual(snapshot.status.dtype, numpy.uint8)
+        self.assertEqual(snapshot.matrix.shape, (3, 14))
+        self.assertEqual(snapshot.matrix[0, 3:8].tolist(), [1, 0, 2, 2, 1])
+        self.assertFalse(snapshot.matrix[2].any())
+
+        AttendanceSummaryService.rebuild(start_date, end_date)
+        self.assertEqual(snapshot.daily_counts(), AttendanceSummaryService.get_daily_counts(start_date, end_date))
+        rates = snapshot.presence_rates()
+        self.assertEqual(rates[self.alice.id], {'present': 2, 'absent': 4, 'total': 6, 'presence_rate': 33.3})
+        self.assertEqual(rates[self.carol.id]['presence_rate'], 0.0)
+
+        streaks = snapshot.absence_streaks()
+        for employee in (self.alice, self.bob, self.carol):
+            expected = EmployeeAttendanceHistoryService.get_absence_streaks(
+                EmployeeAttendanceHistoryService.get_queryset(employee.id, start_date, end_date)
+            )
+            self.assertEqual(streaks[employee.id], {key: expected[key] for key in ('count', 'longest', 'current')})
+        self.assertEqual(streaks[self.alice.id], {'count': 2, 'longest': 2, 'current': 2})
+
+        department = AttendanceSnapshot.load(start_date, end_date, self.alice.department_id)
+        self.assertEqual(sorted(department.presence_rates()), [self.alice.id, self.carol.id])
+
+    def test_records_of_employees_moved_during_load_are_dropped(self):
+        moved = []
+
+        def move_bob_before_attendance_query(execute, sql, params, many, context):
+            if not moved and 'FROM "employees_attendance"' in sql:
+                moved.append(Employee.objects.filter(pk=self.bob.pk).update(department=self.alice.department))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(move_bob_before_attendance_query):
+            snapshot = AttendanceSnapshot.load(date(2024, 3, 1), date(2024, 3, 14), self.alice.department_id)
+        self.assertEqual(moved, [1])
+        self.assertEqual(snapshot.employee_ids.tolist(), [self.alice.id, self.carol.id])
+        self.assertEqual(len(snapshot.status), 6)
+        self.assertFalse(snapshot.matrix[1].any())
+
+
+class AttendanceImportTests(TestCase):
+
+    def setUp(self):
+        HolidayCalendar.invalidate()
+        Holiday.objects.create(name='Founders Day', date=date(2024, 3, 5))
+        self.alice = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', hire_date=date(2024, 1, 1),
+        )
+        self.bob = Employee.objects.create(
+            first_name='Bob', last_name='Jones', email='bob@example.com',
+            phone_number='456', hire_date=date(2024, 1, 1),
+        )
+        Attendance.objects.create(employee=self.bob, date=date(2024, 3, 7), status='present')
+        self.csv = (
+            'employee_id,email,date,status\n'
+            f'{self.alice.id},,2024-03-06,present\n'
+            ',BOB@example.com,2024-03-06,absent\n'
+            f'{self.alice.id},,2024-03-06,absent\n'
+            f'{self.alice.id},,2024-03-09,present\n'
+            f'{self.alice.id},,2024-03-05,present\n'
+            f'{self.bob.id},,2024-03-07,absent\n'
+            ',nobody@example.com,2024-03-06,present\n'
+            f'{self.alice.id},,2024-03-08,late\n'
+        )
+
+    def tearDown(self):
+        HolidayCalendar.invalidate()
+
+    def test_import_command_reports_row_errors(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as csv_file:
+            csv_file.write(self.csv)
+        self.addCleanup(os.remove, csv_file.name)
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_attendance', csv_file.name, '--batch-size', '2', stdout=stdout, stderr=stderr)
+
+        self.assertIn('Imported 2 of 8 row(s) with 6 error(s)', stdout.getvalue())
+        errors = stderr.getvalue()
+        for line in ('Line 4: Duplicate', 'Line 5: Attendance cannot be marked on Saturdays', 'Line 6: Attendance cannot be marked on Founders Day',
+                     'Line 7: Attendance for employee', 'Line 8: Unknown employee', 'Line 9: Invalid status'):
+            self.assertIn(line, errors)
+        self.assertEqual(
+            dict(Attendance.objects.filter(date=date(2024, 3, 6)).values_list('employee_id', 'status')),
+            {self.alice.id: 'present', self.bob.id: 'absent'},
+        )
+        self.assertEqual(AttendanceSummaryService.get_daily_counts(date(2024, 3, 6), date(2024, 3, 6))[date(2024, 3, 6)]['total'], 2)
+
+    def test_upload_view_dry_run(self):
+        response = self.client.post(reverse('import_attendance'), {
+            'file': SimpleUploadedFile('attendance.csv', self.csv.encode(), content_type='text/csv'),
+            'dry_run': 'on',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['result']['created'], 2)
+        self.assertEqual(Attendance.objects.count(), 1)
+
+    def test_upload_view_rejects_non_utf8_file(self):
+        response = self.client.post(reverse('import_attendance'), {
+            'file': SimpleUploadedFile('attendance.csv', self.csv.encode('utf-16'), content_type='text/csv'),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('not UTF-8 text', str(response.context['form'].errors['file']))
+        self.assertEqual(Attendance.objects.count(), 1)
+
+    def test_rows_inserted_concurrently_are_reported(self):
+        service = AttendanceImportService(today=date(2024, 3, 31))
+        split_existing = service.split_existing
+
+        def split_then_insert(pending):
+            split = split_existing(pending)
+            if not Attendance.objects.filter(employee=self.alice, date=date(2024, 3, 6)).exists():
+                # Another import writes the row after this one has checked for it
+                Attendance.objects.create(employee=self.alice, date=date(2024, 3, 6), status='absent')
+            return split
+
+        service.split_existing = split_then_insert
+        result = service.run(csv.DictReader(StringIO(self.csv)))
+
+        self.assertEqual(result['created'], 1)
+        self.assertIn((2, f'Attendance for employee {self.alice.id} on 2024-03-06 already exists.'), result['errors'])
+        self.assertEqual(Attendance.objects.get(employee=self.alice, date=date(2024, 3, 6)).status, 'absent')
+
+
+class EmployeeSyncTests(TestCase):
+
+    def setUp(self):
+        self.engineering = Department.objects.create(name='Engineering')
+        self.alice = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', department=self.engineering, hire_date=date(2024, 1, 1),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Attendance.objects.create(employee=self.alice, date=date(2024, 3, 6), status='present')
+        self.records = [
+            {'email': 'ALICE@example.com', 'first_name': 'Alice', 'last_name': 'Brown', 'phone_number': '123',
+             'department': 'Sales', 'hire_date': '2024-01-01'},
+            {'email': 'bob@example.com', 'first_name': 'Bob', 'last_name': 'Jones', 'phone_number': '456',
+             'department': 'engineering', 'hire_date': '2024-02-01'},
+            {'email': 'bob@example.com', 'first_name': 'Bobby', 'last_name': 'Jones', 'phone_number': '456',
+             'department': '', 'hire_date': '2024-02-01'},
+            {'email': 'not-an-email', 'first_name': 'X', 'last_name': 'Y', 'phone_number': '1', 'hire_date': '2024-01-01'},
+        ]
+
+    def write_json(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as json_file:
+            json.dump(self.records, json_file)
+        self.addCleanup(os.remove, json_file.name)
+        return json_file.name
+
+    def test_dry_run_prints_diff_without_writing(self):
+        stdout = StringIO()
+        call_command('sync_employees', self.write_json(), '--dry-run', stdout=stdout, stderr=StringIO())
+
+        output = stdout.getvalue()
+        self.assertIn('+ bob@example.com', output)
+        self.assertIn('last_name: Smith -> Brown', output)
+        self.assertIn('department: Engineering -> Sales', output)
+        self.assertIn('would create 1 and update 1', output)
+        self.assertFalse(Employee.objects.filter(email='bob@example.com').exists())
+        self.assertFalse(Department.objects.filter(name='Sales').exists())
+
+    def test_dry_run_reports_moves_into_new_departments_and_bad_records(self):
+        Employee.objects.create(
+            first_name='Carol', last_name='White', email='carol@example.com',
+            phone_number='789', hire_date=date(2024, 1, 1),
+        )
+        records = [
+            {'email': 'carol@example.com', 'first_name': 'Carol', 'last_name': 'White', 'phone_number': '789',
+             'department': 'Marketing', 'hire_date': '2024-01-01'},
+            'dave@example.com',
+        ]
+        result = EmployeeSyncService(dry_run=True).run(records)
+
+        self.assertEqual(result['changes'], [('carol@example.com', 'update', {'department': (None, 'Marketing')})])
+        self.assertEqual(result['errors'], [(2, 'Expected an object with employee fields, got str.')])
+
+    def test_sync_upserts_on_email(self):
+        stderr = StringIO()
+        with self.assertNumQueries(13):
+            call_command('sync_employees', self.write_json(), stdout=StringIO(), stderr=stderr)
+
+        self.assertIn('Record 3: Duplicate email', stderr.getvalue())
+        self.assertIn('Record 4:', stderr.getvalue())
+        self.alice.refresh_from_db()
+        self.assertEqual((self.alice.last_name, self.alice.department.name), ('Brown', 'Sales'))
+        self.assertEqual(Employee.objects.get(email='bob@example.com').department, self.engineering)
+        self.assertEqual(
+            list(DailyAttendanceSummary.objects.values_list('department__name', 'present')),
+            [('Sales', 1)],
+        )
+
+
+class ReadReplicaRoutingTests(TestCase):
+    # The test settings add a second, empty SQLite database as the "replica"
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', hire_date=date(2024, 1, 1),
+        )
+        Employee.objects.using('replica').create(
+            first_name='Rita', last_name='Replica', email='rita@example.com',
+            phone_number='456', hire_date=date(2024, 1, 1),
+        )
+
+    def employee_names(self, **params):
+        response = self.client.get(reverse('employee_list'), params)
+        return [employee.first_name for employee in response.context['employees']]
+
+    def test_reads_stay_on_default_until_a_replica_is_configured(self):
+        self.assertEqual(self.employee_names(), ['Alice'])
+        with override_settings(READ_REPLICA_ALIAS='missing'):
+            self.assertEqual(self.employee_names(), ['Alice'])
+
+    @override_settings(READ_REPLICA_ALIAS='replica')
+    def test_read_only_views_use_the_replica(self):
+        self.assertEqual(self.employee_names(), ['Rita'])
+        response = self.client.get(reverse('export_attendance'), {'start_date': '2024-01-01', 'end_date': '2024-01-31'})
+        self.assertEqual(b''.join(response.streaming_content).decode().splitlines()[1:], [])
+        # Outside the decorated views everything, writes included, goes to default
+        self.assertEqual(list(Employee.objects.values_list('first_name', flat=True)), ['Alice'])
+
+    @override_settings(READ_REPLICA_ALIAS='replica')
+    async def test_async_views_use_the_replica(self):
+        response = await self.async_client.get(reverse('dashboard'))
+        self.assertEqual(response.context['total_employees'], 1)
+        await Employee.objects.using('replica').filter(first_name='Rita').adelete()
+        response = await self.async_client.get(reverse('dashboard'))
+        self.assertEqual(response.context['total_employees'], 0)
+
+    @override_settings(READ_REPLICA_ALIAS='replica')
+    def test_writes_go_to_default(self):
+        alice = Employee.objects.get(first_name='Alice')
+        day = date(2024, 3, 6)
+        self.client.post(reverse('mark_attendance'), {'selected_date': day.isoformat(), f'status_{alice.pk}': 'present'})
+        self.assertTrue(Attendance.objects.using('default').filter(employee=alice, date=day).exists())
+        self.assertFalse(Attendance.objects.using('replica').exists())
+
+
+@override_settings(
+    MIDDLEWARE=['employee_management.instrumentation.PerformanceMiddleware', *settings.MIDDLEWARE],
+    TEMPLATES=[{**settings.TEMPLATES[0], 'BACKEND': 'employee_management.instrumentation.InstrumentedDjangoTemplates'}],
+    PERFORMANCE_INSTRUMENTATION=True,
+    PERFORMANCE_SLOW_REQUEST_MS=0,
+)
+class PerformanceMiddlewareTests(TestCase):
+
+    def setUp(self):
+        histogram.reset()
+        department = Department.objects.create(name='Engineering')
+        Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', department=department, hire_date=date(2024, 1, 1),
+        )
+
+    def test_server_timing_and_slow_request_log(self):
+        with self.assertLogs('employee_management.performance', 'WARNING') as logs:
+            response = self.client.get(reverse('dashboard'))
+
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'tpl;dur=', 'app;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+        self.assertNotIn('tpl;dur=0.0', timing)
+        self.assertIn(f'Slow request GET {reverse("dashboard")} (dashboard)', logs.output[0])
+
+    async def test_async_requests_count_every_query(self):
+        with self.assertLogs('employee_management.performance', 'WARNING'):
+            sync_timing = (await sync_to_async(self.client.get)(reverse('dashboard')))['Server-Timing']
+            async_timing = (await self.async_client.get(reverse('dashboard')))['Server-Timing']
+
+        query_count = re.search(r'"(\d+) queries"', sync_timing).group(1)
+        self.assertGreater(int(query_count), 0)
+        self.assertIn(f'"{query_count} queries"', async_timing)
+
+    def test_stats_endpoint_is_staff_only(self):
+        with self.assertLogs('employee_management.performance', 'WARNING'):
+            self.client.get(reverse('dashboard'))
+            self.client.get(reverse('dashboard'))
+
+        response = self.client.get(reverse('performance_stats'))
+        self.assertEqual(response.status_code, 302)
+
+        get_user_model().objects.create_user('admin', password='secret', is_staff=True)
+        self.client.login(username='admin', password='secret')
+        with self.assertLogs('employee_management.performance', 'WARNING'):
+            routes = self.client.get(reverse('performance_stats')).json()['routes']
+        self.assertEqual(routes['dashboard']['count'], 2)
+        self.assertEqual(sum(routes['dashboard']['histogram'].values()), 2)
+
+
+class FragmentCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        HolidayCalendar.invalidate()
+        department = Department.objects.create(name='Engineering')
+        self.employee = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', department=department, hire_date=date(2024, 1, 1),
+        )
+        Attendance.objects.create(employee=self.employee, date=date(2024, 3, 6), status='present')
+        Attendance.objects.create(employee=self.employee, date=date(2024, 4, 2), status='present')
+        self.march = {'start_date': '2024-03-01', 'end_date': '2024-03-31'}
+
+    def get_matrix(self, params):
+        return self.client.get(reverse('attendance_matrix_data'), params).json()
+
+    def test_closed_period_served_from_cache(self):
+        self.get_matrix(self.march)
+        with self.assertNumQueries(0):
+            data = self.get_matrix(self.march)
+        self.assertEqual(data['rows'][0]['statuses'][5], 'present')
+
+        self.client.get(reverse('attendance_list'), self.march)
+        with self.assertNumQueries(5):
+            # Four freshness aggregates plus the summary-backed daily stats
+            response = self.client.get(reverse('attendance_list'), self.march)
+        self.assertContains(response, 'calendar-month')
+
+    def test_writes_invalidate_only_their_month(self):
+        self.get_matrix(self.march)
+        march_version = FragmentCache.get_versions(['attendance:2024-03'])
+
+        Attendance.objects.filter(date=date(2024, 4, 2)).get().delete()
+        self.assertEqual(FragmentCache.get_versions(['attendance:2024-03']), march_version)
+        with self.assertNumQueries(0):
+            self.get_matrix(self.march)
+
+        AttendanceBulkWriter.write(date(2024, 3, 6), {self.employee.id: 'absent'})
+        self.assertEqual(self.get_matrix(self.march)['rows'][0]['statuses'][5], 'absent')
+
+    def test_employee_and_holiday_writes_invalidate(self):
+        self.get_matrix(self.march)
+        self.employee.first_name = 'Alicia'
+        self.employee.save()
+        self.assertEqual(self.get_matrix(self.march)['rows'][0]['name'], 'Alicia Smith')
+
+        mark_url = reverse('mark_attendance')
+        self.assertNotContains(self.client.get(mark_url), 'Synthetic Day')
+        today = timezone.now().date()
+        Holiday.objects.create(name='Synthetic Day', date=today - timedelta(days=today.weekday()))
+        self.assertContains(self.client.get(mark_url), 'Synthetic Day')
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            first_name='Alice', last_name='Smith', email='alice@example.com',
+            phone_number='123', hire_date=date(2024, 1, 1),
+        )
+        self.attendance = Attendance.objects.create(employee=self.employee, date=date(2024, 3, 6), status='present')
+        self.march = {'start_date': '2024-03-01', 'end_date': '2024-03-31'}
+
+    def revalidate(self, url, params, response):
+        return self.client.get(
+            url, params,
+            HTTP_IF_NONE_MATCH=response['ETag'],
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+        )
+
+    def test_unchanged_pages_return_304(self):
+        for url, params in [
+            (reverse('employee_list'), {}),
+            (reverse('attendance_list'), self.march),
+            (reverse('dashboard'), {}),
+        ]:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('no-cache', response['Cache-Control'])
+            self.assertEqual(self.revalidate(url, params, response).status_code, 304)
+
+    def test_writes_change_the_etag(self):
+        url = reverse('attendance_list')
+        response = self.client.get(url, self.march)
+
+        self.attendance.status = 'absent'
+        self.attendance.save()
+        response = self.revalidate(url, self.march, response)
+        self.assertEqual(response.status_code, 200)
+
+        # A delete leaves no newer timestamp, the row count gives it away
+        self.attendance.delete()
+        self.assertEqual(self.revalidate(url, self.march, response).status_code, 200)
+
+        response = self.client.get(reverse('employee_list'))
+        AttendanceBulkWriter.write(date(2024, 3, 7), {self.employee.id: 'present'})
+        self.assertEqual(self.revalidate(reverse('employee_list'), {}, response).status_code, 304)
+        EmployeeSyncService().run([{
+            'email': 'alice@example.com', 'first_name': 'Alicia', 'last_name': 'Smith',
+            'phone_number': '123', 'hire_date': '2024-01-01',
+        }])
+        self.assertEqual(self.revalidate(reverse('employee_list'), {}, response).status_code, 200)
+
+    def test_if_modified_since_alone_does_not_hide_deletes(self):
+        url = reverse('attendance_list')
+        response = self.client.get(url, self.march)
+        self.attendance.delete()
+
+        response = self.client.get(url, self.march, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_pending_messages_skip_conditional_response(self):
+        response = self.client.get(reverse('employee_list'))
+        self.client.post(reverse('employee_delete', args=[self.employee.pk]))
+        response = self.revalidate(reverse('employee_list'), {}, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+
+
+class ApiTests(TestCase):
+
+    def setUp(self):
+        self.department = Department.objects.create(name='Engineering')
+        Employee.objects.bulk_create([
+            Employee(
+                first_name=name, last_name='Test', email=f'{name.lower()}@example.com',
+                phone_number='123', department=self.department, hire_date=date(2024, 1, 1),
+            )
+            for name in ['Dora', 'Alice', 'Carol', 'Bob', 'Eve']
+        ])
+        self.alice = Employee.objects.get(first_name='Alice')
+        Attendance.objects.bulk_create([
+            Attendance(employee=employee, date=day, status='present')
+            for employee in Employee.objects.all()
+            for day in [date(2024, 3, 4), date(2024, 3, 5)]
+        ])
+        get_user_model().objects.create_user('api', password='secret', is_staff=True)
+        self.auth = 'Basic ' + base64.b64encode(b'api:secret').decode()
+
+    def send(self, method, url, payload, **extra):
+        return getattr(self.client, method)(url, json.dumps(payload), content_type='application/json', **extra)
+
+    def test_cursor_pagination_and_field_selection(self):
+        url = reverse('api_collection', args=['employees'])
+        names, cursor = [], None
+        while True:
+            params = {'limit': 2, 'fields': 'first_name'}
+            if cursor:
+                params['cursor'] = cursor
+            with self.assertNumQueries(1):
+                data = self.client.get(url, params).json()
+            names += [row['first_name'] for row in data['results']]
+            self.assertEqual(set(data['results'][0]), {'first_name'})
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(names, ['Alice', 'Bob', 'Carol', 'Dora', 'Eve'])
+
+        self.assertEqual(self.client.get(url, {'cursor': 'not-a-cursor'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'fields': 'salary'}).status_code, 400)
+
+        url = reverse('api_collection', args=['attendance'])
+        first = self.client.get(url, {'limit': 6, 'employee': self.alice.pk}).json()
+        self.assertEqual([row['date'] for row in first['results']], ['2024-03-04', '2024-03-05'])
+        rows = self.client.get(url, {'limit': 6}).json()
+        rest = self.client.get(url, {'limit': 6, 'cursor': rows['next_cursor']}).json()
+        self.assertEqual(len(rows['results']) + len(rest['results']), 10)
+        self.assertIsNone(rest['next_cursor'])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, {'limit': 6, 'cursor': rows['next_cursor']})
+        self.assertNotIn('OFFSET', queries[0]['sql'])
+        self.assertEqual(self.client.get(url, {'start_date': 'March'}).status_code, 400)
+
+    def test_writes_require_staff(self):
+        url = reverse('api_collection', args=['departments'])
+        self.assertEqual(self.send('post', url, {'name': 'Sales'}).status_code, 401)
+        response = self.send('post', url, {'name': 'Sales'}, HTTP_AUTHORIZATION=self.auth)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['name'], 'Sales')
+
+    def test_detail_update_and_delete(self):
+        url = reverse('api_detail', args=['employees', self.alice.pk])
+        response = self.send('patch', url, {'phone_number': '999'}, HTTP_AUTHORIZATION=self.auth)
+        self.assertEqual(response.json()['phone_number'], '999')
+        self.assertEqual(response.json()['department_name'], 'Engineering')
+
+        response = self.send('patch', url, {'hire_date': '2999-01-01'}, HTTP_AUTHORIZATION=self.auth)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('hire_date', response.json()['errors'])
+
+        self.assertEqual(self.client.delete(url, HTTP_AUTHORIZATION=self.auth).status_code, 204)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_batch_writes(self):
+        url = reverse('api_batch', args=['attendance'])
+        response = self.send('post', url, {'items': [
+            {'employee_id': self.alice.pk, 'date': '2024-03-05', 'status': 'absent'},
+            {'email': 'bob@example.com', 'date': '2024-03-06', 'status': 'present'},
+            {'employee_id': 999, 'date': '2024-03-06', 'status': 'present'},
+        ]}, HTTP_AUTHORIZATION=self.auth)
+        result = response.json()
+        self.assertEqual((result['created'], result['updated'], result['error_count']), (1, 1, 1))
+        self.assertEqual(result['errors'][0][0], 3)
+        self.assertEqual(Attendance.objects.get(employee=self.alice, date=date(2024, 3, 5)).status, 'absent')
+
+        employees = self.client.get(reverse('api_collection', args=['employees']), {'limit': 1}).json()['results']
+        employees[0]['department_name'] = 'Research'
+        employees.append({
+            'email': 'frank@example.com', 'first_name': 'Frank', 'last_name': 'Test',
+            'phone_number': '123', 'hire_date': '2024-01-01',
+        })
+        result = self.send(
+            'post', reverse('api_batch', args=['employees']), {'items': employees}, HTTP_AUTHORIZATION=self.auth,
+        ).json()
+        self.assertEqual((result['created'], result['updated']), (1, 1))
+        self.alice.refresh_from_db()
+        self.assertEqual(self.alice.department.name, 'Research')
+
+        self.assertEqual(
+            self.send('post', reverse('api_batch', args=['holidays']), {'items': []}, HTTP_AUTHORIZATION=self.auth).status_code,
+            404,
+        )
+
+
+class BenchmarkSuiteTests(TestCase):
+
+    def test_seed_synthetic(self):
+        out = StringIO()
+        call_command(
+            'seed_synthetic', departments=2, employees=5, days=14, holidays=1,
+            end_date='2025-03-14', stdout=out,
+        )
+
+        self.assertEqual(Department.objects.count(), 2)
+        self.assertEqual(Employee.objects.count(), 5)
+        working_days = 10 - Holiday.objects.filter(date__week_day__in=[2, 3, 4, 5, 6]).count()
+        self.assertEqual(Attendance.objects.count(), 5 * working_days)
+        self.assertEqual(
+            sum(DailyAttendanceSummary.objects.values_list('total', flat=True)),
+            Attendance.objects.count(),
+        )
+        self.assertIn('5 employees', out.getvalue())
+
+        call_command('seed_synthetic', departments=1, employees=3, days=7, holidays=0, end_date='2025-03-14', clear=True, stdout=out)
+        self.assertEqual(Employee.objects.count(), 3)
+        self.assertEqual(Attendance.objects.count(), 3 * 5)
+
+    def test_run_benchmarks(self):
+        with self.settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage'):
+            results = run_benchmarks(employee_counts=[5], day_ranges=[7], repeat=1, departments=2, holidays=0, log=lambda line: None)
+
+        views = {result['view'] for result in results['results']}
+        self.assertEqual(views, {'dashboard', 'mark_attendance', 'attendance_list', 'export_attendance', 'mark_attendance_post'})
+        for result in results['results']:
+            self.assertEqual(result['status'], 302 if result['view'] == 'mark_attendance_post' else 200)
+            self.assertGreater(result['queries'], 0)
+        comparison = compare_results(results, results)
+        self.assertEqual(len(comparison), len(results['results']) + 1)
+        self.assertIn('(+0%)', comparison[1])
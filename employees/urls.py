@@ -1,18 +1,29 @@
 from django.urls import path
-from . import views
+from . import api, views
 from django.contrib.auth import views as auth_views
 
 urlpatterns = [
     path('', views.employee_list, name='employee_list'),
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/departments/', views.department_analytics, name='department_analytics'),
     path('employee/<int:pk>/', views.employee_detail, name='employee_detail'),
     path('employee/new/', views.employee_create, name='employee_create'),
     path('employee/<int:pk>/edit/', views.employee_edit, name='employee_edit'),
     path('employee/<int:pk>/delete/', views.employee_delete, name='employee_delete'),
     path('attendance/', views.attendance_list, name='attendance_list'),
+    path('attendance/matrix/', views.attendance_matrix_data, name='attendance_matrix_data'),
+    path('attendance/export/', views.export_attendance, name='export_attendance'),
+    path('attendance/gaps/', views.attendance_gaps, name='attendance_gaps'),
     path('attendance/add/', views.add_attendance, name='add_attendance'),
+    path('attendance/import/', views.import_attendance, name='import_attendance'),
     path('attendance/mark/', views.mark_attendance, name='mark_attendance'),
     path('delete_attendance/<int:attendance_id>/', views.delete_attendance, name='delete_attendance'),
+    path('jobs/', views.report_jobs, name='report_jobs'),
+    path('jobs/<uuid:pk>/', views.report_job_detail, name='report_job_detail'),
+    path('jobs/<uuid:pk>/download/', views.report_job_download, name='report_job_download'),
+    path('api/<str:resource>/', api.collection, name='api_collection'),
+    path('api/<str:resource>/batch/', api.batch, name='api_batch'),
+    path('api/<str:resource>/<int:pk>/', api.detail, name='api_detail'),
     path('accounts/login/', auth_views.LoginView.as_view(template_name='registration/login.html'), name='login'),
     path('accounts/logout/', views.logout_view, name='logout'),
 ]
\ No newline at end of file
@@ -1,24 +1,141 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from .models import Employee, Attendance, Department, Holiday
-from .forms import EmployeeForm, AttendanceForm
-from django.http import HttpResponse, Http404
+from .models import Employee, Attendance, Department, Holiday, ReportJob
+from .forms import EmployeeForm, AttendanceForm, AttendanceImportForm
+from .services import (
+    AttendanceBulkWriter,
+    AttendanceExportService,
+    AttendanceGapReportService,
+    AttendanceImportService,
+    AttendanceMatrixBuilder,
+    AttendanceMatrixPaginator,
+    AttendanceSummaryService,
+    DashboardStatsService,
+    DepartmentAnalyticsService,
+    EmployeeAttendanceHistoryService,
+    EmployeeDirectoryService,
+    FragmentCache,
+    FreshnessService,
+    HolidayCalendar,
+    ReportJobService,
+    WorkingDayCalendar,
+)
+from django.http import (
+    FileResponse, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, Http404, JsonResponse, StreamingHttpResponse,
+)
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.utils.safestring import mark_safe
 from django.contrib import messages
 from django.contrib.auth import logout
+from employee_management.db_router import use_read_replica
 from datetime import datetime, timedelta, date
+from asgiref.sync import sync_to_async
 import calendar
+import csv
+import hashlib
+import io
+import os
 from django.db.models import Q, Count
 
+def get_request_state(request):
+    # Both may hit the session and user tables, so async views run this in a thread
+    return len(messages.get_messages(request)) > 0, request.user.pk
+
+def get_validators(states, last_modified, user_pk, extra):
+    etag = quote_etag(hashlib.md5(repr((states, extra, user_pk)).encode()).hexdigest())
+    return etag, int(last_modified.timestamp()) if last_modified else None
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+def render_if_modified(request, template_name, get_context, querysets, *extra):
+    has_messages, user_pk = get_request_state(request)
+    # A flash message is shown only once, so that response must never be reused
+    if has_messages:
+        return render(request, template_name, get_context())
+    
+    states, last_modified = FreshnessService.get_state(querysets)
+    etag, last_modified = get_validators(states, last_modified, user_pk, extra)
+    # Only the ETag covers row counts, so a request carrying just If-Modified-Since
+    # could miss a delete; Last-Modified is sent for information only
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = render(request, template_name, get_context())
+    return set_validators(response, etag, last_modified)
+
+async def arender_if_modified(request, template_name, get_context, querysets, *extra):
+    has_messages, user_pk = await sync_to_async(get_request_state)(request)
+    if has_messages:
+        return await sync_to_async(render)(request, template_name, await get_context())
+    
+    states, last_modified = await FreshnessService.aget_state(querysets)
+    etag, last_modified = get_validators(states, last_modified, user_pk, extra)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = await sync_to_async(render)(request, template_name, await get_context())
+    return set_validators(response, etag, last_modified)
+
+EMPLOYEE_SORTS = [
+    ('name', 'Name (A–Z)'),
+    ('-name', 'Name (Z–A)'),
+    ('hire_date', 'Longest serving'),
+    ('-hire_date', 'Newest hires'),
+    ('email', 'Email'),
+]
+
+@use_read_replica
 def employee_list(request):
-    employees = Employee.objects.all().select_related('department').order_by('first_name', 'last_name')
-    return render(request, 'employees/employee_list.html', {'employees': employees})
+    query = request.GET.get('q', '').strip()
+    sort = request.GET.get('sort')
+    if sort not in EmployeeDirectoryService.SORTS:
+        sort = EmployeeDirectoryService.DEFAULT_SORT
+    cursor = request.GET.get('cursor') or None
+    
+    if request.GET.get('format') == 'json':
+        try:
+            employees, next_cursor = EmployeeDirectoryService.get_page(query, sort, cursor)
+        except ValueError:
+            return HttpResponseBadRequest('Invalid cursor.')
+        html = render_to_string('employees/employee_cards.html', {'employees': employees}, request=request)
+        return JsonResponse({'html': html, 'next_cursor': next_cursor})
+    
+    def get_context():
+        try:
+            employees, next_cursor = EmployeeDirectoryService.get_page(query, sort, cursor)
+        except ValueError:
+            employees, next_cursor = EmployeeDirectoryService.get_page(query, sort)
+        return {
+            'employees': employees,
+            'next_cursor': next_cursor,
+            'query': query,
+            'sort': sort,
+            'sorts': EMPLOYEE_SORTS,
+        }
+    return render_if_modified(
+        request, 'employees/employee_list.html', get_context,
+        [Employee.objects.all(), Department.objects.all()],
+        query, sort, cursor,
+    )
 
+@use_read_replica
 def employee_detail(request, pk):
     employee = get_object_or_404(Employee.objects.select_related('department'), pk=pk)
-    attendances = Attendance.objects.filter(employee=employee).order_by('-date')[:10]
+    today = timezone.now().date()
+    start_date, end_date = get_date_range(request, today, default_start=today - timedelta(days=364))
+    history = EmployeeAttendanceHistoryService.get_history(employee.pk, start_date, end_date, request.GET.get('page'))
     return render(request, 'employees/employee_detail.html', {
         'employee': employee,
-        'attendances': attendances,
+        'start_date': start_date,
+        'end_date': end_date,
+        **history,
     })
 
 def employee_create(request):
@@ -59,30 +176,26 @@ def employee_delete(request, pk):
     return redirect('employee_list')
 
 def is_weekend(date_obj):
-    return date_obj.weekday() >= 5
+    return WorkingDayCalendar.is_weekend(date_obj)
 
 def is_holiday(date_obj):
-    if Holiday.objects.filter(date=date_obj).exists():
-        return True
-    if Holiday.objects.filter(is_recurring=True, date__month=date_obj.month, date__day=date_obj.day).exists():
-        return True
-    return False
+    return WorkingDayCalendar.is_holiday(date_obj)
 
 def is_working_day(date_obj):
-    return not is_weekend(date_obj) and not is_holiday(date_obj)
+    return WorkingDayCalendar.is_working_day(date_obj)
     
-def attendance_list(request):
-    today = timezone.now().date()
+def get_date_range(request, today, default_start=None):
     start_date_str = request.GET.get('start_date', None)
     end_date_str = request.GET.get('end_date', None)
+    default_start = default_start or today.replace(day=1)
     
     if start_date_str:
         try:
             start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
         except (ValueError, TypeError):
-            start_date = today.replace(day=1)
+            start_date = default_start
     else:
-        start_date = today.replace(day=1)
+        start_date = default_start
     
     if end_date_str:
         try:
@@ -94,18 +207,14 @@ def attendance_list(request):
     
     if start_date > end_date:
         start_date, end_date = end_date, start_date
-    
-    attendances = Attendance.objects.filter(
-        date__gte=start_date, 
-        date__lte=end_date
-    ).select_related('employee').order_by('-date', 'employee__first_name', 'employee__last_name')
-    
-    delta = end_date - start_date
+    return start_date, end_date
+
+def get_date_infos(start_date, end_date, today, holidays=None):
     dates = []
-    for i in range(delta.days + 1):
+    for i, flag in enumerate(WorkingDayCalendar.get_flags(start_date, end_date, holidays)):
         current_date = start_date + timedelta(days=i)
-        is_weekend_day = is_weekend(current_date)
-        is_holiday_day = is_holiday(current_date)
+        is_weekend_day = bool(flag & WorkingDayCalendar.WEEKEND)
+        is_holiday_day = bool(flag & WorkingDayCalendar.HOLIDAY)
         
         dates.append({
             'date': current_date,
@@ -115,53 +224,84 @@ def attendance_list(request):
             'is_holiday': is_holiday_day,
             'is_non_working': is_weekend_day or is_holiday_day,
         })
-    
-    employees = Employee.objects.all().select_related('department').order_by('first_name', 'last_name')
-    employees_list = list(employees)
-    attendance_matrix = []
-    for employee in employees_list:
-        employee_daily_attendance = []
-        for d_info in dates:
-            att = next((a for a in attendances if a.employee == employee and a.date == d_info['date']), None)
-            employee_daily_attendance.append({
-                'date': d_info['date'],
-                'attendance': att,
-                'is_non_working': d_info['is_non_working'],
-                'is_locked': False,
+    return dates
+
+async def get_matrix_page(request, start_date, end_date, today, holidays):
+    date_window = AttendanceMatrixPaginator.get_date_window(start_date, end_date, request.GET.get('window'))
+    matrix_dates = get_date_infos(date_window['start_date'], date_window['end_date'], today, holidays)
+    try:
+        page_number = int(request.GET.get('page'))
+    except (TypeError, ValueError):
+        page_number = 1
+    
+    def render_page():
+        employee_page = AttendanceMatrixPaginator.get_employee_page(page_number)
+        employee_page.object_list = list(employee_page.object_list)
+        matrix_builder = AttendanceMatrixBuilder(
+            date_window['start_date'],
+            date_window['end_date'],
+            employee_ids=[employee.id for employee in employee_page],
+        )
+        matrix_builder.load()
+        attendance_matrix = matrix_builder.build_rows(employee_page, matrix_dates)
+        
+        rows = []
+        for employee_data in attendance_matrix:
+            employee = employee_data['employee']
+            rows.append({
+                'employee_id': employee.id,
+                'name': employee.get_full_name(),
+                'department': employee.department.name if employee.department else None,
+                'statuses': [
+                    day_data['attendance'].status if day_data['attendance'] else None
+                    for day_data in employee_data['daily_attendance']
+                ],
             })
-        attendance_matrix.append({
-            'employee': employee,
-            'daily_attendance': employee_daily_attendance,
-        })
-    
-    daily_stats = []
-    for d_info in dates:
-        day_attendances = [a for a in attendances if a.date == d_info['date']]
-        day_total = len(day_attendances)
-        day_present = len([a for a in day_attendances if a.status == 'present'])
-        day_absent = len([a for a in day_attendances if a.status == 'absent'])
-        daily_stats.append({
-            'date': d_info['date'],
-            'weekday': d_info['weekday'],
-            'total': day_total,
-            'present': day_present,
-            'absent': day_absent,
-            'is_non_working': d_info['is_non_working'],
-        })
-    
+        return {
+            'page': employee_page.number,
+            'num_pages': employee_page.paginator.num_pages,
+            'employee_count': employee_page.paginator.count,
+            'next_page': employee_page.next_page_number() if employee_page.has_next() else None,
+            'rows': rows,
+            'html': render_to_string('attendance_matrix_rows.html', {'attendance_matrix': attendance_matrix}),
+        }
+    
+    matrix = await FragmentCache.aget_or_render(
+        'attendance-matrix',
+        [date_window['start_date'], date_window['end_date'], page_number],
+        [
+            FragmentCache.EMPLOYEES,
+            FragmentCache.HOLIDAYS,
+            *FragmentCache.attendance_range_scopes(date_window['start_date'], date_window['end_date']),
+        ],
+        render_page,
+    )
+    matrix['html'] = mark_safe(matrix['html'])
+    return {
+        'date_window': date_window,
+        'matrix_dates': matrix_dates,
+        'matrix': matrix,
+    }
+
+def get_calendar_months(end_date):
     end_month = end_date.replace(day=1)
     if end_month.month == 1:
         prev_month = end_month.replace(year=end_month.year - 1, month=12)
     else:
         prev_month = end_month.replace(month=end_month.month - 1)
-    
-    calendar_dates = []
-    
-    months_to_show = [prev_month, end_month]
-    for month_date in months_to_show:
-        month = month_date.month
-        year = month_date.year
-        month_name = calendar.month_name[month]
+    return [
+        {
+            'month': month_date.month,
+            'year': month_date.year,
+            'month_name': calendar.month_name[month_date.month],
+        }
+        for month_date in (prev_month, end_month)
+    ]
+
+def render_calendar_months(calendar_dates, today):
+    for month_data in calendar_dates:
+        month = month_data['month']
+        year = month_data['year']
         
         first_day = date(year, month, 1)
         last_day = date(year, month + 1, 1) - timedelta(days=1) if month < 12 else date(year + 1, 1, 1) - timedelta(days=1)
@@ -187,12 +327,25 @@ def attendance_list(request):
                 current_week.append(None)
             weeks.append(current_week)
         
-        calendar_dates.append({
-            'month': month,
-            'year': year,
-            'month_name': month_name,
-            'weeks': weeks,
-        })
+        month_data['weeks'] = weeks
+    
+    return render_to_string('attendance_calendar_months.html', {'calendar_dates': calendar_dates, 'today': today})
+
+async def get_attendance_list_context(request, start_date, end_date, today):
+    holidays = await HolidayCalendar.aensure_loaded()
+    matrix_page = await get_matrix_page(request, start_date, end_date, today, holidays)
+    daily_counts = await AttendanceSummaryService.aget_daily_counts(start_date, end_date)
+    dates = get_date_infos(start_date, end_date, today, holidays)
+    daily_stats = AttendanceMatrixBuilder(start_date, end_date).build_daily_stats(dates, daily_counts)
+    
+    calendar_dates = get_calendar_months(end_date)
+    # The month grids only depend on the months shown and today's date
+    calendar_months = await FragmentCache.aget_or_render(
+        'attendance-calendar',
+        [calendar_dates[0]['year'], calendar_dates[0]['month'], today],
+        [],
+        lambda: render_calendar_months(calendar_dates, today),
+    )
     
     presets = [
         {'value': 'today', 'label': 'Today', 'icon': '📅'},
@@ -240,20 +393,110 @@ def attendance_list(request):
         selected_preset = 'lastmonth'
     
     context = {
-        'attendances': attendances,
         'start_date': start_date,
         'end_date': end_date,
         'today': today,
         'dates': dates,
-        'attendance_matrix': attendance_matrix,
+        'total_days': len(dates),
+        'working_days': WorkingDayCalendar.count_working_days(start_date, end_date, holidays),
         'daily_stats': daily_stats,
         'calendar_dates': calendar_dates,
+        'calendar_months': mark_safe(calendar_months),
         'presets': presets,
         'selected_preset': selected_preset,
-        'has_employees': len(employees_list) > 0,
+        'has_employees': matrix_page['matrix']['employee_count'] > 0,
+        **matrix_page,
     }
     
-    return render(request, 'attendance_list.html', context)
+    return context
+
+@use_read_replica
+async def attendance_list(request):
+    today = timezone.now().date()
+    start_date, end_date = get_date_range(request, today)
+    # Recurring holidays can fall in any range, so every holiday counts
+    return await arender_if_modified(
+        request, 'attendance_list.html',
+        lambda: get_attendance_list_context(request, start_date, end_date, today),
+        [
+            Attendance.objects.filter(date__gte=start_date, date__lte=end_date),
+            Employee.objects.all(),
+            Department.objects.all(),
+            Holiday.objects.all(),
+        ],
+        today,
+    )
+
+@use_read_replica
+async def attendance_matrix_data(request):
+    today = timezone.now().date()
+    start_date, end_date = get_date_range(request, today)
+    matrix_page = await get_matrix_page(request, start_date, end_date, today, await HolidayCalendar.aensure_loaded())
+    matrix = matrix_page['matrix']
+    
+    return JsonResponse({
+        'page': matrix['page'],
+        'num_pages': matrix['num_pages'],
+        'next_page': matrix['next_page'],
+        'window': matrix_page['date_window']['number'],
+        'window_count': matrix_page['date_window']['count'],
+        'dates': [d_info['date'].isoformat() for d_info in matrix_page['matrix_dates']],
+        'rows': matrix['rows'],
+        'html': matrix['html'],
+    })
+
+def get_department_id(request):
+    department_id = request.GET.get('department')
+    return int(department_id) if department_id else None
+
+@use_read_replica
+def export_attendance(request):
+    today = timezone.now().date()
+    start_date, end_date = get_date_range(request, today)
+    
+    try:
+        department_id = get_department_id(request)
+    except ValueError:
+        return HttpResponseBadRequest('Invalid department.')
+    
+    export_format = request.GET.get('format', 'csv')
+    rows = AttendanceExportService.get_rows(start_date, end_date, department_id)
+    if export_format == 'csv':
+        response = StreamingHttpResponse(AttendanceExportService.stream_csv(rows), content_type='text/csv')
+    elif export_format == 'ndjson':
+        response = StreamingHttpResponse(AttendanceExportService.stream_ndjson(rows), content_type='application/x-ndjson')
+    else:
+        return HttpResponseBadRequest('Unsupported export format.')
+    
+    filename = f'attendance_{start_date:%Y%m%d}_{end_date:%Y%m%d}.{export_format}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+@use_read_replica
+def attendance_gaps(request):
+    today = timezone.now().date()
+    start_date, end_date = get_date_range(request, today)
+    try:
+        department_id = get_department_id(request)
+    except ValueError:
+        return HttpResponseBadRequest('Invalid department.')
+    
+    rows = list(AttendanceGapReportService.run(start_date, end_date, department_id))
+    summary = AttendanceGapReportService.summarize(rows)
+    rows_with_gaps = [row for row in rows if row['missing']]
+    rows_with_gaps.sort(key=lambda row: (-row['missing'], row['name']))
+    page = Paginator(rows_with_gaps, 50).get_page(request.GET.get('page'))
+    
+    return render(request, 'attendance_gaps.html', {
+        'start_date': start_date,
+        'end_date': end_date,
+        'department_id': department_id,
+        'departments': Department.objects.order_by('name'),
+        'working_days': WorkingDayCalendar.count_working_days(start_date, end_date),
+        'summary': summary,
+        'employees_with_gaps': len(rows_with_gaps),
+        'page': page,
+    })
 
 def add_attendance(request):
     if request.method == 'POST':
@@ -268,6 +511,29 @@ def add_attendance(request):
         form = AttendanceForm()
     return render(request, 'add_attendance.html', {'form': form})
 
+def import_attendance(request):
+    result = None
+    if request.method == 'POST':
+        form = AttendanceImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            csv_file = io.TextIOWrapper(form.cleaned_data['file'].file, encoding='utf-8-sig', newline='')
+            reader = csv.DictReader(csv_file)
+            if not AttendanceImportService.has_required_columns(reader.fieldnames):
+                messages.error(request, 'The CSV must have a header with date, status and employee_id or email columns.')
+            else:
+                dry_run = form.cleaned_data['dry_run']
+                result = AttendanceImportService(dry_run=dry_run).run(reader)
+                result['dry_run'] = dry_run
+                if result['error_count']:
+                    messages.warning(request, f'{result["error_count"]} row(s) could not be imported.')
+                elif not dry_run:
+                    messages.success(request, f'{result["created"]} attendance record(s) have been imported successfully.')
+        else:
+            messages.error(request, 'Please correct the errors below.')
+    else:
+        form = AttendanceImportForm()
+    return render(request, 'import_attendance.html', {'form': form, 'result': result})
+
 def delete_attendance(request, attendance_id):
     attendance = get_object_or_404(Attendance, id=attendance_id)
     if request.method == "POST":
@@ -278,61 +544,92 @@ def delete_attendance(request, attendance_id):
         return redirect('attendance_list')  
     return redirect('attendance_list')
 
-def dashboard(request):
+@use_read_replica
+async def dashboard(request):
     today = timezone.now().date()
     
-    total_employees = Employee.objects.count()
-    
-    today_attendances = Attendance.objects.filter(date=today)
-    today_total = today_attendances.count()
-    today_present = today_attendances.filter(status='present').count()
-    today_absent = today_attendances.filter(status='absent').count()
-    today_percentage = round((today_present / today_total * 100) if today_total > 0 else 0, 1)
-    
-    week_start = today - timedelta(days=today.weekday())
-    recent_attendance_count = Attendance.objects.filter(date__gte=week_start).count()
-    
-    departments = Department.objects.all()
-    department_stats = []
-    for dept in departments:
-        dept_employees = Employee.objects.filter(department=dept)
-        dept_employee_count = dept_employees.count()
-        dept_employee_ids = dept_employees.values_list('id', flat=True)
-        dept_today_attendances = today_attendances.filter(employee_id__in=dept_employee_ids)
-        dept_today_present = dept_today_attendances.filter(status='present').count()
-        department_stats.append({
-            'name': dept.name,
-            'employee_count': dept_employee_count,
-            'today_present': dept_today_present,
-        })
+    async def get_context():
+        context = await DashboardStatsService.aget_stats(today)
+        context['today'] = today
+        return context
+    
+    # The week trend reaches furthest back, covering this week's totals too
+    return await arender_if_modified(
+        request, 'dashboard.html', get_context,
+        [
+            Attendance.objects.filter(date__gte=today - timedelta(days=6), date__lte=today),
+            Employee.objects.all(),
+            Department.objects.all(),
+        ],
+        today,
+    )
+
+@use_read_replica
+async def department_analytics(request):
+    today = timezone.now().date()
+    preset = request.GET.get('range')
+    if preset not in DepartmentAnalyticsService.PRESETS:
+        preset = DepartmentAnalyticsService.DEFAULT_PRESET
+    granularity = request.GET.get('period')
+    if granularity not in DepartmentAnalyticsService.GRANULARITIES:
+        granularity = 'week'
+    
+    analytics = await DepartmentAnalyticsService.aget_analytics(preset, granularity, today)
+    if request.GET.get('format') == 'json':
+        return JsonResponse(analytics)
+    
+    analytics['rows'] = [
+        {**department, 'trend': list(zip(analytics['periods'], department['trend']))}
+        for department in analytics['departments']
+    ]
+    return await sync_to_async(render)(request, 'department_analytics.html', {
+        **analytics,
+        'presets': DepartmentAnalyticsService.PRESETS,
+        'granularities': list(DepartmentAnalyticsService.GRANULARITIES),
+    })
+
+def render_week_calendar(today, selected_date):
+    days_since_monday = today.weekday()
+    week_start = today - timedelta(days=days_since_monday)
+    
+    week_dates = []
+    for i, flag in enumerate(WorkingDayCalendar.get_flags(week_start, week_start + timedelta(days=6))):
+        week_date = week_start + timedelta(days=i)
+        is_weekend_day = bool(flag & WorkingDayCalendar.WEEKEND)
+        is_holiday_day = bool(flag & WorkingDayCalendar.HOLIDAY)
+        holiday_name = HolidayCalendar.get_holiday_name(week_date) if is_holiday_day else None
+        is_working = not flag
     
-    week_attendance = []
-    for i in range(6, -1, -1):
-        date = today - timedelta(days=i)
-        day_attendances = Attendance.objects.filter(date=date)
-        day_total = day_attendances.count()
-        day_present = day_attendances.filter(status='present').count()
-        day_absent = day_attendances.filter(status='absent').count()
-        week_attendance.append({
-            'date': date,
-            'total': day_total,
-            'present': day_present,
-            'absent': day_absent,
+        week_dates.append({
+            'date': week_date,
+            'day': week_date.day,
+            'is_today': week_date == today,
+            'is_selected': week_date == selected_date,
+            'is_future': week_date > today,
+            'is_weekend': is_weekend_day,
+            'is_holiday': is_holiday_day,
+            'is_working': is_working,
+            'holiday_name': holiday_name,
+            'date_str': week_date.strftime('%Y-%m-%d'),
         })
     
-    context = {
-        'total_employees': total_employees,
-        'today_present': today_present,
-        'today_absent': today_absent,
-        'today_total': today_total,
-        'today_percentage': today_percentage,
-        'recent_attendance_count': recent_attendance_count,
-        'department_stats': department_stats,
-        'week_attendance': week_attendance,
-        'today': today,
-    }
+    month_days = {}
+    for d in week_dates:
+        date_obj = d['date']
+        month_key = (date_obj.year, date_obj.month)
+        month_days[month_key] = month_days.get(month_key, 0) + 1
+    
+    main_month = max(month_days.items(), key=lambda x: x[1])[0]
+    month_name = calendar.month_name[main_month[1]]
+    cal_year = main_month[0]
     
-    return render(request, 'dashboard.html', context)
+    calendar_dates = [{
+        'month_name': month_name,
+        'year': cal_year,
+        'week_dates': week_dates,
+    }]
+    
+    return render_to_string('mark_attendance_week.html', {'calendar_dates': calendar_dates})
 
 def mark_attendance(request):
     selected_date = request.GET.get('date', None)
@@ -360,27 +657,14 @@ def mark_attendance(request):
             messages.error(request, f'Attendance cannot be marked on {day_name}s (weekends). Please select a working day.')
             return redirect('mark_attendance')
         
-        if is_holiday(selected_date):
-            holiday = Holiday.objects.filter(
-                Q(date=selected_date) | 
-                Q(is_recurring=True, date__month=selected_date.month, date__day=selected_date.day)
-            ).first()
-            holiday_name = holiday.name if holiday else 'a holiday'
+        holiday_name = HolidayCalendar.get_holiday_name(selected_date)
+        if holiday_name is not None:
             messages.error(request, f'Attendance cannot be marked on {holiday_name}. Please select a working day.')
             return redirect('mark_attendance')
         
-        saved_count = 0
-        for employee in employees:
-            status_key = f'status_{employee.id}'
-            if status_key in request.POST:
-                status = request.POST[status_key]
-                Attendance.objects.filter(employee=employee, date=selected_date).delete()
-                Attendance.objects.create(
-                    employee=employee,
-                    date=selected_date,
-                    status=status,
-                )
-                saved_count += 1
+        statuses = AttendanceBulkWriter.parse_statuses(request.POST)
+        created_count, updated_count = AttendanceBulkWriter.write(selected_date, statuses)
+        saved_count = created_count + updated_count
         
         if saved_count > 0:
             date_str = selected_date.strftime('%B %d, %Y')
@@ -410,63 +694,96 @@ def mark_attendance(request):
             'is_locked': is_locked,
         })
     
-    days_since_monday = today.weekday()
-    week_start = today - timedelta(days=days_since_monday)
-    
-    week_dates = []
-    for i in range(7):
-        week_date = week_start + timedelta(days=i)
-        is_weekend_day = is_weekend(week_date)
-        is_holiday_day = is_holiday(week_date)
-        is_working = is_working_day(week_date)
-        
-        holiday_name = None
-        if is_holiday_day:
-            holiday = Holiday.objects.filter(
-                Q(date=week_date) | 
-                Q(is_recurring=True, date__month=week_date.month, date__day=week_date.day)
-            ).first()
-            if holiday:
-                holiday_name = holiday.name
-        
-        week_dates.append({
-            'date': week_date,
-            'day': week_date.day,
-            'is_today': week_date == today,
-            'is_selected': week_date == selected_date,
-            'is_future': week_date > today,
-            'is_weekend': is_weekend_day,
-            'is_holiday': is_holiday_day,
-            'is_working': is_working,
-            'holiday_name': holiday_name,
-            'date_str': week_date.strftime('%Y-%m-%d'),
-        })
-    
-    month_days = {}
-    for d in week_dates:
-        date_obj = d['date']
-        month_key = (date_obj.year, date_obj.month)
-        month_days[month_key] = month_days.get(month_key, 0) + 1
-    
-    main_month = max(month_days.items(), key=lambda x: x[1])[0]
-    month_name = calendar.month_name[main_month[1]]
-    cal_year = main_month[0]
-    
-    calendar_dates = [{
-        'month_name': month_name,
-        'year': cal_year,
-        'week_dates': week_dates,
-    }]
+    # Only holiday edits change the strip for a given day and selection
+    week_calendar = FragmentCache.get_or_render(
+        'mark-attendance-week',
+        [today, selected_date],
+        [FragmentCache.HOLIDAYS],
+        lambda: render_week_calendar(today, selected_date),
+    )
     
     context = {
         'employees_data': employees_data,
         'selected_date': selected_date,
         'today': today,
-        'calendar_dates': calendar_dates,
+        'week_calendar': mark_safe(week_calendar),
     }
     
     return render(request, 'mark_attendance.html', context)
 
+def get_report_job_params(kind, data):
+    params = {}
+    for name in ('start_date', 'end_date'):
+        if data.get(name):
+            params[name] = datetime.strptime(data[name], '%Y-%m-%d').date().isoformat()
+        elif kind != ReportJob.REBUILD_SUMMARY:
+            raise ValueError(f'{name} is required.')
+    if 'start_date' in params and 'end_date' in params and params['start_date'] > params['end_date']:
+        raise ValueError('Start date cannot be after end date.')
+    if data.get('department'):
+        params['department_id'] = int(data['department'])
+    if kind == ReportJob.ATTENDANCE_EXPORT:
+        params['format'] = data.get('format', 'csv')
+        if params['format'] not in ReportJobService.EXPORT_FORMATS:
+            raise ValueError('Unsupported export format.')
+    if kind == ReportJob.ATTENDANCE_GAPS and data.get('include_all'):
+        params['include_all'] = True
+    return params
+
+def get_report_job_data(job):
+    return {
+        'id': str(job.pk),
+        'kind': job.kind,
+        'status': job.status,
+        'params': job.params,
+        'result': job.result,
+        'error': job.error.strip().splitlines()[-1] if job.error else None,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'download_url': reverse('report_job_download', args=[job.pk]) if job.result_file else None,
+    }
+
+def report_jobs(request):
+    if request.method == 'POST':
+        kind = request.POST.get('kind')
+        if kind == ReportJob.REBUILD_SUMMARY and not request.user.is_staff:
+            return HttpResponseForbidden('Only staff can rebuild the attendance summary.')
+        try:
+            job = ReportJobService.submit(kind, get_report_job_params(kind, request.POST), request.user)
+        except ValueError as exc:
+            return HttpResponseBadRequest(f'Invalid report request: {exc}')
+        messages.success(request, f'{job.get_kind_display()} queued. It will be ready here once a worker picks it up.')
+        return redirect('report_job_detail', pk=job.pk)
+    
+    # Job ids are unguessable, so everyone but staff only gets a list of their own
+    if request.user.is_staff:
+        jobs = ReportJob.objects.all()
+    elif request.user.is_authenticated:
+        jobs = ReportJob.objects.filter(created_by=request.user)
+    else:
+        jobs = ReportJob.objects.none()
+    return render(request, 'report_jobs.html', {
+        'jobs': jobs.select_related('created_by')[:50],
+        'today': timezone.now().date(),
+    })
+
+def report_job_detail(request, pk):
+    job = get_object_or_404(ReportJob, pk=pk)
+    if request.GET.get('format') == 'json':
+        return JsonResponse(get_report_job_data(job))
+    return render(request, 'report_job_detail.html', {
+        'job': job,
+        'filename': os.path.basename(job.result_file.name),
+        'status_url': f'{reverse("report_job_detail", args=[job.pk])}?format=json',
+    })
+
+def report_job_download(request, pk):
+    job = get_object_or_404(ReportJob, pk=pk, status=ReportJob.DONE)
+    if not job.result_file:
+        raise Http404('This job has no file to download.')
+    return FileResponse(job.result_file.open('rb'), as_attachment=True, filename=os.path.basename(job.result_file.name))
+
 def logout_view(request):
     logout(request)
     return redirect('login') 
\ No newline at end of file
@@ -0,0 +1,28 @@
+import django
+from django.db import connections
+
+# Entry points for process pools (run_workers, PartitionedReportService). Pool processes
+# are spawned fresh rather than forked, so they never share the parent's database
+# connections; this module is imported before Django is set up there and must not
+# import models at the top.
+
+
+def init_worker(databases=None):
+    django.setup()
+    # Point the process at the databases its parent reads from, e.g. a test database
+    for alias, settings_dict in (databases or {}).items():
+        connections.settings[alias] = settings_dict
+        # setup() may already have created the connection object, though not connected it
+        connection = connections[alias]
+        connection.close()
+        connection.settings_dict = settings_dict
+
+
+def run_job(job_id):
+    from .services import ReportJobService
+    return ReportJobService.execute(job_id)
+
+
+def compute_partition(partition, using):
+    from .services import PartitionedReportService
+    return PartitionedReportService.compute_partition(*partition, using)